@@ -0,0 +1,90 @@
+"""
+Benchmarks the GOAL loader on a generated ring exchange trace.
+
+The trace size in MB is taken from FENNEL_GOAL_MB, production traces are
+several hundred MB.
+
+Run with: FENNEL_GOAL_MB=300 python -m pytest benchmarks/test_goal.py
+"""
+
+
+import os
+
+
+import pytest
+
+
+from fennel.io.goal import load, load_compiled
+
+
+# bytes of a single step of a rank in the generated trace
+STEP_BYTES = 100
+RANKS = 64
+
+
+def write_trace(path: str, ranks: int, steps: int) -> None:
+    """
+    Write a trace where every rank puts to its right neighbour and then
+    computes on the message of its left neighbour, steps times.
+    """
+
+    with open(path, 'w', encoding='utf-8') as trace:
+        for rank in range(ranks):
+            right = (rank + 1) % ranks
+            left = (rank - 1) % ranks
+
+            trace.write(f'rank {rank} {{\n\tl1: start\n')
+
+            for step in range(steps):
+                label = 2 + 2 * step
+                trace.write(f'\tl{label}: put 64b to r{right}\n'
+                            f'\tl{label + 1}: compute 100ns\n')
+
+            trace.write('\n')
+
+            for step in range(steps):
+                label = 2 + 2 * step
+                trace.write(f'\tl{label} > l{label - 1}\n'
+                            f'\tl{label + 1} > l{label}\n'
+                            f'\tl{label + 1} > r{left}:l{label}\n')
+
+            trace.write('}\n\n')
+
+
+@pytest.fixture(scope='module')
+def trace(tmp_path_factory):
+    """
+    Generates the trace once.
+    """
+
+    size = float(os.environ.get('FENNEL_GOAL_MB', '16'))
+    steps = max(1, int(size * (1 << 20) / (STEP_BYTES * RANKS)))
+
+    path = str(tmp_path_factory.mktemp('goal') / 'trace.goal')
+    write_trace(path, RANKS, steps)
+
+    return path, RANKS * (2 * steps + 2)
+
+
+def test_load_compiled(benchmark, trace):
+    """
+    Benchmarks loading the trace into a CompiledProgram.
+    """
+
+    path, count = trace
+
+    compiled = benchmark.pedantic(load_compiled, args=(path,), rounds=3)
+
+    assert len(compiled) == count
+
+
+def test_load_program(benchmark, trace):
+    """
+    Benchmarks loading the trace into a Program.
+    """
+
+    path, count = trace
+
+    program = benchmark.pedantic(load, args=(path,), rounds=1)
+
+    assert len(program.get_task_names()) == count
@@ -0,0 +1,57 @@
+"""
+Benchmarks the priority queue implementations on the existing generators.
+
+Run with: python -m pytest benchmarks/test_priorityqueue.py
+"""
+
+
+import pytest
+
+
+from fennel.core.priorityqueue import PriorityQueue, BucketQueue, RadixHeap
+from fennel.core.machine import Machine
+from fennel.computes.gamma import GammaModel
+from fennel.networks.lbmodel import LBModel
+import fennel.generators.allgather as allgather
+import fennel.generators.allreduce as allreduce
+import fennel.generators.bsp as bsp
+
+
+QUEUES = [PriorityQueue, BucketQueue, RadixHeap]
+
+PROGRAMS = {
+    'allgather_ring': (lambda: allgather.ring(128, 64), 128),
+    'allreduce_rd': (lambda: allreduce.generate_recursive_doubling(1024, 64),
+                     1024),
+    'bsp_superstep': (lambda: bsp.single_superstep(4096, 100, 4), 4096),
+    }
+
+
+@pytest.fixture(scope='module', params=list(PROGRAMS))
+def compiled_program(request):
+    """
+    Generates and compiles each benchmark program once.
+    """
+
+    generator, nodes = PROGRAMS[request.param]
+
+    return generator().compile(), nodes
+
+
+@pytest.mark.parametrize('queue_type', QUEUES,
+                         ids=[queue.__name__ for queue in QUEUES])
+def test_queue_run(benchmark, compiled_program, queue_type):
+    """
+    Benchmarks a full run with the given queue implementation.
+    """
+
+    program, nodes = compiled_program
+    machine = Machine(nodes, 1, GammaModel(1), LBModel(100, 1), queue_type)
+
+    def run():
+        machine.reset()
+        machine.run(program)
+
+    benchmark(run)
+
+    assert machine.is_finished()
@@ -8,24 +8,10 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 
-from fennel.core.machine import Machine
+from fennel.core.sweep import sweep
 
 
-from fennel.generators.p2p import generate_send
-from fennel.networks.lbmodel import LBModel
-
-
-def sample(size: int) -> float:
-    """
-    Calculate the latency of a transfer at the size.
-    """
-
-    prog = generate_send(size, True)
-    network = LBModel(4000, 0.1)
-    machine = Machine(2, 1, None, network)
-    machine.run(prog)
-
-    return machine.maximum_time / 1000.0
+from fennel.generators.p2p import send
 
 
 def main() -> None:
@@ -35,10 +21,10 @@ def main() -> None:
 
     # x in Bytes up to 100MB
     x = np.logspace(0, 7, num=30)
-    y = []
 
-    for xi in x:
-        y.append(sample(xi))
+    # all sizes of the send family in a single sweep
+    result = sweep(lambda size: send(size, True), x, [4000], [0.1])
+    y = result.makespans[:, 0, 0, 0] / 1000.0
 
     sns.set_style("whitegrid")
 
@@ -3,7 +3,7 @@ Defines the fixed time compute model.
 """
 
 
-from typing import cast
+from typing import Hashable, Optional, cast
 
 
 from fennel.core.time import Time, TimeSpan
@@ -16,6 +16,8 @@ class FixedTimeModel(ComputeModel):
     The simplest compute model.
     """
 
+    deterministic = True
+
     def __init__(self, duration: TimeSpan):
         super().__init__()
 
@@ -29,6 +31,20 @@ class FixedTimeModel(ComputeModel):
 
         return cast(TimeSpan, self._duration)
 
+    def duration_key(self, task: ComputeTask) -> Optional[Hashable]:
+        """
+        The duration depends on the time of the task only.
+        """
+
+        return (task.kind, task.time)
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """
+        The durations depend on the duration.
+        """
+
+        return (self._duration,)
+
     def evaluate(self, time: Time, task: ComputeTask) -> Time:
         """
         Evaluate the fixed time model.
@@ -3,15 +3,16 @@ Defines the gamma compute model.
 """
 
 
-import random
 import math
-from typing import Sequence, cast
+from typing import Hashable, Optional, Sequence, Union, cast
 
 
-from scipy.stats import betaprime  # type: ignore
+import numpy as np  # type: ignore
 
 
 from fennel.core.time import Time
+from fennel.core.noise import (NoiseModel, BetaPrimeNoise, DetourNoise,
+                               SampleNoise)
 from fennel.core.compute import ComputeModel
 from fennel.tasks.compute import ComputeTask
 
@@ -21,6 +22,8 @@ class GammaModel(ComputeModel):
     The simplest compute model.
     """
 
+    deterministic = True
+
     def __init__(self, gamma: float):
         super().__init__()
 
@@ -37,6 +40,20 @@ class GammaModel(ComputeModel):
 
         return self._gamma
 
+    def duration_key(self, task: ComputeTask) -> Optional[Hashable]:
+        """
+        The duration depends on the size or the time of the task.
+        """
+
+        return (task.kind, task.size, task.time)
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """
+        The durations depend on gamma.
+        """
+
+        return (self._gamma,)
+
     def _evaluate_independent(self, task: ComputeTask) -> int:
         """
         Evaluates the task independent of when.
@@ -55,40 +72,116 @@ class GammaModel(ComputeModel):
 
         return cast(Time, time + self._evaluate_independent(task))
 
+    def vectorized_durations(self,
+                             sizes: np.ndarray,
+                             times: np.ndarray
+                             ) -> np.ndarray:
+        """
+        Evaluate the compute tasks given by their sizes and times at once,
+        absent values are -1. Equals evaluate at time 0 for every task.
+        """
+
+        spans = (sizes.astype(np.float64) * self._gamma).astype(np.int64)
+
+        return np.where(times >= 0, times, spans)
+
 
 class NoisyGammaModel(GammaModel):
     """
     A noise influenced GammaModel.
 
-    The noise distribution is a Betaprime distribution(2,3).
-    The noise function sample is then used as a percentage + 100%.
+    The noise model defaults to a Betaprime distribution(2,3) shifted by
+    stdev. The noise function sample is then used as a
+    percentage + 100%.
     """
 
-    def __init__(self, gamma: float, stdev: float):
+    deterministic = False
+
+    def __init__(self,
+                 gamma: float,
+                 stdev: float,
+                 noise: Optional[NoiseModel] = None):
         super().__init__(gamma)
 
-        self._noise: Sequence = betaprime.rvs(2.0, 3.0, stdev, size=100)
+        self._stdev = stdev
+
+        if noise is None:
+            noise = BetaPrimeNoise(2.0, 3.0, stdev)
+
+        self._noise = noise
 
     @property
-    def noise(self) -> Sequence:
-        """Access the noise set."""
+    def noise(self) -> NoiseModel:
+        """Access the noise model."""
 
         return self._noise
 
+    @noise.setter
+    def noise(self, noise: Union[NoiseModel, Sequence[float]]) -> None:
+        """Set the noise model, samples are drawn from uniformly."""
+
+        if not isinstance(noise, NoiseModel):
+            noise = SampleNoise(noise)
+
+        self._noise = noise
+
+    def seed(self, seed: int) -> None:
+        """
+        Reseed the noise.
+        """
+
+        self._noise.seed(seed)
+
     def _evaluate_independent(self, task: ComputeTask) -> int:
         """
         Evaluates the task independent of when.
         """
 
-        noise = random.choice(self._noise)
+        noise = self._noise.sample_node(task.node)
 
         if task.time is not None:
-            return task.time + noise
+            return task.time + int(noise)
 
         assert task.size is not None
         return int(task.size * self._gamma * (1.0 + noise))
 
 
+class DetourGammaModel(GammaModel):
+    """
+    A GammaModel interrupted by OS noise, the compute time of a task is
+    stretched by the detours of its node it overlaps.
+    """
+
+    deterministic = False
+
+    def __init__(self, gamma: float, detours: DetourNoise):
+        super().__init__(gamma)
+
+        self._detours = detours
+
+    @property
+    def detours(self) -> DetourNoise:
+        """Access the detour schedules."""
+
+        return self._detours
+
+    def seed(self, seed: int) -> None:
+        """
+        Reseed the detour schedules.
+        """
+
+        self._detours.seed(seed)
+
+    def evaluate(self, time: Time, task: ComputeTask) -> Time:
+        """
+        Evaluate the gamma model stretched by detours.
+        """
+
+        end = time + self._evaluate_independent(task)
+
+        return cast(Time, self._detours.stretch(task.node, time, end))
+
+
 # class SinusoidalGammaModel(GammaModel):
 #     """
 #     """
@@ -0,0 +1,90 @@
+"""
+Defines the DurationCache class, memoized durations of deterministic
+models.
+"""
+
+
+from collections import OrderedDict
+from typing import Any, Hashable, MutableMapping, Optional
+
+
+class DurationCache:
+    """
+    A bounded least recently used cache of task durations.
+
+    Keys are built by the models from the task kind, the sizes and the
+    target distance, such that tasks with equal keys have equal durations.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("DurationCache requires maxsize > 0")
+
+        self._maxsize = maxsize
+        self._entries: MutableMapping[Hashable, Any] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Get the maximum number of entries.
+        """
+
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        """
+        Get the number of lookups which found a duration.
+        """
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Get the number of lookups which found no duration.
+        """
+
+        return self._misses
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get the duration of a key, None if not cached.
+        """
+
+        value = self._entries.get(key)
+
+        if value is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(key)  # type: ignore
+
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache the duration of a key, evicting the least recently used.
+        """
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)  # type: ignore
+
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)  # type: ignore
+
+    def clear(self) -> None:
+        """
+        Drop all entries and statistics.
+        """
+
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
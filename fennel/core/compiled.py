@@ -0,0 +1,575 @@
+"""
+Defines the CompiledProgram class, the frozen array form of a Program.
+"""
+
+
+from itertools import chain
+from typing import (Callable, Dict, Hashable, Sequence, List, Iterable,
+                    NamedTuple, Optional, Tuple, Union)
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.task import (Task, KIND_START, KIND_PROXY, KIND_SLEEP,
+                              KIND_COMPUTE, KIND_PUT, KIND_GET)
+from fennel.core.cache import DurationCache
+from fennel.core.compute import ComputeModel
+from fennel.core.network import NetworkModel
+from fennel.tasks.start import StartTask
+
+
+# compute durations, local and remote network durations of every task,
+# None if the model is not deterministic
+Durations = Tuple[Optional[List[int]], Optional[List[int]], Optional[List[int]]]
+
+# kinds of the built-in task types, the types with task columns
+BUILTIN_KINDS = (KIND_START, KIND_PROXY, KIND_SLEEP, KIND_COMPUTE, KIND_PUT,
+                 KIND_GET)
+
+# bits of the task column flags
+CONCURRENT = 1
+BLOCKING = 2
+
+# the optional values of every built-in task type in column order
+_Values = Tuple[Optional[int], Optional[int], Optional[int]]
+
+_VALUES: Dict[int, Callable[[Task], _Values]] = {
+    KIND_START: lambda task: (task.skew, None, None),
+    KIND_PROXY: lambda task: (None, None, None),
+    KIND_SLEEP: lambda task: (task.delay, task.until, None),
+    KIND_COMPUTE: lambda task: (task.size, task.time, None),
+    KIND_PUT: lambda task: (task.message_size, task.target, None),
+    KIND_GET: lambda task: (task.retrieval_message_size, task.target,
+                            task.command_message_size),
+    }
+
+
+class TaskColumns(NamedTuple):
+    """
+    The values of all tasks of built-in types by id, absent optional
+    values are -1.
+
+    first is the skew, size, delay or retrieval size, second the target,
+    compute time or sleep end, third the command size of gets and flags
+    holds the CONCURRENT and BLOCKING bits.
+    """
+
+    first: np.ndarray
+    second: np.ndarray
+    third: np.ndarray
+    flags: np.ndarray
+
+
+def vectorizes(model: Union[ComputeModel, NetworkModel, None]) -> bool:
+    """
+    Check whether a model evaluates many tasks at once, i.e. is
+    deterministic and provides vectorized_durations.
+    """
+
+    return (model is not None and model.deterministic and
+            callable(getattr(model, 'vectorized_durations', None)))
+
+
+def fingerprint(model: Union[ComputeModel, NetworkModel, None]
+                ) -> Optional[Hashable]:
+    """
+    Get the fingerprint of a model the durations were precomputed with,
+    models without precomputed durations have an empty fingerprint.
+    """
+
+    if model is None or not model.deterministic:
+        return ()
+
+    return model.fingerprint()
+
+
+def task_columns(tasks: Sequence[Task], kinds: np.ndarray) -> TaskColumns:
+    """
+    Get the columns of tasks of built-in types, the tasks of every type
+    are gathered at once.
+    """
+
+    count = len(tasks)
+
+    values = np.full((count, 3), -1, dtype=np.int64)
+    flags = np.zeros(count, dtype=np.uint8)
+
+    for kind in np.unique(kinds).tolist():
+        get_values = _VALUES.get(kind)
+        ids = np.flatnonzero(kinds == kind)
+        kind_tasks = [tasks[tid] for tid in ids.tolist()]
+
+        if get_values is None:
+            task = kind_tasks[0]
+            raise ValueError(f'{task.name} of type {type(task).__name__} '
+                             'has no task columns.')
+
+        if kind in (KIND_PUT, KIND_GET):
+            flags[ids] = np.array([BLOCKING if task.blocking else 0
+                                   for task in kind_tasks], dtype=np.uint8)
+
+        if kind == KIND_PROXY:
+            continue
+
+        rows = np.array([[-1 if value is None else value
+                          for value in get_values(task)]
+                         for task in kind_tasks])
+
+        if rows.dtype != np.int64:
+            integral = rows == rows.astype(np.int64)
+
+            if not integral.all():
+                row = int(np.flatnonzero(~integral.all(axis=1))[0])
+                raise ValueError(f'{kind_tasks[row].name} has a '
+                                 'non-integral value.')
+
+        values[ids] = rows
+
+    flags |= np.array([CONCURRENT if task.concurrent else 0
+                       for task in tasks], dtype=np.uint8)
+
+    return TaskColumns(values[:, 0].copy(), values[:, 1].copy(),
+                       values[:, 2].copy(), flags)
+
+
+class CompiledProgram:
+    """
+    A CompiledProgram is an immutable, integer indexed form of a Program.
+
+    Tasks are identified by dense ids in insertion order, the successors of
+    task i are targets[offsets[i]:offsets[i+1]] (compressed sparse row).
+    """
+
+    # the DAG is stored, see ImplicitProgram for computed DAGs
+    implicit = False
+
+    def __init__(self,
+                 names: Sequence[str],
+                 tasks: Sequence[Task],
+                 edges: Iterable[Tuple[int, int]]
+                 ) -> None:
+        if len(names) != len(tasks):
+            raise ValueError('CompiledProgram requires a name per task.')
+
+        self._names: Sequence[str] = list(names)
+        self._tasks: Sequence[Task] = list(tasks)
+
+        # name lookup, built on first use
+        self._index: Optional[Dict[str, int]] = None
+
+        count = len(self._tasks)
+
+        pairs = np.fromiter(chain.from_iterable(edges),
+                            dtype=np.int64).reshape(-1, 2)
+
+        # sort edges by source then target and drop duplicates
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        if len(pairs) > 1:
+            unique = np.ones(len(pairs), dtype=bool)
+            unique[1:] = np.any(pairs[1:] != pairs[:-1], axis=1)
+            pairs = pairs[unique]
+
+        # successors in compressed sparse row form
+        self._offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs[:, 0], minlength=count),
+                  out=self._offsets[1:])
+        self._targets = np.ascontiguousarray(pairs[:, 1])
+
+        self._in_degree = np.bincount(pairs[:, 1],
+                                      minlength=count).astype(np.int64)
+
+        self._kinds = np.fromiter((task.kind for task in self._tasks),
+                                  dtype=np.int32, count=count)
+
+        self._nodes = np.fromiter((task.node for task in self._tasks),
+                                  dtype=np.int64, count=count)
+
+        self._starts = np.flatnonzero(self._kinds == KIND_START)
+
+        # any count of every task, 0 if all dependencies are required
+        self._anys = np.fromiter((task.any or 0 for task in self._tasks),
+                                 dtype=np.int64, count=count)
+
+        # python list views used by the machine
+        self._views: Optional[Tuple[List[int], List[int],
+                                    List[int], List[int]]] = None
+
+        # task columns, built on first use, and whether the tasks have
+        # columns once known
+        self._columns: Optional[TaskColumns] = None
+        self._columnar: Optional[bool] = None
+
+        # precomputed durations and the models they were computed with
+        self._durations: Optional[Tuple[ComputeModel, NetworkModel,
+                                        Tuple[Hashable, Hashable],
+                                        Durations]] = None
+
+    @classmethod
+    def from_arrays(cls,
+                    names: Sequence[str],
+                    tasks: Sequence[Task],
+                    offsets: np.ndarray,
+                    targets: np.ndarray,
+                    in_degree: np.ndarray,
+                    kinds: np.ndarray,
+                    nodes: np.ndarray,
+                    anys: np.ndarray,
+                    columns: Optional[TaskColumns] = None
+                    ) -> 'CompiledProgram':
+        """
+        Create a compiled program from its arrays without copying them,
+        names and tasks may be any sequences, e.g. constructed on access.
+        Task columns given here are not built from the tasks.
+        """
+
+        compiled = cls.__new__(cls)
+
+        compiled._names = names
+        compiled._tasks = tasks
+        compiled._index = None
+
+        compiled._offsets = offsets
+        compiled._targets = targets
+        compiled._in_degree = in_degree
+        compiled._kinds = kinds
+        compiled._nodes = nodes
+        compiled._starts = np.flatnonzero(kinds == KIND_START)
+        compiled._anys = anys
+
+        compiled._views = None
+        compiled._columns = columns
+        compiled._columnar = True if columns is not None else None
+        compiled._durations = None
+
+        return compiled
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_index'] = None
+        state['_views'] = None
+        state['_columns'] = None
+        state['_durations'] = None
+
+        return state
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __getitem__(self, key: str) -> Task:
+        return self.get_task(key)
+
+    def compile(self) -> 'CompiledProgram':
+        """
+        A compiled program is already compiled.
+        """
+
+        return self
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """
+        Get the successor offsets of every task.
+        """
+
+        return self._offsets
+
+    @property
+    def targets(self) -> np.ndarray:
+        """
+        Get the concatenated successors of all tasks.
+        """
+
+        return self._targets
+
+    @property
+    def in_degree(self) -> np.ndarray:
+        """
+        Get the number of dependencies of every task.
+        """
+
+        return self._in_degree
+
+    @property
+    def anys(self) -> np.ndarray:
+        """
+        Get the any count of every task, 0 if the task requires all
+        dependencies.
+        """
+
+        return self._anys
+
+    @property
+    def kinds(self) -> np.ndarray:
+        """
+        Get the task type code of every task.
+        """
+
+        return self._kinds
+
+    @property
+    def nodes(self) -> np.ndarray:
+        """
+        Get the node of every task.
+        """
+
+        return self._nodes
+
+    @property
+    def start_ids(self) -> np.ndarray:
+        """
+        Get the ids of all start tasks.
+        """
+
+        return self._starts
+
+    @property
+    def tasks(self) -> Sequence[Task]:
+        """
+        Get all tasks indexed by id.
+        """
+
+        return self._tasks
+
+    def views(self) -> Tuple[List[int], List[int], List[int], List[int]]:
+        """
+        Get offsets, targets, in-degree and any counts as lists, which are
+        faster to index element-wise than arrays.
+        """
+
+        if self._views is None:
+            self._views = (self._offsets.tolist(),
+                           self._targets.tolist(),
+                           self._in_degree.tolist(),
+                           self._anys.tolist())
+
+        return self._views
+
+    def columns(self) -> TaskColumns:
+        """
+        Get the task columns, all tasks must be of built-in types.
+        """
+
+        if self._columns is None:
+            self._columns = task_columns(self._tasks, self._kinds)
+
+        return self._columns
+
+    def is_builtin(self) -> bool:
+        """
+        Check whether all tasks are of built-in types, i.e. have columns.
+        """
+
+        return bool(np.isin(self._kinds, BUILTIN_KINDS).all())
+
+    def has_columns(self) -> bool:
+        """
+        Check whether the tasks have columns, i.e. are of built-in types
+        with integral values only.
+        """
+
+        if self._columnar is None:
+            self._columnar = self.is_builtin()
+
+            try:
+                if self._columnar:
+                    self.columns()
+
+            except ValueError:
+                self._columnar = False
+
+        return self._columnar
+
+    def precompute(self,
+                   compute: Optional[ComputeModel],
+                   network: Optional[NetworkModel],
+                   cache: DurationCache
+                   ) -> Durations:
+        """
+        Get the durations of all tasks under deterministic models, equal
+        duration keys are evaluated once through the cache. The durations
+        are kept while the models and their fingerprints are the same.
+        """
+
+        fingerprints = (fingerprint(compute), fingerprint(network))
+
+        if (self._durations is not None and
+                self._durations[0] is compute and
+                self._durations[1] is network and
+                self._durations[2] == fingerprints and
+                None not in fingerprints):
+            return self._durations[3]
+
+        count = len(self._tasks)
+
+        # vectorized models evaluate the task columns without tasks, other
+        # programs are evaluated per task
+        builtin = self.has_columns()
+
+        spans: Optional[List[int]] = None
+        if builtin and vectorizes(compute):
+            spans = self.compute_durations(compute).tolist()  # type: ignore
+
+        elif compute is not None and compute.deterministic:
+            spans = [0] * count
+
+            for tid in np.flatnonzero(self._kinds == KIND_COMPUTE).tolist():
+                task = self._tasks[tid]
+                key = compute.duration_key(task)
+
+                span = cache.get(key) if key is not None else None
+                if span is None:
+                    span = compute.evaluate(0, task)
+
+                    if key is not None:
+                        cache.put(key, span)
+
+                spans[tid] = span
+
+        local: Optional[List[int]] = None
+        remote: Optional[List[int]] = None
+        if builtin and vectorizes(network):
+            local_times, remote_times = self.network_durations(
+                network)  # type: ignore
+            local = local_times.tolist()
+            remote = remote_times.tolist()
+
+        elif network is not None and network.deterministic:
+            local = [0] * count
+            remote = [0] * count
+
+            network_ids = np.flatnonzero((self._kinds == KIND_PUT) |
+                                         (self._kinds == KIND_GET))
+
+            for tid in network_ids.tolist():
+                task = self._tasks[tid]
+                key = network.duration_key(task)
+
+                times = cache.get(key) if key is not None else None
+                if times is None:
+                    evaluated = network.evaluate(0, task)
+                    times = (evaluated.local, evaluated.remote)
+
+                    if key is not None:
+                        cache.put(key, times)
+
+                local[tid], remote[tid] = times
+
+        durations = (spans, local, remote)
+        self._durations = (compute, network, fingerprints,  # type: ignore
+                           durations)
+
+        return durations
+
+    def compute_durations(self, compute: ComputeModel) -> np.ndarray:
+        """
+        Get the durations of all compute tasks from the task columns, 0 for
+        other tasks. The model must vectorize.
+        """
+
+        columns = self.columns()
+        ids = np.flatnonzero(self._kinds == KIND_COMPUTE)
+
+        spans = np.zeros(len(self._kinds), dtype=np.int64)
+        spans[ids] = compute.vectorized_durations(  # type: ignore
+            columns.first[ids], columns.second[ids])
+
+        return spans
+
+    def network_durations(self, network: NetworkModel
+                          ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the local and remote times of all puts and gets from the task
+        columns, 0 for other tasks. The model must vectorize.
+        """
+
+        columns = self.columns()
+        ids = np.flatnonzero((self._kinds == KIND_PUT) |
+                             (self._kinds == KIND_GET))
+        gets = self._kinds[ids] == KIND_GET
+
+        local = np.zeros(len(self._kinds), dtype=np.int64)
+        remote = np.zeros(len(self._kinds), dtype=np.int64)
+
+        local[ids], remote[ids] = network.vectorized_durations(  # type: ignore
+            gets, self._nodes[ids], columns.second[ids],
+            np.where(gets, columns.third[ids], columns.first[ids]),
+            np.where(gets, columns.first[ids], 0))
+
+        return local, remote
+
+    def index(self, name: str) -> int:
+        """
+        Get the id of a task by name.
+        """
+
+        if self._index is None:
+            self._index = {name: tid for tid, name in enumerate(self._names)}
+
+        if name not in self._index:
+            raise KeyError(f"{name} not found in CompiledProgram")
+
+        return self._index[name]
+
+    def name(self, tid: int) -> str:
+        """
+        Get the name of a task by id.
+        """
+
+        return self._names[tid]
+
+    def task(self, tid: int) -> Task:
+        """
+        Get a task by id.
+        """
+
+        return self._tasks[tid]
+
+    def get_task(self, name: str) -> Task:
+        """
+        Get a task by name.
+        """
+
+        return self._tasks[self.index(name)]
+
+    def get_task_names(self) -> List[str]:
+        """
+        Get the names of all tasks by id.
+        """
+
+        return list(self._names)
+
+    def get_process_count(self) -> int:
+        """
+        Get number of processes required by program, the number of start tasks.
+        """
+
+        return len(self._starts)
+
+    def get_start_tasks(self) -> Iterable[StartTask]:
+        """
+        Get all start tasks in the program.
+        """
+
+        return (self._tasks[tid] for tid in self._starts.tolist())
+
+    def get_successors(self, tid: int) -> np.ndarray:
+        """
+        Get the ids of all tasks dependent on this task.
+        """
+
+        return self._targets[self._offsets[tid]:self._offsets[tid + 1]]
+
+    def get_in_degree(self, tid: int) -> int:
+        """
+        Get the number of dependencies of the task.
+        """
+
+        return int(self._in_degree[tid])
+
+    def get_out_degree(self, tid: int) -> int:
+        """
+        Get the number of successors of the task.
+        """
+
+        return int(self._offsets[tid + 1] - self._offsets[tid])
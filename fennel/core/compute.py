@@ -7,6 +7,7 @@ Definition of the abstact ComputeModel.
 
 
 from abc import ABC, abstractmethod
+from typing import Hashable, Optional
 
 from fennel.tasks.compute import ComputeTask
 from fennel.core.time import Time
@@ -15,10 +16,45 @@ from fennel.core.time import Time
 class ComputeModel(ABC):
     """
     Abstract class for all compute models.
+
+    Deterministic models evaluate tasks with equal duration keys to equal
+    durations independent of the time, such that durations can be
+    memoized. Deterministic models may also provide vectorized_durations
+    to evaluate arrays of tasks at once, which must agree with evaluate.
     """
 
+    deterministic = False
+
     @abstractmethod
     def evaluate(self, time: Time, task: ComputeTask) -> Time:
         """
         The evaluation of the model for a given task.
         """
+
+    def duration_key(self, task: ComputeTask) -> Optional[Hashable]:
+        """
+        Get the key of the task duration, None if it cannot be memoized.
+        """
+
+        return None
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """
+        Get a key of the parameters the durations depend on, precomputed
+        durations are reused while it is unchanged. None if unknown, then
+        durations are never reused.
+        """
+
+        return None
+
+    def seed(self, seed: int) -> None:
+        """
+        Reseed any random state of the model. Deterministic models ignore
+        the seed.
+        """
+
+    def reset(self) -> None:
+        """
+        Reset any state the model keeps across tasks of a run. Stateless
+        models ignore this.
+        """
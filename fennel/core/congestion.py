@@ -1,40 +1,167 @@
 """
 An abstraction of congestion.
+
+Congestion models do the bookkeeping of the network resources a message
+occupies, network models ask them when a message can leave its source and
+when it has fully arrived at its target.
 """
 
-# from abc import ABC
 
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from typing import List, Tuple
+
+
+from fennel.core.time import Time
+
+
+class CongestionModel(ABC):
+    """
+    Abstract class for all congestion models.
+    """
+
+    @abstractmethod
+    def transfer(self,
+                 source: int,
+                 target: int,
+                 time: Time,
+                 latency: int,
+                 duration: int
+                 ) -> Tuple[Time, Time]:
+        """
+        Transfer a message issued at time which occupies a resource for
+        duration and travels for latency. Returns the time the message is
+        injected completely and the time it has arrived completely.
+        """
+
+    def reset(self) -> None:
+        """
+        Release all resources, models without bookkeeping ignore this.
+        """
+
+
+class NoCongestionModel(CongestionModel):
+    """
+    Every message has the network to itself.
+    """
+
+    def transfer(self,
+                 source: int,
+                 target: int,
+                 time: Time,
+                 latency: int,
+                 duration: int
+                 ) -> Tuple[Time, Time]:
+        return Time(time + duration), Time(time + latency + duration)
+
+
+class BusyIntervals:
+    """
+    The disjoint busy intervals of a resource, sorted by time. Adjacent
+    intervals are merged, such that a resource in continuous use holds a
+    single interval.
+    """
+
+    __slots__ = ('_begins', '_ends')
+
+    def __init__(self) -> None:
+        self._begins: List[int] = []
+        self._ends: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._begins)
+
+    def reserve(self, time: int, duration: int) -> int:
+        """
+        Reserve the earliest free interval of the duration which begins no
+        earlier than time, returns its begin.
+        """
+
+        begins = self._begins
+        ends = self._ends
 
-# class CongestionModel(ABC):
-#     """
-#     """
+        # skip all intervals which end before time, then every interval
+        # overlapping the candidate pushes it past its end
+        index = bisect_right(ends, time)
+        begin = time
 
-#     pass
+        while index < len(begins) and begins[index] < begin + duration:
+            begin = max(begin, ends[index])
+            index += 1
 
+        if duration <= 0:
+            return begin
 
-# class NoCongestionModel(CongestionModel):
-#     """
-#     """
+        end = begin + duration
 
-#     pass
+        if index > 0 and ends[index - 1] == begin:
+            index -= 1
+            ends[index] = end
 
+            if index + 1 < len(begins) and begins[index + 1] == end:
+                ends[index] = ends.pop(index + 1)
+                begins.pop(index + 1)
 
-# class UniformCongestionModel(CongestionModel):
-#     """
-#     """
+        elif index < len(begins) and begins[index] == end:
+            begins[index] = begin
 
-#     pass
+        else:
+            begins.insert(index, begin)
+            ends.insert(index, end)
+
+        return begin
 
 
-# class LinearCongestionModel(CongestionModel):
-#     """
-#     """
+class NICCongestionModel(CongestionModel):
+    """
+    Messages serialize on the injection NIC of their source and the
+    ejection NIC of their target, links between NICs are not modeled.
+
+    Every NIC keeps its busy intervals, a message takes the earliest gap
+    at or after its time. The machine may evaluate operations out of time
+    order, e.g. parked tasks and tasks with the any property, such that an
+    earlier message fills a gap before messages issued before it. In time
+    order a transfer is O(1).
+    """
+
+    def __init__(self, nodes: int):
+        if nodes < 1:
+            raise ValueError("NICCongestionModel requires nodes > 0")
+
+        self._nodes = nodes
+
+        self._injection = [BusyIntervals() for _ in range(nodes)]
+        self._ejection = [BusyIntervals() for _ in range(nodes)]
+
+    @property
+    def nodes(self) -> int:
+        """
+        Get the node count.
+        """
 
-#     pass
+        return self._nodes
+
+    def reset(self) -> None:
+        """
+        Free all NICs.
+        """
+
+        self._injection = [BusyIntervals() for _ in range(self._nodes)]
+        self._ejection = [BusyIntervals() for _ in range(self._nodes)]
 
+    def transfer(self,
+                 source: int,
+                 target: int,
+                 time: Time,
+                 latency: int,
+                 duration: int
+                 ) -> Tuple[Time, Time]:
+        # wait for the injection NIC, then the head travels to the target
+        begin = self._injection[source].reserve(time, duration)
+        injected = begin + duration
 
-# class ExponentialCongestionModel(CongestionModel):
-#     """
-#     """
+        # wait for the ejection NIC once the head arrived
+        begin = self._ejection[target].reserve(begin + latency, duration)
+        arrived = begin + duration
 
-#     pass
+        return Time(injected), Time(arrived)
@@ -0,0 +1,275 @@
+"""
+Defines the static critical path evaluation of a Program.
+
+Without noise, congestion and process contention a run is the longest
+path through the DAG. The path is computed by a topological sweep over
+the compiled arrays, one level of tasks at a time, instead of the event
+loop of the machine.
+"""
+
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.program import Program
+from fennel.core.compiled import CompiledProgram
+from fennel.core.cache import DurationCache
+from fennel.core.compute import ComputeModel
+from fennel.core.network import NetworkModel
+from fennel.core.machine import Machine
+from fennel.core.task import (TaskEvent, KIND_START, KIND_SLEEP, KIND_COMPUTE,
+                              KIND_PUT, KIND_GET)
+from fennel.instruments.record import RecorderInstrument
+
+
+@dataclass
+class CriticalPathResult():
+    """
+    Dataclass holding the makespan and the completion time of every task
+    by task id, and whether the program was run on a machine. Tasks which
+    never execute have completion time -1.
+
+    With a parameter axis, the makespan is an array and the completion
+    times have a column per parameter point.
+    """
+
+    makespan: np.ndarray
+    finish: np.ndarray
+    names: List[str]
+    simulated: bool = False
+
+
+def _ranges(offsets: np.ndarray, ids: np.ndarray) -> Tuple[np.ndarray,
+                                                           np.ndarray]:
+    """
+    Get the concatenated index ranges offsets[i]:offsets[i+1] of all ids
+    and the start of every range within the concatenation.
+    """
+
+    starts = offsets[ids]
+    counts = offsets[ids + 1] - starts
+
+    firsts = np.zeros(len(ids), dtype=np.int64)
+    np.cumsum(counts[:-1], out=firsts[1:])
+
+    indices = (np.repeat(starts - firsts, counts) +
+               np.arange(counts.sum(), dtype=np.int64))
+
+    return indices, firsts
+
+
+def task_durations(compiled: CompiledProgram,
+                   compute: Optional[ComputeModel],
+                   network: Optional[NetworkModel]
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the completion offset and the process offset of every task under
+    deterministic models. Puts and gets complete at their remote time and
+    occupy their process until their local time.
+    """
+
+    kinds = compiled.kinds
+    count = len(compiled)
+
+    if not compiled.is_builtin():
+        raise ValueError('Critical path requires built-in task types.')
+
+    if np.any(kinds == KIND_COMPUTE) and (compute is None or
+                                          not compute.deterministic):
+        raise ValueError('Critical path requires a deterministic compute '
+                         'model.')
+
+    if np.any((kinds == KIND_PUT) | (kinds == KIND_GET)) and (
+            network is None or not network.deterministic):
+        raise ValueError('Critical path requires a deterministic network '
+                         'model.')
+
+    spans, local, remote = compiled.precompute(compute, network,
+                                               DurationCache(1 << 16))
+
+    done = np.zeros(count, dtype=np.int64)
+    busy = np.zeros(count, dtype=np.int64)
+
+    if spans is not None:
+        done[:] = spans
+
+    if remote is not None:
+        network_ids = (kinds == KIND_PUT) | (kinds == KIND_GET)
+        done[network_ids] = np.asarray(remote, dtype=np.int64)[network_ids]
+        busy[network_ids] = np.asarray(local, dtype=np.int64)[network_ids]
+
+    columns = compiled.columns()
+
+    starts = kinds == KIND_START
+    done[starts] = columns.first[starts]
+
+    sleeps = kinds == KIND_SLEEP
+    if np.any(columns.first[sleeps] < 0):
+        raise ValueError('Critical path requires sleep tasks with a delay.')
+    done[sleeps] = columns.first[sleeps]
+
+    network_ids = (kinds == KIND_PUT) | (kinds == KIND_GET)
+    busy[~network_ids] = done[~network_ids]
+
+    return done, busy
+
+
+def longest_path(compiled: CompiledProgram,
+                 done: np.ndarray,
+                 busy: np.ndarray
+                 ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sweep the DAG level by level from the start tasks and get the makespan
+    and the completion time of every task.
+
+    Durations have a row per task and optionally trailing parameter axes,
+    every parameter point is evaluated in the same sweep. A task begins
+    once all dependencies completed, at the any-th smallest completion
+    time of tasks with the any property.
+    """
+
+    count = len(compiled)
+    shape = done.shape[1:]
+
+    offsets = compiled.offsets
+    targets = compiled.targets
+    anys = compiled.anys
+
+    # predecessors in compressed sparse row form
+    order = np.argsort(targets, kind='stable')
+    sources = np.repeat(np.arange(count, dtype=np.int64),
+                        np.diff(offsets))[order]
+    pred_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(compiled.in_degree, out=pred_offsets[1:])
+
+    remaining = compiled.in_degree.copy()
+
+    finish = np.full((count,) + shape, -1, dtype=np.int64)
+    makespan = np.zeros(shape, dtype=np.int64)
+
+    frontier = compiled.start_ids
+    ready = np.zeros((len(frontier),) + shape, dtype=np.int64)
+
+    while len(frontier):
+        finish[frontier] = ready + done[frontier]
+        makespan = np.maximum(makespan, (ready + busy[frontier]).max(axis=0))
+
+        # successors whose dependencies all completed form the next level
+        indices, _ = _ranges(offsets, frontier)
+        successors = targets[indices]
+
+        np.subtract.at(remaining, successors, 1)
+
+        frontier = np.unique(successors[remaining[successors] == 0])
+
+        if not len(frontier):
+            break
+
+        indices, firsts = _ranges(pred_offsets, frontier)
+        times = finish[sources[indices]]
+
+        ready = np.maximum.reduceat(times, firsts, axis=0)
+
+        # the any-th smallest completion time by partial selection
+        for index in np.flatnonzero(anys[frontier]).tolist():
+            tid = frontier[index]
+            first = firsts[index]
+            degree = pred_offsets[tid + 1] - pred_offsets[tid]
+
+            if degree < anys[tid]:
+                raise RuntimeError(f'{compiled.name(tid)} requires '
+                                   f'{anys[tid]} dependencies, has '
+                                   f'{degree}.')
+
+            kth = anys[tid] - 1
+            ready[index] = np.partition(times[first:first + degree], kth,
+                                        axis=0)[kth]
+
+    return makespan, finish
+
+
+def contended(compiled: CompiledProgram,
+              done: np.ndarray,
+              busy: np.ndarray,
+              finish: np.ndarray
+              ) -> np.ndarray:
+    """
+    Get whether a task becomes ready while its node is still busy with an
+    earlier task, for every grid point. Ties are ordered by task id like
+    the machine does, such that a point is flagged whenever the machine
+    would delay a task.
+    """
+
+    executed = finish >= 0
+    ready = np.where(executed, finish - done, -1)
+    end = np.where(executed, ready + busy, -1)
+
+    # order the tasks of every point by node then ready time, the node is
+    # folded into the key with a stride beyond all times
+    nodes = compiled.nodes
+    stride = int(end.max(initial=0)) + 2
+
+    key = ready + nodes[:, None] * stride
+    order = np.argsort(key, axis=0, kind='stable')
+
+    # running maximum of the end times of the preceding tasks of the node
+    ends = np.take_along_axis(end + nodes[:, None] * stride, order, axis=0)
+    ends = np.maximum.accumulate(ends, axis=0)
+
+    starts = np.take_along_axis(key, order, axis=0)
+
+    return np.any(ends[:-1] > starts[1:], axis=0)
+
+
+def fast_makespan(program: Program,
+                  compute: Optional[ComputeModel],
+                  network: Optional[NetworkModel]
+                  ) -> CriticalPathResult:
+    """
+    Evaluate the program as the longest path through its DAG under
+    deterministic models, which equals Machine.run with a process per node
+    if no process is contended. If a task becomes ready while its node is
+    busy, the program is run on such a machine instead.
+    """
+
+    compiled = program.compile()
+
+    # programs with non-integral values have no columns to sweep
+    if compiled.is_builtin() and not compiled.has_columns():
+        return _machine_makespan(compiled, compute, network)
+
+    done, busy = task_durations(compiled, compute, network)
+    makespan, finish = longest_path(compiled, done, busy)
+
+    if contended(compiled, done[:, None], busy[:, None], finish[:, None])[0]:
+        return _machine_makespan(compiled, compute, network)
+
+    return CriticalPathResult(makespan, finish, compiled.get_task_names())
+
+
+def _machine_makespan(compiled: CompiledProgram,
+                      compute: Optional[ComputeModel],
+                      network: Optional[NetworkModel]
+                      ) -> CriticalPathResult:
+    """
+    Run the program on a machine with a process per node and record the
+    completion times.
+    """
+
+    recorder = RecorderInstrument()
+
+    machine = Machine(int(compiled.nodes.max()) + 1, 1, compute, network)
+    machine.register_instrument(TaskEvent.COMPLETED, recorder)
+    machine.run(compiled)
+
+    names = compiled.get_task_names()
+    record = recorder.record
+    finish = np.array([record.get(name, -1) for name in names],
+                      dtype=np.int64)
+
+    return CriticalPathResult(np.int64(machine.maximum_time), finish, names,
+                              simulated=True)
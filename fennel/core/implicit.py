@@ -0,0 +1,220 @@
+"""
+Defines the ImplicitProgram class, programs whose DAG is computed on
+demand.
+
+Regular collectives are closed-form functions of rank and round. An
+implicit program maps such indices to dense task ids and computes the
+successors, dependency counts and tasks of an id when the machine asks
+for them, no task or edge of the whole program is ever materialized.
+"""
+
+
+from abc import ABC, abstractmethod
+from typing import Iterator, List, MutableMapping, Sequence
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.task import Task
+from fennel.tasks.start import StartTask
+
+
+class ImplicitTasks(Sequence[Task]):
+    """
+    The tasks of an implicit program. Tasks are created on access and kept
+    until released, i.e. only while the machine works on them.
+    """
+
+    def __init__(self, program: 'ImplicitProgram'):
+        self._program = program
+        self._active: MutableMapping[int, Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._program)
+
+    def __getitem__(self, tid):  # type: ignore
+        task = self._active.get(tid)
+
+        if task is None:
+            task = self._program.create_task(tid)
+            task.taskid = tid
+            self._active[tid] = task
+
+        return task
+
+    def __iter__(self) -> Iterator[Task]:
+        for tid in range(len(self)):
+            task = self._program.create_task(tid)
+            task.taskid = tid
+            yield task
+
+    def release(self, tid: int) -> None:
+        """
+        Drop a task which is no longer required.
+        """
+
+        self._active.pop(tid, None)
+        self._program.release(tid)
+
+    @property
+    def active(self) -> int:
+        """
+        Get the number of tasks currently held.
+        """
+
+        return len(self._active)
+
+
+class _AnyCounts:
+    """
+    Indexable any counts of an implicit program.
+    """
+
+    __slots__ = ('_program',)
+
+    def __init__(self, program: 'ImplicitProgram'):
+        self._program = program
+
+    def __getitem__(self, tid: int) -> int:
+        return self._program.any_count(tid)
+
+
+class ImplicitProgram(ABC):
+    """
+    A program given by functions of dense task ids instead of stored
+    tasks and edges. Implementations compute the successors, the number of
+    dependencies and the task of every id, the start tasks must be given
+    as ids.
+
+    An implicit program is its own compiled form.
+    """
+
+    implicit = True
+
+    def __init__(self, count: int, processes: int):
+        self._count = count
+        self._processes = processes
+
+        self._tasks = ImplicitTasks(self)
+        self._anys = _AnyCounts(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def compile(self) -> 'ImplicitProgram':
+        """
+        An implicit program is already compiled.
+        """
+
+        return self
+
+    @property
+    @abstractmethod
+    def start_ids(self) -> np.ndarray:
+        """
+        Get the ids of all start tasks.
+        """
+
+    @abstractmethod
+    def create_task(self, tid: int) -> Task:
+        """
+        Create the task of an id.
+        """
+
+    @abstractmethod
+    def successors(self, tid: int) -> Sequence[int]:
+        """
+        Get the ids of all tasks dependent on this task.
+        """
+
+    @abstractmethod
+    def in_degree(self, tid: int) -> int:
+        """
+        Get the number of dependencies of the task.
+        """
+
+    def any_count(self, tid: int) -> int:
+        """
+        Get the any count of the task, 0 if all dependencies are required.
+        """
+
+        return 0
+
+    def release(self, tid: int) -> None:
+        """
+        Drop any data held for a completed task.
+        """
+
+    @property
+    def tasks(self) -> ImplicitTasks:
+        """
+        Get the tasks indexed by id.
+        """
+
+        return self._tasks
+
+    @property
+    def anys(self) -> _AnyCounts:
+        """
+        Get the any counts indexed by id.
+        """
+
+        return self._anys
+
+    def task(self, tid: int) -> Task:
+        """
+        Get a task by id.
+        """
+
+        return self._tasks[tid]
+
+    def name(self, tid: int) -> str:
+        """
+        Get the name of a task by id.
+        """
+
+        return self.create_task(tid).name
+
+    def get_task_names(self) -> List[str]:
+        """
+        Get the names of all tasks by id, creating every task.
+        """
+
+        return [task.name for task in self._tasks]
+
+    def get_process_count(self) -> int:
+        """
+        Get number of processes required by program, the number of start tasks.
+        """
+
+        return self._processes
+
+    def get_start_tasks(self) -> Iterator[StartTask]:
+        """
+        Get all start tasks in the program.
+        """
+
+        return (self.create_task(tid)  # type: ignore
+                for tid in self.start_ids.tolist())
+
+    def get_successors(self, tid: int) -> Sequence[int]:
+        """
+        Get the ids of all tasks dependent on this task.
+        """
+
+        return self.successors(tid)
+
+    def get_in_degree(self, tid: int) -> int:
+        """
+        Get the number of dependencies of the task.
+        """
+
+        return self.in_degree(tid)
+
+    def get_out_degree(self, tid: int) -> int:
+        """
+        Get the number of successors of the task.
+        """
+
+        return len(self.successors(tid))
@@ -6,18 +6,27 @@ Defines the abstract class for machine models.
 # pylint: disable=too-many-instance-attributes
 
 
+import heapq
 import logging
 from abc import ABC
-from typing import Optional, MutableMapping, Callable, List, Union, cast
+from typing import (Optional, MutableMapping, Callable, List, Type, Tuple,
+                    Union, Any, cast)
 from collections import defaultdict
 
 
+import numpy as np  # type: ignore
+
+
 from fennel.core.time import Time
 from fennel.core.program import Program
-from fennel.core.task import Task, PlannedTask, TaskEvent
+from fennel.core.compiled import CompiledProgram
+from fennel.core.task import Task, PlannedTask, TaskEvent, register_task_kind
 from fennel.core.compute import ComputeModel
-from fennel.core.network import NetworkModel
+from fennel.core.network import NetworkModel, NetworkTime
 from fennel.core.priorityqueue import PriorityQueue
+from fennel.core.sampling import run_samples, SampleResult, SeedLike
+from fennel.core.state import MachineState
+from fennel.core.cache import DurationCache
 
 
 from fennel.visual.canvas import Canvas
@@ -28,6 +37,8 @@ from fennel.tasks.get import GetTask
 from fennel.tasks.start import StartTask
 from fennel.tasks.sleep import SleepTask
 from fennel.tasks.compute import ComputeTask
+from fennel.tasks.msg import MsgTask
+from fennel.tasks.nic import NICTask
 
 
 class Machine(ABC):
@@ -39,7 +50,9 @@ class Machine(ABC):
                  nodes: int,
                  processes: int,
                  compute: ComputeModel,
-                 network: NetworkModel):
+                 network: NetworkModel,
+                 queue: Type[PriorityQueue] = PriorityQueue,
+                 cache: int = 0):
 
         if nodes is not None and nodes < 1:
             raise ValueError("Machine requires nodes > 0")
@@ -50,43 +63,44 @@ class Machine(ABC):
         self._compute_model = compute
         self._network_model = network
 
+        # priority queue implementation of the event loop
+        self._queue_type = queue
+
+        # memoized durations of deterministic models, opt-in by cache size
+        self._cache: Optional[DurationCache] = None
+        if cache > 0:
+            self._cache = DurationCache(cache)
+
+        # precomputed durations of the current run
+        self._spans: Optional[List[int]] = None
+        self._locals: Optional[List[int]] = None
+        self._remotes: Optional[List[int]] = None
+
         # registered instruments
         self._registered_instruments: MutableMapping[TaskEvent,
                                                      List[Instrument]]
         self._registered_instruments = defaultdict(lambda: [])
 
-        # fulfilled dependency counter
-        self._dependencies: MutableMapping[str, int] = defaultdict(lambda: 0)
-
-        # max time of dependency, gives task begin time
-        # starts will not be included
-        self._dtimes: MutableMapping[str, List[Time]] = defaultdict(lambda: [])
-
-        self._node_times: List[List[Time]]
-        # self._node_times = [[0] * processes] * nodes needs deepcopy!
-        # self._node_times = defaultdict(lambda: defaultdict(lambda: 0))
-        self._node_times = []
-        for nidx in range(nodes):
-            self._node_times.append([])
-            for _ in range(processes):
-                self._node_times[nidx].append(Time(0))
-
-        self._task_handlers: MutableMapping[str,
-                                            Union[
-                                                Callable[[Time, StartTask, int], Time],
-                                                Callable[[Time, ProxyTask, int], Time],
-                                                Callable[[Time, SleepTask, int], Time],
-                                                Callable[[Time, ComputeTask, int], Time],
-                                                Callable[[Time, PutTask, int], Time],
-                                                Callable[[Time, GetTask, int], Time],
-                                                ]] = dict()
-
-        self._task_handlers['ProxyTask'] = self._execute_proxy_task
-        self._task_handlers['StartTask'] = self._execute_start_task
-        self._task_handlers['SleepTask'] = self._execute_sleep_task
-        self._task_handlers['ComputeTask'] = self._execute_compute_task
-        self._task_handlers['PutTask'] = self._execute_put_task
-        self._task_handlers['GetTask'] = self._execute_get_task
+        # mutable state of the run
+        self._state = MachineState(nodes, processes)
+
+        # task handlers indexed by task kind
+        self._task_handlers: List[Optional[Callable[[Time, Task, int], Time]]]
+        self._task_handlers = []
+
+        self.register_task_handler(ProxyTask, self._execute_proxy_task)
+        self.register_task_handler(StartTask, self._execute_start_task)
+        self.register_task_handler(SleepTask, self._execute_sleep_task)
+        self.register_task_handler(ComputeTask, self._execute_compute_task)
+        self.register_task_handler(PutTask, self._execute_put_task)
+        self.register_task_handler(GetTask, self._execute_get_task)
+        self.register_task_handler(MsgTask, self._execute_msg_task)
+        self.register_task_handler(NICTask, self._execute_nic_task)
+
+        # internal events planned by the handler being executed, and the
+        # id of the program task they complete
+        self._planned_events: List[PlannedTask] = []
+        self._origin = -1
 
         self._canvas: Optional[Canvas] = None
 
@@ -102,12 +116,50 @@ class Machine(ABC):
 
         self._registered_instruments[event].append(instrument)
 
+    def register_task_handler(self,
+                              task_type: Type[Task],
+                              handler: Callable[[Time, Any, int], Time]
+                              ) -> None:
+        """
+        Register the handler executing tasks of a task type, the task type
+        is assigned a kind code if it has none.
+
+        The handler is called with the time, the task and the process and
+        returns the completion time of the task, or None if the completion
+        is deferred to internal events planned with plan_event.
+        """
+
+        kind = register_task_kind(task_type)
+
+        if kind >= len(self._task_handlers):
+            self._task_handlers.extend(
+                [None] * (kind + 1 - len(self._task_handlers)))
+
+        self._task_handlers[kind] = handler
+
+    def plan_event(self, time: Time, event: Task) -> None:
+        """
+        Plan an internal event, e.g. a message arriving at a NIC, from
+        within a task handler. The event completes the program task of the
+        handler once its own handler returns a completion time. Events are
+        dropped once executed.
+        """
+
+        state = self._state
+        index = state.next_event
+        state.next_event += 1
+
+        self._planned_events.append((time, -1 - index))
+
+        state.events[index] = event
+        state.origins[index] = self._origin
+
     def is_finished(self) -> bool:
         """
         Checks whether the machine is finished, i.e. no waiting tasks.
         """
 
-        return not self._dependencies and not self._dtimes
+        return self._state.is_finished()
 
     @property
     def nodes(self) -> int:
@@ -125,6 +177,71 @@ class Machine(ABC):
 
         return self._processes
 
+    @property
+    def state(self) -> MachineState:
+        """
+        Get the state of the current run.
+        """
+
+        return self._state
+
+    @state.setter
+    def state(self, state: MachineState) -> None:
+        """
+        Set the state, e.g. a clone of a previous state.
+        """
+
+        if state.nodes != self._nodes or state.processes != self._processes:
+            raise ValueError('MachineState does not match machine size.')
+
+        self._state = state
+
+    def reset(self) -> None:
+        """
+        Resets the machine state such that the next run starts from time 0,
+        the models are reused and reset.
+        """
+
+        self._state.reset()
+
+        if self._compute_model is not None:
+            self._compute_model.reset()
+
+        if self._network_model is not None:
+            self._network_model.reset()
+
+    @property
+    def queue_type(self) -> Type[PriorityQueue]:
+        """
+        Get the priority queue implementation.
+        """
+
+        return self._queue_type
+
+    @property
+    def cache(self) -> Optional[DurationCache]:
+        """
+        Get the duration cache, None if durations are not memoized.
+        """
+
+        return self._cache
+
+    @property
+    def compute(self) -> ComputeModel:
+        """
+        Get the compute model.
+        """
+
+        return self._compute_model
+
+    @property
+    def network(self) -> NetworkModel:
+        """
+        Get the network model.
+        """
+
+        return self._network_model
+
     @property
     def canvas(self) -> Optional[Canvas]:
         """
@@ -156,7 +273,7 @@ class Machine(ABC):
         """
 
         time = max((proc_time
-                    for node in self._node_times
+                    for node in self._state.node_times
                     for proc_time in node))
 
         assert time >= 0
@@ -167,7 +284,7 @@ class Machine(ABC):
         Get the time of a process in a node.
         """
 
-        return self._node_times[node][process]
+        return self._state.node_times[node][process]
 
     def run(self, program: Program) -> None:
         """
@@ -180,83 +297,260 @@ class Machine(ABC):
                                f'{program.get_process_count()} than '
                                f'{self.nodes}.')
 
-        # TODO if sampling mode, then multiprocessing here
-        # separate MachineState
-        # if not self.draw_mode:
-        #     multiprocessing.pool
-        #     # give different seeds to the machines
-
         self._run(program)
 
+    def run_samples(self,
+                    program: Program,
+                    samples: int,
+                    seeds: SeedLike = None,
+                    workers: Optional[int] = None,
+                    record: bool = False
+                    ) -> SampleResult:
+        """
+        Runs the given Program samples times, each sample on a fresh
+        machine with independently seeded models.
+
+        Samples are distributed over a pool of workers processes, see
+        fennel.core.sampling.run_samples.
+        """
+
+        if program.get_process_count() > self.nodes:
+            raise RuntimeError(f'{program} requires greater node count '
+                               f'{program.get_process_count()} than '
+                               f'{self.nodes}.')
+
+        return run_samples(self, program, samples, seeds, workers, record)
+
+    def seed(self, seed: int) -> None:
+        """
+        Seeds the compute and network models with independent streams
+        derived from the given seed.
+        """
+
+        compute, network = np.random.SeedSequence(seed).generate_state(2)
+
+        if self._compute_model is not None:
+            self._compute_model.seed(int(compute))
+
+        if self._network_model is not None:
+            self._network_model.seed(int(network))
+
     def _run(self, program: Program) -> None:
         """
         Run the given Program on the current machine state.
         """
 
-        queue = PriorityQueue()
+        compiled = program.compile()
+
+        # durations of deterministic models are looked up by task id, the
+        # tasks of implicit programs are not known in advance
+        if self._cache is not None and not compiled.implicit:
+            self._spans, self._locals, self._remotes = compiled.precompute(
+                self._compute_model, self._network_model, self._cache)
+
+        else:
+            self._spans = self._locals = self._remotes = None
+
+        # dependency times are only kept for instruments of LOADED
+        self._state.load(compiled,
+                         bool(self._registered_instruments[TaskEvent.LOADED]))
+
+        queue = self._queue_type()
 
         # insert all start tasks
-        starts = program.get_start_tasks()
+        starts = compiled.start_ids.tolist()
         assert starts
         queue.push_iterable_with_time(Time(0), starts)
 
-        # process entire queue
+        # process entire queue, one batch of equal time tasks at a time
         while queue.is_not_empty():
-            # execute next task
-            plannedtask = queue.pop()
+            time, batch = queue.pop_batch()
 
             # for instrument in self._registered_instruments[TaskEvent.SCHEDULED]:
             #     instrument.task_scheduled(plannedtask)
 
-            successors = self._execute(program, plannedtask)
+            # execute batch in task id order, successors released no later
+            # than the batch join it in (time, task id) order, such that
+            # tasks run in the order of a single queue
+            current = [(time, tid) for tid in batch]
+            successors: List[PlannedTask] = []
+
+            while current:
+                planned_task = heapq.heappop(current)
 
-            # insert all successor tasks
-            queue.push_iterable(successors)
+                for successor in self._execute(program, compiled,
+                                               planned_task):
+                    if successor[0] <= time:
+                        heapq.heappush(current, successor)
+                    else:
+                        successors.append(successor)
+
+            # insert all later successor tasks at once
+            if successors:
+                queue.push_batch(successors)
+
+    def _earliest(self, task: Task) -> Tuple[Time, int]:
+        """
+        Find the earliest time and process of the node to execute the task.
+        """
+
+        if task.concurrent:
+            times = self._state.node_times[task.node]
+            earliest = min(times)
+
+            return earliest, times.index(earliest)
+
+        return max(self._state.node_times[task.node]), 0
 
     def _execute(self,
                  program: Program,
+                 compiled: CompiledProgram,
                  planned_task: PlannedTask
                  ) -> List[PlannedTask]:
         """
-        Looks up required handler for task and executes task using that
-        handler.
+        Executes the task if its node is available, otherwise the task is
+        parked in the ready queue of the node. Negative ids are internal
+        events.
         """
 
         assert program is not None
         assert planned_task is not None
 
-        time, task = planned_task
+        time, tid = planned_task
+
+        if tid < 0:
+            task = self._state.events[-tid - 1]
+
+            # events without host do not wait for a process
+            if not task.host:
+                return self._execute_task(program, compiled, time, tid, -1,
+                                          time)
+
+        else:
+            task = compiled.tasks[tid]
 
         assert task is not None
         assert time >= 0
 
         logging.debug('scheduled %s @ %i', task.name, time)
 
-        # find earliest time to execute of processes in node
-        if task.concurrent:
-            tmp = list(proc for proc in self._node_times[task.node])
-            earliest = min(tmp)
-            process = tmp.index(earliest)
+        # a parked task handed back to the queue is no longer handed
+        handed = self._state.handed[task.node][not task.concurrent]
+        parked = tid in handed
+        if parked:
+            handed.remove(tid)
 
-        else:
-            earliest = max(proc for proc in self._node_times[task.node])
-            process = 0
+        # find earliest time to execute of processes in node
+        earliest, process = self._earliest(task)
 
         # delay task if process time is further
         if earliest > time:
             # this happens with multiple successors on the same node
 
-            for instrument in self._registered_instruments[TaskEvent.DELAYED]:
-                instrument.task_delayed(task, program, time, earliest)
+            if tid >= 0 and not parked:
+                for instrument in self._registered_instruments[TaskEvent.DELAYED]:
+                    instrument.task_delayed(task, program, time, earliest)
+
+            return self._park_task(task, earliest, tid)
+
+        planned = self._execute_task(program, compiled, time, tid, process,
+                                     earliest)
+
+        if parked:
+            planned.extend(self._hand_off(compiled, time, task.node,
+                                          not task.concurrent))
+
+        return planned
+
+    def _park_task(self, task: Task, earliest: Time, tid: int
+                   ) -> List[PlannedTask]:
+        """
+        Holds a delayed task in the ready queue of its node and kind. The
+        lowest id of every queue is handed to the global queue at the
+        earliest time, such that it competes with tasks of the same time by
+        task id like all delayed tasks in a single queue, while the other
+        parked tasks wait until it executed.
+        """
+
+        kind = not task.concurrent
+        handed = self._state.handed[task.node][kind]
+
+        if handed and min(handed) < tid:
+            heapq.heappush(self._state.parked[task.node][kind], tid)
+            return []
+
+        handed.add(tid)
+        return [(earliest, tid)]
+
+    def _hand_off(self,
+                  compiled: CompiledProgram,
+                  time: Time,
+                  node: int,
+                  kind: bool
+                  ) -> List[PlannedTask]:
+        """
+        Hands the lowest parked id of a ready queue to the global queue once
+        no lower id is handed, at the earliest time no earlier than now.
+        """
+
+        parked = self._state.parked[node][kind]
+        handed = self._state.handed[node][kind]
+
+        if not parked or (handed and min(handed) < parked[0]):
+            return []
+
+        tid = heapq.heappop(parked)
+        handed.add(tid)
+
+        earliest, _ = self._earliest(self._task(compiled, tid))
+
+        return [(max(time, earliest), tid)]
 
-            return [(earliest, task)]
+    def _task(self, compiled: CompiledProgram, tid: int) -> Task:
+        """
+        Get the program task or internal event of an id.
+        """
+
+        if tid >= 0:
+            return compiled.tasks[tid]
+
+        return self._state.events[-tid - 1]
 
-        # execute instruments for EXECUTED event
-        for instrument in self._registered_instruments[TaskEvent.EXECUTED]:
-            instrument.task_executed(task, program, earliest)
+    def _execute_task(self,
+                      program: Program,
+                      compiled: CompiledProgram,
+                      time: Time,
+                      tid: int,
+                      process: int,
+                      earliest: Time
+                      ) -> List[PlannedTask]:
+        """
+        Looks up required handler for task and executes task using that
+        handler on the given process. Internal events planned by the
+        handler are returned with the successors.
+        """
 
-        # look up task handler and execute
-        handler = self._task_handlers[task.__class__.__name__]
+        if tid >= 0:
+            task = compiled.tasks[tid]
+            self._origin = tid
+
+            # execute instruments for EXECUTED event
+            for instrument in self._registered_instruments[TaskEvent.EXECUTED]:
+                instrument.task_executed(task, program, earliest)
+
+        else:
+            index = -tid - 1
+            task = self._state.events.pop(index)
+            self._origin = self._state.origins.pop(index)
+
+        # look up task handler by kind and execute
+        kind = task.kind
+        handler = (self._task_handlers[kind]
+                   if 0 <= kind < len(self._task_handlers) else None)
+
+        if handler is None:
+            raise RuntimeError(f'No handler registered for {task.name} '
+                               f'of type {type(task).__name__}.')
 
         logging.debug('execute %s @ %i', task.name, time)
 
@@ -264,21 +558,35 @@ class Machine(ABC):
         #      we should need to have a specific subclass type cast
         #      planned task is (Time, Task), cannot be cast to specific one
         time_successors = handler(time, task, process)  # type: ignore
-        # TODO this needs to return a list of planned tasks, this is for LogGOPS representation
-        #      or network simulations, tasks are not nessecarily the ones that happen in the program!
         # TODO branching tasks would require dependency mapping here
         #      instead of returning successors return dict mapping of:
         #      name: time
         #      name: never
 
-        return self._complete_task(time_successors,
-                                   program,
-                                   task)
+        planned = self._planned_events
+        if planned:
+            self._planned_events = []
+
+        # completion deferred to the planned events
+        if time_successors is None:
+            return planned
+
+        successors = self._complete_task(time_successors,
+                                         program,
+                                         compiled,
+                                         self._origin)
+
+        if planned:
+            planned.extend(successors)
+            return planned
+
+        return successors
 
     def _complete_task(self,
                        time: Time,
                        program: Program,
-                       task: Task
+                       compiled: CompiledProgram,
+                       tid: int
                        ) -> List[PlannedTask]:
         """
         For every successor of this task, increment a completion counter,
@@ -286,36 +594,55 @@ class Machine(ABC):
         all such successors.
         """
 
+        task = compiled.tasks[tid]
+
         for instrument in self._registered_instruments[TaskEvent.COMPLETED]:
             instrument.task_completed(task, program, time)
 
-        successors = program.get_successors(task.name)
+        if compiled.implicit:
+            successors = compiled.successors(tid)
+            anys = compiled.anys
+            compiled.tasks.release(tid)
+
+        else:
+            offsets, targets, _, anys = compiled.views()
+            successors = targets[offsets[tid]:offsets[tid + 1]]
 
         # only proxy tasks can have no successors
-        if not (isinstance(task, ProxyTask) or successors):
+        if not (successors or isinstance(task, ProxyTask)):
             raise RuntimeError('All programs must end with proxy tasks. '
                                f'{task.name} is not a ProxyTask.')
 
         planned = []
 
-        for successor in successors:
-            # increment completed dependencies for successor
-            # forward task to last dependency
-            self._dependencies[successor] += 1
-
-            # save successors dependency end time
-            self._dtimes[successor].append(time)
+        remaining = self._state.remaining
+        ready = self._state.ready
+        dtimes = self._state.dtimes
 
+        for successor in successors:
             # check there aren't more dependencies completed than there are
             # dependencies for the task
-            assert (self._dependencies[successor] <=
-                    program.get_in_degree(successor))
+            assert remaining[successor] > 0
+
+            # keep the any smallest dependency times or the maximum
+            if anys[successor]:
+                heap = self._state.any_times.setdefault(successor, [])
+                heapq.heappush(heap, -time)
+
+                if len(heap) > anys[successor]:
+                    heapq.heappop(heap)
+
+            elif time > ready[successor]:
+                ready[successor] = time
 
-            # check if all dependencies completed
-            if (self._dependencies[successor] ==
-                    program.get_in_degree(successor)):
+            # save successors dependency end time
+            if dtimes is not None:
+                dtimes.setdefault(successor, []).append(time)
 
-                planned.append(self._load_task(successor, program))
+            # decrement remaining dependencies and check if all completed
+            remaining[successor] -= 1
+            if not remaining[successor]:
+                planned.append(self._load_task(successor, program, compiled))
 
         return planned
 
@@ -324,39 +651,49 @@ class Machine(ABC):
         Convenience function to update time of (node, process).
         """
 
-        self._node_times[node][process] = time
+        self._state.node_times[node][process] = time
 
     def _load_task(self,
-                   name: str,
-                   program: Program
+                   tid: int,
+                   program: Program,
+                   compiled: CompiledProgram
                    ) -> PlannedTask:
         """
         Loads the Task from the Program and creates a PlannedTask.
         """
 
-        task = program[name]
-        if not task:
-            raise RuntimeError('Successor does not exist.')
+        task = compiled.tasks[tid]
 
         # find successor start time
         if task.any is not None:
-            # find lowest end time of dependencies of any #
-            time_next = sorted(self._dtimes[name])[task.any - 1]
+            # the any-th lowest end time of dependencies is the largest
+            # of the kept any lowest
+            heap = self._state.any_times.pop(tid)
+
+            if len(heap) < task.any:
+                raise RuntimeError(f'{task.name} requires {task.any} '
+                                   f'dependencies, has {len(heap)}.')
+
+            time_next = -heap[0]
 
         else:
-            time_next = max(self._dtimes[name])
+            time_next = self._state.ready[tid]
+
+        # sparse counters only keep tasks waiting on dependencies
+        if self._state.sparse:
+            del self._state.remaining[tid]
+            self._state.ready.pop(tid, None)
 
         assert isinstance(time_next, int), time_next
 
         # trigger the TaskEvent LOADED
-        for instrument in self._registered_instruments[TaskEvent.LOADED]:
-            instrument.task_loaded(task, program, time_next, self._dtimes[name])
+        if self._state.dtimes is not None:
+            dtimes = self._state.dtimes.pop(tid)
 
-        # delete record of program
-        del self._dtimes[name]
-        del self._dependencies[name]
+            for instrument in self._registered_instruments[TaskEvent.LOADED]:
+                instrument.task_loaded(task, program, time_next, dtimes)
 
-        return (time_next, task)
+        return (time_next, tid)
 
     def _execute_proxy_task(self,
                             time: Time,
@@ -438,8 +775,12 @@ class Machine(ABC):
         logging.debug('compute task @ %i on (%i, %i)', time,
                       task.node, process)
 
-        assert self._compute_model is not None
-        time_compute = self._compute_model.evaluate(time, task)
+        if self._spans is not None:
+            time_compute = cast(Time, time + self._spans[self._origin])
+
+        else:
+            assert self._compute_model is not None
+            time_compute = self._compute_model.evaluate(time, task)
 
         self._set_process_time(task.node, process, time_compute)
 
@@ -451,19 +792,42 @@ class Machine(ABC):
 
         return time_compute
 
-    def _execute_put_task(self,
+    def _evaluate_network(self,
                           time: Time,
-                          task: PutTask,
-                          process: int
-                          ) -> Time:
+                          task: Union[PutTask, GetTask]
+                          ) -> NetworkTime:
         """
-        Execute the put task.
+        Evaluate the network model, or look up the precomputed durations of
+        a deterministic model.
         """
 
+        if self._remotes is not None:
+            assert self._locals is not None
+
+            return NetworkTime(cast(Time, time + self._locals[self._origin]),
+                               cast(Time, time + self._remotes[self._origin]))
+
         assert self._network_model is not None
-        times = self._network_model.evaluate(time, task)
+        return self._network_model.evaluate(time, task)
 
-        self._set_process_time(task.node, process, times.local)
+    def _plan_network_events(self, times: NetworkTime) -> None:
+        """
+        Plan the internal events returned by the network model.
+        """
+
+        if times.events:
+            for time, event in times.events:
+                self.plan_event(time, event)
+
+    def _draw_put_task(self,
+                       task: PutTask,
+                       time: Time,
+                       local: Time,
+                       remote: Time
+                       ) -> None:
+        """
+        Draw a put task once its remote time is known.
+        """
 
         if self.draw_mode and task.drawable:
             assert self.canvas is not None
@@ -474,14 +838,31 @@ class Machine(ABC):
                 self.canvas.draw_blocking_put_task(task.node,
                                                    task.target,
                                                    time,
-                                                   times.remote)
+                                                   remote)
 
             else:
                 self.canvas.draw_non_blocking_put_task(task.node,
                                                        task.target,
                                                        time,
-                                                       times.local,
-                                                       times.remote)
+                                                       local,
+                                                       remote)
+
+    def _execute_put_task(self,
+                          time: Time,
+                          task: PutTask,
+                          process: int
+                          ) -> Optional[Time]:
+        """
+        Execute the put task.
+        """
+
+        times = self._evaluate_network(time, task)
+
+        self._set_process_time(task.node, process, times.local)
+        self._plan_network_events(times)
+
+        if times.remote is not None:
+            self._draw_put_task(task, time, times.local, times.remote)
 
         return times.remote
 
@@ -489,24 +870,77 @@ class Machine(ABC):
                           time: Time,
                           task: GetTask,
                           process: int
-                          ) -> Time:
+                          ) -> Optional[Time]:
         """
         Execute the get task.
         """
 
-        assert self._network_model is not None
-        times = self._network_model.evaluate(time, task)
+        times = self._evaluate_network(time, task)
 
         # TODO this varies with blocking
         self._set_process_time(task.node, process, times.local)
+        self._plan_network_events(times)
 
-        if self.draw_mode and task.drawable:
+        if self.draw_mode and task.drawable and times.remote is not None:
             assert self.canvas is not None
 
             self.canvas.draw_get_task(task.node, task.target, time, times.remote, times.local)
 
         return times.remote
 
+    def _execute_msg_task(self,
+                          time: Time,
+                          task: MsgTask,
+                          process: int
+                          ) -> Optional[Time]:
+        """
+        Execute a message arriving at the NIC of its node, no process is
+        occupied.
+        """
+
+        assert process < 0
+
+        assert self._network_model is not None
+        times = self._network_model.evaluate(time, task)
+
+        self._plan_network_events(times)
+
+        return times.remote
+
+    def _execute_nic_task(self,
+                          time: Time,
+                          task: NICTask,
+                          process: int
+                          ) -> Optional[Time]:
+        """
+        Execute the host processing of a received message, which completes
+        the origin task of the message.
+        """
+
+        assert self._network_model is not None
+        times = self._network_model.evaluate(time, task)
+
+        self._set_process_time(task.node, process, times.local)
+        self._plan_network_events(times)
+
+        if times.remote is not None:
+            message = task.message
+            origin = message.origin
+
+            if isinstance(origin, PutTask):
+                self._draw_put_task(origin, message.start, message.local,
+                                    times.remote)
+
+            elif (isinstance(origin, GetTask) and self.draw_mode and
+                  origin.drawable):
+                assert self.canvas is not None
+
+                self.canvas.draw_get_task(origin.node, origin.target,
+                                          message.start, message.local,
+                                          times.remote)
+
+        return times.remote
+
 
 
 # remove magic 1000, require some intelligent way of memory requirement
@@ -6,12 +6,14 @@ Defines the NetworkModel and NetworkTime classes.
 # pylint: disable=too-few-public-methods
 
 
-from typing import Union
+from typing import (Union, Callable, List, Optional, Type, Tuple, Any,
+                    Hashable)
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
 
 from fennel.core.time import Time
+from fennel.core.task import Task, register_task_kind
 from fennel.tasks.put import PutTask
 from fennel.tasks.get import GetTask
 
@@ -21,17 +23,38 @@ class NetworkTime():
     """
     Dataclass used to represent local return time
     and remote arrival time for a network operation.
+
+    Models which complete operations through internal events, such as
+    messages arriving at a NIC, return these events to be planned by the
+    machine. A remote time of None defers the completion of the operation
+    to the events.
     """
 
     local: Time
-    remote: Time
+    remote: Optional[Time]
+    events: Optional[List[Tuple[Time, Task]]] = None
 
 
 class NetworkModel(ABC):
     """
     Abstract class for all network models.
+
+    Models dispatch tasks to their evaluators by task kind, see
+    register_task_evaluator.
+
+    Deterministic models evaluate tasks with equal duration keys to equal
+    durations independent of the time, such that durations can be
+    memoized. Deterministic models may also provide vectorized_durations
+    to evaluate arrays of tasks at once, which must agree with evaluate.
     """
 
+    deterministic = False
+
+    def __init__(self) -> None:
+        # evaluators indexed by task kind
+        self._evaluators: List[Optional[Callable[[Time, Any], NetworkTime]]]
+        self._evaluators = []
+
     @abstractmethod
     def evaluate(self,
                  time: Time,
@@ -39,3 +62,63 @@ class NetworkModel(ABC):
         """
         Evaluate this model.
         """
+
+    def duration_key(self,
+                     task: Union[PutTask, GetTask]
+                     ) -> Optional[Hashable]:
+        """
+        Get the key of the task duration, None if it cannot be memoized.
+        """
+
+        return None
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """
+        Get a key of the parameters the durations depend on, precomputed
+        durations are reused while it is unchanged. None if unknown, then
+        durations are never reused.
+        """
+
+        return None
+
+    def seed(self, seed: int) -> None:
+        """
+        Reseed any random state of the model. Deterministic models ignore
+        the seed.
+        """
+
+    def reset(self) -> None:
+        """
+        Reset any state the model keeps across tasks of a run. Stateless
+        models ignore this.
+        """
+
+    def register_task_evaluator(self,
+                                task_type: Type[Task],
+                                evaluator: Callable[[Time, Any], NetworkTime]
+                                ) -> None:
+        """
+        Register the evaluator of a task type, the task type is assigned a
+        kind code if it has none.
+        """
+
+        kind = register_task_kind(task_type)
+
+        if kind >= len(self._evaluators):
+            self._evaluators.extend([None] * (kind + 1 - len(self._evaluators)))
+
+        self._evaluators[kind] = evaluator
+
+    def _evaluate_task(self, time: Time, task: Task) -> NetworkTime:
+        """
+        Evaluate the task with the evaluator registered for its kind.
+        """
+
+        kind = task.kind
+        evaluator = (self._evaluators[kind]
+                     if 0 <= kind < len(self._evaluators) else None)
+
+        if evaluator is None:
+            raise RuntimeError(f"Task {task} not recognized.")
+
+        return evaluator(time, task)
@@ -1,60 +1,554 @@
 """
 Abstraction of the noise generation.
+
+Noise models are composed into compute models as host noise and into
+network models as network noise. Machine.seed seeds both from independent
+streams, such that host and network noise never share draws.
 """
 
-# from abc import ABC, abstractmethod
-# from random import choice
 
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Sequence, Union, Tuple
+import os
+
+
+import numpy as np  # type: ignore
+
+
+class NoiseModel(ABC):
+    """
+    Abstract class for all noise models.
+
+    Single samples are handed out from blocks pre-drawn from a seeded numpy
+    Generator. Blocks are refilled lazily once the cursor reaches the end,
+    such that a single sample is a list index. The block size doubles from
+    a small first block up to block, short runs draw little noise.
+    """
+
+    def __init__(self, block: int = 1 << 16, seed: Optional[int] = None):
+        if block < 1:
+            raise ValueError("NoiseModel requires block > 0")
+
+        self._block = block
+        self._generator = np.random.default_rng(seed)
+
+        self._values: List[float] = []
+        self._cursor = 0
+        self._size = min(256, block)
+
+    @abstractmethod
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        """
+        Draw size noise values from the generator.
+        """
+
+    def seed(self, seed: Optional[int]) -> None:
+        """
+        Reseed the generator and drop the current block.
+        """
+
+        self._generator = np.random.default_rng(seed)
+
+        self._values = []
+        self._cursor = 0
+        self._size = min(256, self._block)
+
+    def sample_many(self, size: int) -> np.ndarray:
+        """
+        Draw size noise values at once.
+        """
+
+        return self._draw(self._generator, size)
+
+    def sample(self) -> float:
+        """
+        Get the next noise value.
+        """
+
+        if self._cursor >= len(self._values):
+            self._values = self._draw(self._generator, self._size).tolist()
+            self._cursor = 0
+            self._size = min(2 * self._size, self._block)
+
+        value = self._values[self._cursor]
+        self._cursor += 1
+
+        return value
+
+    def sample_node(self, node: int) -> float:
+        """
+        Get the next noise value of a node, models without per node noise
+        share a single stream.
+        """
+
+        return self.sample()
+
+
+class NoNoiseModel(NoiseModel):
+    """
+    Noise free model, every sample is 0.
+    """
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        return np.zeros(size)
+
+    def sample(self) -> float:
+        return 0.0
+
+
+class NormalNoise(NoiseModel):
+    """
+    Normal distributed noise.
+    """
+
+    def __init__(self,
+                 mean: float,
+                 stdev: float,
+                 block: int = 1 << 16,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(block, seed)
+
+        self._mean = mean
+        self._stdev = stdev
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        return generator.normal(self._mean, self._stdev, size)
+
+
+class BetaPrimeNoise(NoiseModel):
+    """
+    Betaprime distributed noise, the ratio of two gamma variates.
+    """
+
+    def __init__(self,
+                 alpha: float,
+                 beta: float,
+                 loc: float = 0.0,
+                 scale: float = 1.0,
+                 block: int = 1 << 16,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(block, seed)
+
+        self._alpha = alpha
+        self._beta = beta
+        self._loc = loc
+        self._scale = scale
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        ratio = (generator.standard_gamma(self._alpha, size) /
+                 generator.standard_gamma(self._beta, size))
+
+        return self._loc + self._scale * ratio
+
+
+class GammaNoise(NoiseModel):
+    """
+    Gamma distributed noise.
+    """
+
+    def __init__(self,
+                 alpha: float,
+                 loc: float = 0.0,
+                 scale: float = 1.0,
+                 block: int = 1 << 16,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(block, seed)
+
+        self._alpha = alpha
+        self._loc = loc
+        self._scale = scale
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        return self._loc + generator.gamma(self._alpha, self._scale, size)
+
+
+class InvGaussNoise(NoiseModel):
+    """
+    Inverse Gaussian distributed noise, parameterized like
+    scipy.stats.invgauss.
+    """
+
+    def __init__(self,
+                 mu: float,
+                 loc: float = 0.0,
+                 scale: float = 1.0,
+                 block: int = 1 << 16,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(block, seed)
+
+        self._mu = mu
+        self._loc = loc
+        self._scale = scale
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        return self._loc + self._scale * generator.wald(self._mu, 1.0, size)
+
+
+class HistogramNoise(NoiseModel):
+    """
+    Empirical noise following the histogram of measured data, values are
+    uniform within a bin.
+    """
+
+    def __init__(self,
+                 data: Sequence[float],
+                 bins: int = 64,
+                 block: int = 1 << 16,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(block, seed)
+
+        counts, self._edges = np.histogram(np.asarray(data, dtype=float), bins)
+
+        if not counts.sum():
+            raise ValueError("HistogramNoise requires data")
+
+        self._probabilities = counts / counts.sum()
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        bins = generator.choice(len(self._probabilities), size,
+                                p=self._probabilities)
+
+        return generator.uniform(self._edges[bins], self._edges[bins + 1])
+
+
+class SampleNoise(NoiseModel):
+    """
+    Empirical noise drawn uniformly from measured samples.
+    """
+
+    def __init__(self,
+                 samples: Sequence[float],
+                 block: int = 1 << 16,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(block, seed)
+
+        self._samples = np.asarray(samples, dtype=float).reshape(-1)
+
+        if not len(self._samples):
+            raise ValueError("SampleNoise requires samples")
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        return generator.choice(self._samples, size)
+
+
+class TraceNoise(NoiseModel):
+    """
+    Empirical noise replayed from a trace file, either a raw binary file of
+    dtype values or a .npy file. The trace is memory-mapped, such that
+    multi-GB traces are never loaded and sample workers share its pages.
+
+    The trace is read sequentially from the start, from a random offset for
+    every block, or per node from a stripe of the trace for every node.
+    """
+
+    SEQUENTIAL = 'sequential'
+    OFFSET = 'offset'
+    NODE = 'node'
+
+    # values read per node at once in per node mode
+    NODE_BLOCK = 1024
+
+    def __init__(self,
+                 path: Union[str, os.PathLike],
+                 dtype: Union[str, np.dtype] = np.float64,
+                 mode: str = SEQUENTIAL,
+                 nodes: int = 1,
+                 scale: float = 1.0,
+                 block: int = 1 << 16,
+                 seed: Optional[int] = None) -> None:
+        super().__init__(block, seed)
+
+        if mode not in (self.SEQUENTIAL, self.OFFSET, self.NODE):
+            raise ValueError(f"TraceNoise mode {mode} not recognized")
+
+        if nodes < 1:
+            raise ValueError("TraceNoise requires nodes > 0")
+
+        self._path = os.fspath(path)
+        self._dtype = np.dtype(dtype)
+        self._mode = mode
+        self._nodes = nodes
+        self._scale = scale
+
+        self._trace = self._open()
+
+        if len(self._trace) < nodes:
+            raise ValueError("TraceNoise requires a value per node")
+
+        self._position = 0
+
+        # stripe, position and block of every node in per node mode
+        self._stride = len(self._trace) // nodes
+        self._node_positions = [0] * nodes
+        self._node_values: List[List[float]] = [[] for _ in range(nodes)]
+        self._node_cursors = [0] * nodes
+
+    def _open(self) -> np.ndarray:
+        """
+        Memory-map the trace read only.
+        """
+
+        if self._path.endswith('.npy'):
+            return np.load(self._path, mmap_mode='r').reshape(-1)
+
+        return np.memmap(self._path, dtype=self._dtype, mode='r')
+
+    def __getstate__(self):
+        # only the path is shipped, the trace is mapped again on unpickling
+        state = self.__dict__.copy()
+        state['_trace'] = None
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._trace = self._open()
+
+    def __len__(self) -> int:
+        return len(self._trace)
+
+    @property
+    def mode(self) -> str:
+        """
+        Get the reading mode.
+        """
+
+        return self._mode
+
+    def seed(self, seed: Optional[int]) -> None:
+        """
+        Reseed the generator and rewind the trace.
+        """
+
+        super().seed(seed)
+
+        self._position = 0
+        self._node_positions = [0] * self._nodes
+        self._node_values = [[] for _ in range(self._nodes)]
+        self._node_cursors = [0] * self._nodes
+
+    def _read(self, first: int, length: int, offset: int, size: int
+              ) -> np.ndarray:
+        """
+        Read size values from offset of the region of length from first,
+        wrapping around at the end of the region.
+        """
+
+        if offset + size <= length:
+            values = self._trace[first + offset:first + offset + size]
+
+        else:
+            indices = first + (offset + np.arange(size)) % length
+            values = self._trace[indices]
+
+        return self._scale * np.asarray(values, dtype=np.float64)
+
+    def _draw(self, generator: np.random.Generator, size: int) -> np.ndarray:
+        length = len(self._trace)
+
+        if self._mode == self.OFFSET:
+            start = int(generator.integers(length))
+
+        else:
+            start = self._position
+            self._position = (start + size) % length
+
+        return self._read(0, length, start, size)
+
+    def sample_node(self, node: int) -> float:
+        """
+        Get the next noise value of a node, in per node mode read from the
+        stripe of the node.
+        """
+
+        if self._mode != self.NODE:
+            return self.sample()
+
+        cursor = self._node_cursors[node]
+        values = self._node_values[node]
+
+        if cursor >= len(values):
+            size = min(self.NODE_BLOCK, self._stride)
+            first = node * self._stride
+            position = self._node_positions[node]
+
+            values = self._read(first, self._stride, position, size).tolist()
+
+            self._node_values[node] = values
+            self._node_positions[node] = (position + size) % self._stride
+            cursor = 0
+
+        self._node_cursors[node] = cursor + 1
+
+        return values[cursor]
+
+
+class DetourNoise:
+    """
+    Time-correlated OS noise as per node schedules of detours, periodic
+    detours (e.g. timer interrupts) with a random phase per node and
+    random detours (e.g. daemons) arriving as a Poisson process.
+
+    Detours are kept per node as sorted, disjoint intervals together with
+    the free time before every detour, such that stretching an operation
+    by the detours it overlaps is a binary search. Schedules are generated
+    lazily in windows of horizon time, independently seeded per node.
+    """
+
+    def __init__(self,
+                 nodes: int,
+                 period: Optional[int] = None,
+                 detour: int = 0,
+                 rate: float = 0.0,
+                 random_detour: float = 0.0,
+                 horizon: int = 1 << 20,
+                 seed: Optional[int] = None) -> None:
+        if nodes < 1:
+            raise ValueError("DetourNoise requires nodes > 0")
+
+        if period is not None and period <= detour:
+            raise ValueError("DetourNoise requires period > detour")
+
+        if horizon < 1:
+            raise ValueError("DetourNoise requires horizon > 0")
+
+        self._nodes = nodes
+        self._period = period
+        self._detour = detour
+        self._rate = rate
+        self._random_detour = random_detour
+        self._horizon = horizon
+
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int]) -> None:
+        """
+        Reseed the schedules of all nodes, schedules are regenerated.
+        """
+
+        sequences = np.random.SeedSequence(seed).spawn(self._nodes)
+        self._generators = [np.random.default_rng(sequence)
+                            for sequence in sequences]
+
+        self._phases = [int(generator.integers(self._period))
+                        if self._period else 0
+                        for generator in self._generators]
+
+        # detour intervals, the free time before every detour and the
+        # total detour time before every detour of every node
+        self._starts: List[List[int]] = [[] for _ in range(self._nodes)]
+        self._ends: List[List[int]] = [[] for _ in range(self._nodes)]
+        self._free: List[List[int]] = [[] for _ in range(self._nodes)]
+        self._before: List[List[int]] = [[0] for _ in range(self._nodes)]
+
+        # time until which the schedule of every node is generated
+        self._generated = [0] * self._nodes
+
+    def _generate(self, node: int) -> None:
+        """
+        Generate the detours of the next window of a node.
+        """
+
+        first = self._generated[node]
+        last = first + self._horizon
+
+        starts = np.empty(0, dtype=np.int64)
+        lengths = np.empty(0, dtype=np.int64)
+
+        if self._period and self._detour > 0:
+            phase = self._phases[node]
+            begin = max(0, -((phase - first) // self._period))
+
+            periodic = phase + self._period * np.arange(
+                begin, (last - phase - 1) // self._period + 1, dtype=np.int64)
+
+            starts = np.concatenate((starts, periodic))
+            lengths = np.concatenate(
+                (lengths, np.full(len(periodic), self._detour, np.int64)))
+
+        if self._rate > 0.0 and self._random_detour > 0.0:
+            generator = self._generators[node]
+            count = generator.poisson(self._rate * self._horizon)
+
+            randoms = np.sort(generator.integers(first, last, count))
+            durations = np.rint(generator.exponential(self._random_detour,
+                                                      count)).astype(np.int64)
+
+            starts = np.concatenate((starts, randoms))
+            lengths = np.concatenate((lengths, durations))
+
+        order = np.argsort(starts, kind='stable')
+        starts, ends = starts[order], starts[order] + lengths[order]
+
+        node_starts = self._starts[node]
+        node_ends = self._ends[node]
+        node_free = self._free[node]
+        before = self._before[node]
 
-# import scipy.stats
+        # merge overlapping detours, also with the last of the previous
+        # window
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if end <= start:
+                continue
 
+            if node_ends and start <= node_ends[-1]:
+                if end > node_ends[-1]:
+                    before[-1] += end - node_ends[-1]
+                    node_ends[-1] = end
 
-# class NoiseModel(ABC):
-#     """
-#     """
+                continue
 
-#     def __init__(self, seed: int) -> None:
-#         self._seed = seed
+            node_starts.append(start)
+            node_ends.append(end)
+            node_free.append(start - before[-1])
+            before.append(before[-1] + end - start)
 
-#     @abstractmethod
-#     def sample(self) -> int:
-#         """
-#         Sample the noise model.
-#         """
+        self._generated[node] = last
 
+    def stretch(self, node: int, start: int, end: int) -> int:
+        """
+        Get the end of an operation of the node spanning [start, end) if
+        it is interrupted by the detours it overlaps.
+        """
 
-# class NoNoiseModel(NoiseModel):
-#     """
-#     """
+        if end <= start:
+            return end
 
-#     def __init__(self):
-#         pass
+        while True:
+            # the free time at start and the free time to finish at
+            index = bisect_right(self._starts[node], start)
 
-#     def sample(self) -> int:
-#         """
-#         """
+            if index and self._ends[node][index - 1] > start:
+                free = self._free[node][index - 1]
 
-#         return 0
+            else:
+                free = start - self._before[node][index]
 
+            target = free + end - start
 
-# class NormalNoise(NoiseModel):
-#     """
-#     """
+            index = bisect_left(self._free[node], target)
+            stretched = target + self._before[node][index]
 
-#     def __init__(self, seed: int, mean: float, stdev: float) -> None:
-#         super().__init__(seed)
+            # the schedule must cover the next detour after the end
+            if (index < len(self._free[node]) or
+                    stretched < self._generated[node]):
+                return stretched
 
-#         self._mean = mean
-#         self._stdev = stdev
+            self._generate(node)
 
-#         rvs = scipy.stats.norm.rvs(self._mean, self._stdev,
-#                                    size=100, random_state=self._seed)
+    def intervals(self, node: int, start: int, end: int
+                  ) -> List[Tuple[int, int]]:
+        """
+        Get the detours of the node overlapping [start, end), e.g. to
+        draw a noise overlay.
+        """
 
-#         self._rvs = [int(r) for r in rvs]
+        while self._generated[node] < end:
+            self._generate(node)
 
-#     def sample(self) -> int:
-#         """
-#         Sample the normal distributed noise function.
-#         """
+        first = bisect_right(self._ends[node], start)
+        last = bisect_left(self._starts[node], end)
 
-#         return choice(self._rvs)
+        return list(zip(self._starts[node][first:last],
+                        self._ends[node][first:last]))
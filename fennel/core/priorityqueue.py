@@ -1,19 +1,24 @@
 """
-Defines the internal priority queue implementation.
+Defines the internal priority queue implementations.
+
+All queues order (time, task id) pairs by time and break ties by the task
+id, such that every implementation pops in the same deterministic order.
 """
 
 
-from typing import List, Iterable
+from typing import List, Iterable, MutableMapping, Tuple
 import heapq
 
 
-from fennel.core.task import Task, PlannedTask
+from fennel.core.task import PlannedTask
 from fennel.core.time import Time
 
 
 class PriorityQueue:
     """
     A wrapper around any particular priority queue implementation.
+
+    The default implementation is a binary heap.
     """
 
     def __init__(self):
@@ -33,18 +38,18 @@ class PriorityQueue:
 
         return heapq.heappop(self._task_queue)
 
-    def push(self, time: Time, task: Task) -> None:
+    def push(self, time: Time, task: int) -> None:
         """
-        Push a task into the priority queue at a time priority.
+        Push a task id into the priority queue at a time priority.
         """
 
         heapq.heappush(self._task_queue, (time, task))
 
     def push_iterable_with_time(self,
                                 time: Time,
-                                tasks: Iterable[Task]) -> None:
+                                tasks: Iterable[int]) -> None:
         """
-        Appends all Tasks to the queue with a globally given time..
+        Appends all task ids to the queue with a globally given time..
         """
 
         for task in tasks:
@@ -52,8 +57,218 @@ class PriorityQueue:
 
     def push_iterable(self, tasks: Iterable[PlannedTask]) -> None:
         """
-        Appens all Tasks to the queue with each having a given time.
+        Appens all task ids to the queue with each having a given time.
+        """
+
+        for time, task in tasks:
+            self.push(time, task)
+
+    def pop_batch(self) -> Tuple[Time, List[int]]:
+        """
+        Removes all task ids of the earliest time, ordered by task id.
+        """
+
+        time, task = heapq.heappop(self._task_queue)
+        batch = [task]
+
+        while self._task_queue and self._task_queue[0][0] == time:
+            batch.append(heapq.heappop(self._task_queue)[1])
+
+        return time, batch
+
+    def push_batch(self, tasks: List[PlannedTask]) -> None:
+        """
+        Appends a batch of task ids to the queue with each having a given
+        time. Large batches are merged with a single heapify.
+        """
+
+        if len(tasks) * 8 > len(self._task_queue):
+            self._task_queue.extend(tasks)
+            heapq.heapify(self._task_queue)
+
+        else:
+            for combined in tasks:
+                heapq.heappush(self._task_queue, combined)
+
+
+class BucketQueue(PriorityQueue):
+    """
+    A calendar style queue with a bucket of task ids per distinct time.
+
+    Only the distinct times are kept in a heap, events of collective
+    programs cluster at few times such that most pushes and pops only
+    touch a small bucket.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self._times: List[Time] = []
+        self._buckets: MutableMapping[Time, List[int]] = {}
+
+    def is_not_empty(self) -> bool:
+        """
+        Deteremines whether the queue is empty.
+        """
+
+        return bool(self._times)
+
+    def pop(self) -> PlannedTask:
+        """
+        Removes the lowest task id of the earliest bucket.
+        """
+
+        time = self._times[0]
+        bucket = self._buckets[time]
+        task = heapq.heappop(bucket)
+
+        if not bucket:
+            heapq.heappop(self._times)
+            del self._buckets[time]
+
+        return time, task
+
+    def push(self, time: Time, task: int) -> None:
+        """
+        Push a task id into the bucket of the time.
+        """
+
+        bucket = self._buckets.get(time)
+
+        if bucket is None:
+            self._buckets[time] = [task]
+            heapq.heappush(self._times, time)
+
+        else:
+            heapq.heappush(bucket, task)
+
+    def pop_batch(self) -> Tuple[Time, List[int]]:
+        """
+        Removes the earliest bucket, ordered by task id.
+        """
+
+        time = heapq.heappop(self._times)
+        batch = self._buckets.pop(time)
+        batch.sort()
+
+        return time, batch
+
+    def push_batch(self, tasks: List[PlannedTask]) -> None:
+        """
+        Appends a batch of task ids to the buckets of their times.
+        """
+
+        for time, task in tasks:
+            self.push(time, task)
+
+
+class RadixHeap(PriorityQueue):
+    """
+    A monotone radix heap for integer times.
+
+    Pushes are O(1), the amortized pop cost is bounded by the bit width of
+    the times. Times earlier than the last popped time, which only occur
+    for tasks with the any property, are kept in a separate heap.
+    """
+
+    BITS = 64
+
+    def __init__(self):
+        super().__init__()
+
+        self._last = 0
+        self._size = 0
+
+        # tasks pushed earlier than the last time
+        self._late: List[PlannedTask] = []
+
+        # bucket 0 holds the task ids at the last time as a heap,
+        # bucket b holds tasks whose time differs in bit b-1 as highest
+        self._current: List[int] = []
+        self._buckets: List[List[PlannedTask]] = [[]
+                                                  for _ in range(self.BITS + 1)]
+
+    def is_not_empty(self) -> bool:
+        """
+        Deteremines whether the queue is empty.
         """
 
-        for combined in tasks:
-            heapq.heappush(self._task_queue, combined)
+        return self._size > 0
+
+    def pop(self) -> PlannedTask:
+        """
+        Removes the lowest task id of the earliest time.
+        """
+
+        self._size -= 1
+
+        if self._late:
+            return heapq.heappop(self._late)
+
+        if not self._current:
+            # find first non-empty bucket and redistribute from its minimum
+            bucket = next(bucket for bucket in self._buckets if bucket)
+            self._last = min(time for time, _ in bucket)
+
+            for time, task in bucket:
+                self._insert(time, task)
+
+            bucket.clear()
+
+        return Time(self._last), heapq.heappop(self._current)
+
+    def pop_batch(self) -> Tuple[Time, List[int]]:
+        """
+        Removes all task ids of the earliest time, ordered by task id.
+        """
+
+        time, task = self.pop()
+        batch = [task]
+
+        if self._late:
+            while self._late and self._late[0][0] == time:
+                batch.append(heapq.heappop(self._late)[1])
+                self._size -= 1
+
+        elif time == self._last:
+            self._current.sort()
+            batch.extend(self._current)
+            self._size -= len(self._current)
+            self._current.clear()
+
+        return time, batch
+
+    def push_batch(self, tasks: List[PlannedTask]) -> None:
+        """
+        Appends a batch of task ids to the queue with each having a given
+        time.
+        """
+
+        for time, task in tasks:
+            self.push(time, task)
+
+    def _insert(self, time: Time, task: int) -> None:
+        """
+        Insert into the bucket relative to the last time.
+        """
+
+        index = (time ^ self._last).bit_length()
+
+        if index:
+            self._buckets[index].append((time, task))
+
+        else:
+            heapq.heappush(self._current, task)
+
+    def push(self, time: Time, task: int) -> None:
+        """
+        Push a task id at a time.
+        """
+
+        if time < self._last:
+            heapq.heappush(self._late, (time, task))
+
+        else:
+            self._insert(time, task)
+
+        self._size += 1
@@ -8,6 +8,7 @@ from collections import defaultdict
 
 
 from fennel.core.task import Task
+from fennel.core.compiled import CompiledProgram
 from fennel.tasks.start import StartTask
 
 
@@ -26,6 +27,8 @@ class Program:
 
         self._metadata: MutableMapping[str, Task] = dict()
 
+        self._compiled: Optional[CompiledProgram] = None
+
     def get_task(self, name: str) -> Task:
         """
         Get a task by name.
@@ -41,10 +44,15 @@ class Program:
 
     def add_node(self, task: Task) -> None:
         """
-        Adds a node to this program.
+        Adds a node to this program, the task id is its insertion index.
         """
 
+        existing = self._metadata.get(task.name)
+        task.taskid = (existing.taskid if existing is not None
+                       else len(self._metadata))
+
         self._metadata[task.name] = task
+        self._compiled = None
 
     def add_edge(self, name_from: str, name_to: str) -> None:
         """
@@ -59,6 +67,35 @@ class Program:
 
         self._edges_out[name_from].add(name_to)
         self._edges_in[name_to].add(name_from)
+        self._compiled = None
+
+    def compile(self) -> CompiledProgram:
+        """
+        Freezes the DAG into a CompiledProgram with dense integer task ids.
+
+        The result is cached until the program is modified.
+        """
+
+        if self._compiled is None:
+            names = list(self._metadata)
+            index = {name: tid for tid, name in enumerate(names)}
+
+            edges = ((index[name_from], index[name_to])
+                     for name_from, names_to in self._edges_out.items()
+                     for name_to in names_to)
+
+            self._compiled = CompiledProgram(names,
+                                             list(self._metadata.values()),
+                                             edges)
+
+        return self._compiled
+
+    def get_task_names(self) -> List[str]:
+        """
+        Get the names of all tasks in insertion order.
+        """
+
+        return list(self._metadata)
 
     def get_process_count(self) -> int:
         """
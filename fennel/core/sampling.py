@@ -0,0 +1,199 @@
+"""
+Defines the Monte Carlo sampling of a Program on a Machine.
+
+Samples are distributed over a process pool, every worker receives the
+Program once and runs each sample with an independent seed.
+"""
+
+
+import copy
+import multiprocessing
+import os
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union, List, Tuple
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.program import Program
+from fennel.core.task import TaskEvent
+from fennel.core.compute import ComputeModel
+from fennel.core.network import NetworkModel
+from fennel.instruments.record import RecorderInstrument
+
+
+SeedLike = Union[None, int, Sequence[int]]
+
+
+@dataclass
+class SampleResult():
+    """
+    Dataclass holding the makespan of every sample and optionally the
+    completion time of every task per sample. Tasks which never completed
+    have completion time -1.
+    """
+
+    makespans: np.ndarray
+    names: Optional[List[str]] = None
+    completions: Optional[np.ndarray] = None
+
+
+@dataclass
+class _SampleSetup():
+    """
+    Everything a worker requires to run samples, shipped once per worker.
+    """
+
+    machine_type: type
+    nodes: int
+    processes: int
+    compute: Optional[ComputeModel]
+    network: Optional[NetworkModel]
+    queue_type: type
+    cache: int
+    program: Program
+    names: Optional[List[str]]
+
+
+class _Sampler:
+    """
+    Runs samples on a single machine which is reset for every sample.
+    """
+
+    def __init__(self, setup: _SampleSetup):
+        self._setup = setup
+
+        self._machine = setup.machine_type(setup.nodes, setup.processes,
+                                           setup.compute, setup.network,
+                                           setup.queue_type, setup.cache)
+
+        self._recorder: Optional[RecorderInstrument] = None
+        if setup.names is not None:
+            self._recorder = RecorderInstrument()
+            self._machine.register_instrument(TaskEvent.COMPLETED,
+                                              self._recorder)
+
+    def __call__(self, seed: int) -> Tuple[int, Optional[List[int]]]:
+        """
+        Run a single sample with the given seed.
+        """
+
+        self._machine.reset()
+        self._machine.seed(seed)
+
+        if self._recorder is not None:
+            self._recorder.clear()
+
+        self._machine.run(self._setup.program)
+
+        completions = None
+        if self._recorder is not None:
+            assert self._setup.names is not None
+
+            record = self._recorder.record
+            completions = [record.get(name, -1) for name in self._setup.names]
+
+        return self._machine.maximum_time, completions
+
+
+_WORKER_SAMPLER: Optional[_Sampler] = None
+
+
+def spawn_seeds(seeds: SeedLike, samples: int) -> List[int]:
+    """
+    Derive a seed for every sample. A single seed (or None for fresh
+    entropy) is expanded into independent child seeds, a sequence of seeds
+    is used as given.
+    """
+
+    if seeds is None or isinstance(seeds, (int, np.integer)):
+        sequence = np.random.SeedSequence(seeds)
+
+        return [int(child.generate_state(1)[0])
+                for child in sequence.spawn(samples)]
+
+    seeds = [int(seed) for seed in seeds]
+    if len(seeds) != samples:
+        raise ValueError(f'{len(seeds)} seeds given for {samples} samples.')
+
+    return seeds
+
+
+def _initialize_worker(setup: _SampleSetup) -> None:
+    """
+    Create the sampler of the worker process.
+    """
+
+    global _WORKER_SAMPLER  # pylint: disable=global-statement
+    _WORKER_SAMPLER = _Sampler(setup)
+
+
+def _run_worker_sample(seed: int) -> Tuple[int, Optional[List[int]]]:
+    """
+    Run a single sample with the sampler of this worker.
+    """
+
+    assert _WORKER_SAMPLER is not None
+    return _WORKER_SAMPLER(seed)
+
+
+def run_samples(machine,
+                program: Program,
+                samples: int,
+                seeds: SeedLike = None,
+                workers: Optional[int] = None,
+                record: bool = False
+                ) -> SampleResult:
+    """
+    Run the program samples times on copies of the given machine, each
+    worker reuses a single machine which is reset between samples.
+
+    The samples are distributed over workers processes, by default one per
+    cpu. A single worker runs all samples in this process.
+    """
+
+    if samples < 1:
+        raise ValueError('Sampling requires samples > 0.')
+
+    if machine.draw_mode:
+        raise RuntimeError('Sampling cannot be used in draw mode.')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError('Sampling requires workers > 0.')
+
+    # the models of the given machine are never reseeded
+    compute, network = copy.deepcopy((machine.compute, machine.network))
+
+    names = program.get_task_names() if record else None
+    cache = machine.cache.maxsize if machine.cache is not None else 0
+    setup = _SampleSetup(type(machine), machine.nodes, machine.processes,
+                         compute, network, machine.queue_type, cache,
+                         program, names)
+
+    sample_seeds = spawn_seeds(seeds, samples)
+
+    if workers == 1 or samples == 1:
+        sampler = _Sampler(setup)
+        results = [sampler(seed) for seed in sample_seeds]
+
+    else:
+        chunksize = max(1, samples // (workers * 4))
+
+        with multiprocessing.Pool(workers,
+                                  initializer=_initialize_worker,
+                                  initargs=(setup,)) as pool:
+            results = pool.map(_run_worker_sample, sample_seeds, chunksize)
+
+    makespans = np.fromiter((makespan for makespan, _ in results),
+                            dtype=np.int64, count=samples)
+
+    if not record:
+        return SampleResult(makespans)
+
+    completions = np.array([times for _, times in results], dtype=np.int64)
+
+    return SampleResult(makespans, names, completions)
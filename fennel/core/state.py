@@ -0,0 +1,225 @@
+"""
+Defines the MachineState class, the mutable state of a run.
+"""
+
+
+from typing import (Callable, Dict, MutableMapping, List, Optional, Sequence,
+                    Set, Tuple, Union)
+
+
+from fennel.core.time import Time
+from fennel.core.task import Task
+from fennel.core.compiled import CompiledProgram
+
+
+class SparseRemaining(Dict[int, int]):
+    """
+    Remaining dependency counters of an implicit program, only tasks with
+    some completed dependencies are stored.
+    """
+
+    __slots__ = ('_in_degree',)
+
+    def __init__(self, in_degree: Callable[[int], int]):
+        super().__init__()
+        self._in_degree = in_degree
+
+    def __missing__(self, tid: int) -> int:
+        return self._in_degree(tid)
+
+    def copy(self) -> 'SparseRemaining':
+        remaining = SparseRemaining(self._in_degree)
+        remaining.update(self)
+
+        return remaining
+
+
+class SparseReady(Dict[int, Time]):
+    """
+    Dependency times of an implicit program, only tasks with some completed
+    dependencies are stored.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, tid: int) -> Time:
+        return Time(0)
+
+    def copy(self) -> 'SparseReady':
+        ready = SparseReady()
+        ready.update(self)
+
+        return ready
+
+
+class MachineState:
+    """
+    The MachineState holds everything a run mutates, such that a Machine
+    and its models can be reused for many runs by resetting or cloning the
+    state.
+    """
+
+    def __init__(self, nodes: int, processes: int):
+        if nodes < 1:
+            raise ValueError("MachineState requires nodes > 0")
+
+        if processes < 1:
+            raise ValueError("MachineState requires processes > 0")
+
+        self._nodes = nodes
+        self._processes = processes
+
+        # process times of every node, preallocated
+        self.node_times: List[List[Time]]
+        self.node_times = [[Time(0)] * processes for _ in range(nodes)]
+
+        # ready queues of delayed concurrent and blocking tasks of every
+        # node, heaps of task ids, and the ids of delayed tasks handed back
+        # to the global queue
+        self.parked: List[Tuple[List[int], List[int]]]
+        self.parked = [([], []) for _ in range(nodes)]
+        self.handed: List[Tuple[Set[int], Set[int]]]
+        self.handed = [(set(), set()) for _ in range(nodes)]
+
+        # remaining dependency counter of every task, seeded from the
+        # in-degree of the program at the start of a run
+        self.remaining: Union[List[int], SparseRemaining] = []
+
+        # max time of completed dependencies, gives task begin time
+        self.ready: Union[List[Time], SparseReady] = []
+
+        # whether the counters are sparse, entries of loaded tasks are
+        # dropped such that only the active frontier is kept
+        self.sparse = False
+
+        # the any smallest dependency times of tasks with the any property,
+        # kept as negated max heaps
+        self.any_times: MutableMapping[int, List[Time]] = {}
+
+        # all dependency times, only recorded if requested by an instrument
+        self.dtimes: Optional[MutableMapping[int, List[Time]]] = None
+
+        # pending internal events planned by the models and the id of the
+        # program task every event completes by event number, event i has
+        # the id -(1 + i) and is dropped once executed
+        self.events: Dict[int, Task] = {}
+        self.origins: Dict[int, int] = {}
+        self.next_event = 0
+
+        self._in_degree: Sequence[int] = []
+
+    @property
+    def nodes(self) -> int:
+        """
+        Get the node count.
+        """
+
+        return self._nodes
+
+    @property
+    def processes(self) -> int:
+        """
+        Get the process count.
+        """
+
+        return self._processes
+
+    def load(self, program: CompiledProgram, record: bool = False) -> None:
+        """
+        Seeds the dependency counters for a run of the given program, if
+        record is set all dependency times are kept. Implicit programs are
+        tracked with sparse counters.
+        """
+
+        if getattr(program, 'implicit', False):
+            self._in_degree = []
+            self.remaining = SparseRemaining(program.in_degree)
+            self.ready = SparseReady()
+            self.sparse = True
+
+        else:
+            _, _, in_degree, _ = program.views()
+
+            self._in_degree = in_degree
+            self.remaining = list(in_degree)
+            self.ready = [Time(0)] * len(in_degree)
+            self.sparse = False
+
+        self.any_times = {}
+        self.dtimes = {} if record else None
+        self.events = {}
+        self.origins = {}
+        self.next_event = 0
+
+    def is_finished(self) -> bool:
+        """
+        Checks whether no tasks are waiting on dependencies.
+        """
+
+        if self.sparse:
+            return not self.remaining
+
+        return not any(0 < remaining < degree
+                       for remaining, degree
+                       in zip(self.remaining, self._in_degree))
+
+    def reset(self) -> None:
+        """
+        Resets the state in place to the beginning of a run.
+        """
+
+        for times in self.node_times:
+            times[:] = [Time(0)] * self._processes
+
+        for queues in self.parked:
+            for parked in queues:
+                parked.clear()
+
+        for sets in self.handed:
+            for handed in sets:
+                handed.clear()
+
+        self._in_degree = []
+        self.remaining = []
+        self.ready = []
+        self.sparse = False
+        self.any_times = {}
+        self.dtimes = None
+        self.events = {}
+        self.origins = {}
+        self.next_event = 0
+
+    def clone(self) -> 'MachineState':
+        """
+        Create an independent copy of this state.
+        """
+
+        state = MachineState.__new__(MachineState)
+
+        state._nodes = self._nodes
+        state._processes = self._processes
+
+        state.node_times = [list(times) for times in self.node_times]
+
+        state.parked = [(list(concurrent), list(blocking))
+                        for concurrent, blocking in self.parked]
+        state.handed = [(set(concurrent), set(blocking))
+                        for concurrent, blocking in self.handed]
+
+        state._in_degree = self._in_degree
+        state.remaining = self.remaining.copy()
+        state.ready = self.ready.copy()
+        state.sparse = self.sparse
+        state.any_times = {tid: list(times)
+                           for tid, times in self.any_times.items()}
+
+        state.events = dict(self.events)
+        state.origins = dict(self.origins)
+        state.next_event = self.next_event
+
+        state.dtimes = None
+        if self.dtimes is not None:
+            state.dtimes = {tid: list(times)
+                            for tid, times in self.dtimes.items()}
+
+        return state
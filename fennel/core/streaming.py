@@ -0,0 +1,251 @@
+"""
+Defines the StreamingProgram class, programs read incrementally from a
+stream of tasks and edges.
+
+A stream is an iterable of tasks and edges, an edge is a pair of task
+names. Tasks are numbered in the order of the stream, the machine reads
+the stream while it asks for the successors and dependency counts of
+tasks and drops the data of every completed task, such that only the
+tasks between the frontier of the run and the window ahead of it are
+held.
+
+The stream must respect the window: every edge follows both its tasks
+and precedes the window-th task after either of them. All start tasks
+precede every other task.
+"""
+
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, \
+    Sequence, Tuple, Union
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.implicit import ImplicitProgram
+from fennel.core.task import Task
+from fennel.tasks.start import StartTask
+
+
+Edge = Tuple[str, str]
+Item = Union[Task, Edge]
+Source = Callable[[], Iterable[Item]]
+
+
+class ProgramStream(ImplicitProgram):
+    """
+    A single pass over the stream of a program, the compiled form of a
+    StreamingProgram for one run. The length is the number of tasks read.
+    """
+
+    def __init__(self, items: Iterable[Item], window: int):
+        super().__init__(0, 0)
+
+        self._items: Optional[Iterator[Item]] = iter(items)
+        self._window = window
+
+        self._read = 0
+        self._starts: List[int] = []
+        self._started = False
+
+        # data of every task read and neither completed nor dropped, the
+        # names are dropped once a task leaves the window
+        self._data: Dict[int, Task] = {}
+        self._successors: Dict[int, List[int]] = {}
+        self._in_degree: Dict[int, int] = {}
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._read
+
+    @property
+    def window(self) -> int:
+        """
+        Get the number of tasks read ahead of a task to know all its edges.
+        """
+
+        return self._window
+
+    @property
+    def held(self) -> int:
+        """
+        Get the number of tasks read and not yet completed.
+        """
+
+        return len(self._data)
+
+    def _advance(self, tid: int) -> None:
+        """
+        Read the stream until all edges of the task are known.
+        """
+
+        while self._items is not None and self._read <= tid + self._window:
+            item = next(self._items, None)
+
+            if item is None:
+                self._items = None
+
+            elif isinstance(item, Task):
+                self._add_task(item)
+
+            else:
+                self._add_edge(*item)
+
+    def _add_task(self, task: Task) -> None:
+        tid = self._read
+
+        if task.name in self._ids:
+            raise ValueError(f'{task.name} is streamed twice.')
+
+        if isinstance(task, StartTask):
+            if self._started:
+                raise ValueError(f'{task.name} follows other than start '
+                                 'tasks.')
+
+            self._starts.append(tid)
+
+        else:
+            self._started = True
+
+        self._data[tid] = task
+        self._ids[task.name] = tid
+        self._read += 1
+
+        # the edges of the task leaving the window are complete
+        sealed = self._data.get(tid - self._window)
+        if sealed is not None:
+            del self._ids[sealed.name]
+
+    def _add_edge(self, source: str, target: str) -> None:
+        try:
+            first = self._ids[source]
+            second = self._ids[target]
+
+        except KeyError as error:
+            raise ValueError(f'{error.args[0]} of edge {source} -> {target} '
+                             'is not a task within the window of '
+                             f'{self._window} tasks.') from None
+
+        self._successors.setdefault(first, []).append(second)
+        self._in_degree[second] = self._in_degree.get(second, 0) + 1
+
+    @property
+    def start_ids(self) -> np.ndarray:
+        """
+        Get the ids of all start tasks, the tasks leading the stream.
+        """
+
+        while self._items is not None and not self._started:
+            self._advance(self._read)
+
+        return np.array(self._starts, dtype=np.int64)
+
+    def get_process_count(self) -> int:
+        """
+        Get number of processes required by program, the number of start tasks.
+        """
+
+        return len(self.start_ids)
+
+    def create_task(self, tid: int) -> Task:
+        """
+        Get the streamed task of an id, completed tasks are gone.
+        """
+
+        self._advance(tid)
+
+        try:
+            return self._data[tid]
+
+        except KeyError:
+            raise KeyError(f'Task {tid} is completed or not streamed.') \
+                from None
+
+    def successors(self, tid: int) -> Sequence[int]:
+        """
+        Get the ids of all tasks dependent on this task.
+        """
+
+        self._advance(tid)
+
+        return self._successors.get(tid, ())
+
+    def in_degree(self, tid: int) -> int:
+        """
+        Get the number of dependencies of the task.
+        """
+
+        self._advance(tid)
+
+        return self._in_degree.get(tid, 0)
+
+    def any_count(self, tid: int) -> int:
+        """
+        Get the any count of the task, 0 if all dependencies are required.
+        """
+
+        return self.create_task(tid).any or 0
+
+    def release(self, tid: int) -> None:
+        """
+        Drop the data of a completed task.
+        """
+
+        task = self._data.pop(tid, None)
+        self._successors.pop(tid, None)
+        self._in_degree.pop(tid, None)
+
+        if task is not None and self._ids.get(task.name) == tid:
+            del self._ids[task.name]
+
+
+class StreamingProgram:
+    """
+    A program given by a function returning a stream of its tasks and
+    edges, e.g. a generator function. Every run reads a fresh stream, only
+    the tasks of the frontier and the window ahead of it are held.
+
+    The source is pickled for sampling workers, i.e. it must be a module
+    level function or a partial of one.
+    """
+
+    def __init__(self, source: Source, window: int = 1024):
+        if window < 1:
+            raise ValueError('StreamingProgram requires window > 0')
+
+        self._source = source
+        self._window = window
+        self._processes: Optional[int] = None
+
+    @property
+    def window(self) -> int:
+        """
+        Get the number of tasks read ahead of a task to know all its edges.
+        """
+
+        return self._window
+
+    def compile(self) -> ProgramStream:
+        """
+        Open a new pass over the stream.
+        """
+
+        return ProgramStream(self._source(), self._window)
+
+    def get_process_count(self) -> int:
+        """
+        Get number of processes required by program, the number of start tasks.
+        """
+
+        if self._processes is None:
+            self._processes = self.compile().get_process_count()
+
+        return self._processes
+
+    def get_task_names(self) -> List[str]:
+        """
+        Get the names of all tasks in stream order.
+        """
+
+        return [item.name for item in self._source()
+                if isinstance(item, Task)]
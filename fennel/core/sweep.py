@@ -0,0 +1,298 @@
+"""
+Defines the parameter sweep of a Program family over model parameters.
+
+Under deterministic models with vectorized durations, such as the
+latency-bandwidth and gamma models, all grid points of a program are
+evaluated in a single critical path sweep with a vector of times per
+task. Grid points whose run contends a process, and all points of other
+models, are run on machines distributed over a process pool.
+"""
+
+
+import multiprocessing
+import os
+from dataclasses import dataclass
+from itertools import product
+from typing import (Any, Callable, List, Optional, Sequence, Tuple, Union)
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.program import Program
+from fennel.core.compiled import CompiledProgram, vectorizes
+from fennel.core.implicit import ImplicitProgram
+from fennel.core.streaming import StreamingProgram
+from fennel.core.compute import ComputeModel
+from fennel.core.network import NetworkModel
+from fennel.core.critical import longest_path, contended
+from fennel.core.machine import Machine
+from fennel.core.sampling import SeedLike, spawn_seeds
+from fennel.core.task import (KIND_START, KIND_SLEEP, KIND_COMPUTE,
+                              KIND_PUT, KIND_GET)
+from fennel.computes.gamma import GammaModel
+from fennel.networks.lbmodel import LBModel
+
+
+ComputeFactory = Callable[[float], ComputeModel]
+NetworkFactory = Callable[[int, float], NetworkModel]
+
+# a job runs a grid point on a machine, (program index, latency,
+# bandwidth, gamma, seed)
+_Job = Tuple[int, int, float, float, int]
+
+
+@dataclass
+class SweepResult():
+    """
+    Dataclass holding the makespan of every grid point, indexed by family
+    parameter, latency, bandwidth and gamma, and the number of points
+    which were run on machines.
+    """
+
+    makespans: np.ndarray
+    parameters: List[Any]
+    latency: List[int]
+    bandwidth: List[float]
+    gamma: List[float]
+    simulated: int = 0
+
+
+@dataclass
+class _SweepSetup():
+    """
+    Everything a worker requires to run grid points, shipped once per
+    worker.
+    """
+
+    programs: List[Union[Program, CompiledProgram]]
+    nodes: List[int]
+    processes: int
+    compute: ComputeFactory
+    network: NetworkFactory
+
+
+_WORKER_SETUP: Optional[_SweepSetup] = None
+
+
+def _initialize_worker(setup: _SweepSetup) -> None:
+    """
+    Keep the setup in the worker process.
+    """
+
+    global _WORKER_SETUP  # pylint: disable=global-statement
+    _WORKER_SETUP = setup
+
+
+def _run_job(setup: _SweepSetup, job: _Job) -> int:
+    """
+    Run a single grid point on a fresh machine.
+    """
+
+    index, latency, bandwidth, gamma, seed = job
+
+    machine = Machine(setup.nodes[index], setup.processes,
+                      setup.compute(gamma), setup.network(latency, bandwidth))
+    machine.seed(seed)
+    machine.run(setup.programs[index])
+
+    return machine.maximum_time
+
+
+def _run_worker_job(job: _Job) -> int:
+    """
+    Run a single grid point with the setup of this worker.
+    """
+
+    assert _WORKER_SETUP is not None
+    return _run_job(_WORKER_SETUP, job)
+
+
+def grid_durations(compiled: CompiledProgram,
+                   computes: Sequence[ComputeModel],
+                   networks: Sequence[NetworkModel]
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the completion offset and the process offset of every task with a
+    column per grid point, given by the equally long sequences of models
+    of the points. All models must vectorize.
+    """
+
+    kinds = compiled.kinds
+    shape = (len(compiled), len(computes))
+
+    if not compiled.is_builtin():
+        raise ValueError('Sweep requires built-in task types.')
+
+    columns = compiled.columns()
+
+    done = np.zeros(shape, dtype=np.int64)
+
+    starts = kinds == KIND_START
+    done[starts] = columns.first[starts, None]
+
+    sleeps = kinds == KIND_SLEEP
+    if np.any(columns.first[sleeps] < 0):
+        raise ValueError('Sweep requires sleep tasks with a delay.')
+    done[sleeps] = columns.first[sleeps, None]
+
+    busy = done.copy()
+
+    compute_ids = np.flatnonzero(kinds == KIND_COMPUTE)
+    network_ids = np.flatnonzero((kinds == KIND_PUT) | (kinds == KIND_GET))
+
+    for point, (compute, network) in enumerate(zip(computes, networks)):
+        if len(compute_ids):
+            spans = compiled.compute_durations(compute)[compute_ids]
+            done[compute_ids, point] = busy[compute_ids, point] = spans
+
+        if len(network_ids):
+            local, remote = compiled.network_durations(network)
+
+            done[network_ids, point] = remote[network_ids]
+            busy[network_ids, point] = local[network_ids]
+
+    return done, busy
+
+
+def _vectorized(compiled: CompiledProgram,
+                processes: int,
+                computes: Sequence[ComputeModel],
+                networks: Sequence[NetworkModel],
+                chunk: int
+                ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate all grid points in sweeps of at most chunk task times, get
+    the makespans and whether every point requires a machine run.
+    """
+
+    points = len(computes)
+
+    makespans = np.zeros(points, dtype=np.int64)
+    rerun = np.zeros(points, dtype=bool)
+
+    # the critical path cannot choose among processes of a node
+    if processes > 1 and any(task.concurrent for task in compiled.tasks):
+        rerun[:] = True
+        return makespans, rerun
+
+    step = max(1, chunk // max(1, len(compiled)))
+
+    for first in range(0, points, step):
+        last = min(points, first + step)
+
+        done, busy = grid_durations(compiled, computes[first:last],
+                                    networks[first:last])
+        makespan, finish = longest_path(compiled, done, busy)
+
+        makespans[first:last] = makespan
+        rerun[first:last] = contended(compiled, done, busy, finish)
+
+    return makespans, rerun
+
+
+def sweep(family: Union[Program, CompiledProgram,
+                        Callable[[Any], Union[Program, CompiledProgram]]],
+          parameters: Sequence[Any] = (None,),
+          latency: Sequence[int] = (0,),
+          bandwidth: Sequence[float] = (0.0,),
+          gamma: Sequence[float] = (0.0,),
+          nodes: Optional[int] = None,
+          processes: int = 1,
+          compute: ComputeFactory = GammaModel,
+          network: NetworkFactory = LBModel,
+          seeds: SeedLike = None,
+          workers: Optional[int] = None,
+          chunk: int = 1 << 24
+          ) -> SweepResult:
+    """
+    Evaluate the program of every family parameter on the full grid of
+    latency, bandwidth and gamma values. A Program is a family of itself,
+    families may return compiled programs, e.g. from a GeneratorCache.
+
+    The models are built per grid point from the compute and network
+    factories. If the models of all points vectorize, e.g. GammaModel and
+    LBModel, every program of built-in tasks is evaluated in one critical
+    path sweep and points whose run contends a process are run on
+    machines. Otherwise every point is run on a machine with its own
+    seed, distributed over workers processes, by default one per cpu.
+    With more than one worker the programs and both factories are
+    pickled, i.e. the factories must be module level callables, classes
+    or partials of them.
+    """
+
+    if isinstance(family, (Program, CompiledProgram, ImplicitProgram,
+                           StreamingProgram)):
+        program = family
+        family = lambda _: program  # noqa: E731
+
+    parameters = list(parameters)
+    axes = (list(latency), list(bandwidth), list(gamma))
+
+    if not all(axes) or not parameters:
+        raise ValueError('Sweep requires a non-empty grid.')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError('Sweep requires workers > 0.')
+
+    grid = np.array(list(product(*axes)), dtype=np.float64)
+    latencies = grid[:, 0].astype(np.int64)
+    bandwidths = grid[:, 1]
+    gammas = grid[:, 2]
+
+    points = len(grid)
+
+    programs = [family(parameter) for parameter in parameters]
+    node_counts = [nodes if nodes is not None else
+                   program.get_process_count() for program in programs]
+
+    makespans = np.zeros((len(programs), points), dtype=np.int64)
+    rerun = np.ones((len(programs), points), dtype=bool)
+
+    computes = [compute(gamma) for gamma in gammas.tolist()]
+    networks = [network(latency, bandwidth) for latency, bandwidth
+                in zip(latencies.tolist(), bandwidths.tolist())]
+
+    if all(vectorizes(model) for model in computes + networks):
+        for index, program in enumerate(programs):
+            compiled = program.compile()
+
+            # implicit programs have no arrays to sweep, programs without
+            # columns are run on machines
+            if compiled.implicit or not compiled.has_columns():
+                continue
+
+            makespans[index], rerun[index] = _vectorized(
+                compiled, processes, computes, networks, chunk)
+
+    jobs_ids = np.flatnonzero(rerun.ravel())
+    job_seeds = spawn_seeds(seeds, max(1, len(jobs_ids)))
+
+    jobs: List[_Job] = []
+    for job_id, seed in zip(jobs_ids.tolist(), job_seeds):
+        index, point = divmod(job_id, points)
+        jobs.append((index, int(latencies[point]), float(bandwidths[point]),
+                     float(gammas[point]), seed))
+
+    setup = _SweepSetup(programs, node_counts, processes, compute, network)
+
+    if workers == 1 or len(jobs) <= 1:
+        results = [_run_job(setup, job) for job in jobs]
+
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+
+        with multiprocessing.Pool(workers,
+                                  initializer=_initialize_worker,
+                                  initargs=(setup,)) as pool:
+            results = pool.map(_run_worker_job, jobs, chunksize)
+
+    makespans.ravel()[jobs_ids] = results
+
+    shape = (len(programs),) + tuple(len(axis) for axis in axes)
+
+    return SweepResult(makespans.reshape(shape), parameters, axes[0],
+                       axes[1], axes[2], len(jobs))
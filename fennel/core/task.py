@@ -3,15 +3,29 @@ The base class for all tasks.
 """
 
 
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Type
 from enum import Enum, auto
+from itertools import count
 
 
 from fennel.core.time import Time
 
 
-# TODO Task could be specific Union, contravariant...
-PlannedTask = Tuple[Time, 'Task']
+# a task id of a compiled program planned at a time
+PlannedTask = Tuple[Time, int]
+
+
+# task kind codes used for table dispatch, user defined task types are
+# assigned codes by register_task_kind
+KIND_UNKNOWN = -1
+KIND_START = 0
+KIND_PROXY = 1
+KIND_SLEEP = 2
+KIND_COMPUTE = 3
+KIND_PUT = 4
+KIND_GET = 5
+
+_KIND_COUNTER = count(KIND_GET + 1)
 
 
 class TaskEvent(Enum):
@@ -41,9 +55,20 @@ class TaskEvent(Enum):
 class Task:
     """
     The abstract definition of what a task is.
+
+    Tasks are slotted to keep programs with millions of tasks small, the
+    task id is assigned by the program the task is added to.
     """
 
-    task_counter: int = 0
+    __slots__ = ('_name', '_node', '_concurrent', '_any', '_drawable',
+                 '_taskid')
+
+    # the kind code of the task type, inherited by subclasses
+    kind: int = KIND_UNKNOWN
+
+    # whether the task occupies a process of its node, tasks without host
+    # are executed immediately when planned
+    host: bool = True
 
     def __init__(self,
                  name: str,
@@ -61,8 +86,8 @@ class Task:
         self._any: Optional[int] = None
         self._drawable = drawable
 
-        self._taskid = Task.task_counter
-        Task.task_counter += 1
+        # assigned when added to a program
+        self._taskid = -1
 
     def __lt__(self, task):
         return self._taskid < task.taskid
@@ -70,11 +95,19 @@ class Task:
     @property
     def taskid(self) -> int:
         """
-        Get task id.
+        Get task id, the index of the task in its program or -1.
         """
 
         return self._taskid
 
+    @taskid.setter
+    def taskid(self, taskid: int) -> None:
+        """
+        Set task id, assigned by the program the task is added to.
+        """
+
+        self._taskid = taskid
+
     @property
     def node(self) -> int:
         """
@@ -125,3 +158,18 @@ class Task:
             raise RuntimeError('Any property must be greater than 0.')
 
         self._any = any_count
+
+
+def register_task_kind(task_type: Type[Task]) -> int:
+    """
+    Assigns the next free kind code to a task type and returns it. Task
+    types which define their own kind keep it, such that registering a type
+    twice returns the same code.
+    """
+
+    if 'kind' in vars(task_type) and task_type.kind != KIND_UNKNOWN:
+        return task_type.kind
+
+    task_type.kind = next(_KIND_COUNTER)
+
+    return task_type.kind
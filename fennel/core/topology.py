@@ -1,53 +1,259 @@
 """
 The topology classes generalize the concept of a topology
 and provide global methods.
+
+Ranks are numbered from 0 and mapped to physical locations of the
+topology, jobs rarely fill a topology perfectly such that the mapping
+decides the distances between ranks.
 """
 
-# procs will be numbered from [0, inf)
-# distance between mapped is important
-
-# jobs are not usually allowed to be fixed size perfectly fitting topology
-
-# proc #0 -> physical location #5
-# proc #1 -> physical location #6 expected, but #10
-
-
-# class Topology:
-#     """
-#     """
-#
-#     def path_delay(self, proc1, proc2):
-#         """
-#         """
-#
-#         raise NotImplementedError
-
-# class AllToAll(Topology):
-#       def minimum(proc1, proc2):
-#               return 1
-#
-# class Star(Topology):
-#       def __init__(self, center):
-#               self.center = center
-#
-#       def minimum(proc1, proc2):
-#               if proc1 == self.center or proc2 == self.center:
-#                       return 1
-#               else:
-#                       return 2
-#
-# class Ring(Topology):
-#       def __init__(self, size):
-#               self.size = size
-#
-#       def minimum(p1, p2):
-#               path1 = p2 - p1
-#               path2 = p2 - p1 - self.size
-#
-#               return path1 if path1 < path2 else path2
-#
-# class FatTree(Topology):
-#       pass
-#
-# class DragonFly(Topology):
-#       pass
+
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+
+import numpy as np  # type: ignore
+
+
+class Topology(ABC):
+    """
+    Abstract class for all topologies.
+
+    Distances are hop counts between locations. For up to TABLE_LIMIT
+    ranks the hop counts of all rank pairs are precomputed into a table,
+    larger jobs use the closed form distance of the topology.
+    """
+
+    TABLE_LIMIT = 1 << 12
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("Topology requires size > 0")
+
+        self._size = size
+
+        self._mapping = np.arange(size, dtype=np.int64)
+        self._table: Optional[np.ndarray] = None
+
+        # bumped whenever the distances between ranks change
+        self._version = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Get the number of locations.
+        """
+
+        return self._size
+
+    @property
+    def version(self) -> int:
+        """
+        Get the number of times the mapping was set.
+        """
+
+        return self._version
+
+    @property
+    def mapping(self) -> np.ndarray:
+        """
+        Get the location of every rank.
+        """
+
+        return self._mapping
+
+    @mapping.setter
+    def mapping(self, mapping: Sequence[int]) -> None:
+        """
+        Set the location of every rank.
+        """
+
+        mapping = np.asarray(mapping, dtype=np.int64)
+
+        if mapping.ndim != 1 or not len(mapping):
+            raise ValueError("Topology mapping requires a location per rank")
+
+        if mapping.min() < 0 or mapping.max() >= self._size:
+            raise ValueError("Topology mapping exceeds the topology")
+
+        self._mapping = mapping
+        self._table = None
+        self._version += 1
+
+    @abstractmethod
+    def distance(self, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """
+        Get the hop counts between locations, element-wise over arrays.
+        """
+
+    def table(self) -> np.ndarray:
+        """
+        Get the hop counts between all pairs of ranks.
+        """
+
+        if self._table is None:
+            locations = self._mapping
+            self._table = self.distance(locations[:, None],
+                                        locations[None, :]).astype(np.int32)
+
+        return self._table
+
+    def hops(self, source: int, target: int) -> int:
+        """
+        Get the hop count between two ranks.
+        """
+
+        if self._table is not None:
+            return self._table.item(source, target)
+
+        if len(self._mapping) <= self.TABLE_LIMIT:
+            return self.table().item(source, target)
+
+        return int(self.distance(self._mapping[source],
+                                 self._mapping[target]))
+
+    def hop_counts(self, source: np.ndarray, target: np.ndarray
+                   ) -> np.ndarray:
+        """
+        Get the hop counts between ranks, element-wise over arrays.
+        """
+
+        if len(self._mapping) <= self.TABLE_LIMIT:
+            return self.table()[source, target].astype(np.int64)
+
+        return self.distance(self._mapping[source],
+                             self._mapping[target]).astype(np.int64)
+
+
+class AllToAll(Topology):
+    """
+    All locations are directly connected.
+    """
+
+    def distance(self, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        return np.not_equal(source, target).astype(np.int64)
+
+
+class Star(Topology):
+    """
+    All locations are connected through a center.
+    """
+
+    def __init__(self, size: int, center: int = 0):
+        super().__init__(size)
+
+        if not 0 <= center < size:
+            raise ValueError("Star requires a center in the topology")
+
+        self._center = center
+
+    def distance(self, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        center = np.logical_or(np.equal(source, self._center),
+                               np.equal(target, self._center))
+
+        return np.where(np.equal(source, target), 0, np.where(center, 1, 2))
+
+
+class Ring(Topology):
+    """
+    Locations connected in a bidirectional ring.
+    """
+
+    def distance(self, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        path = np.abs(np.subtract(target, source))
+
+        return np.minimum(path, self._size - path)
+
+
+class Torus(Topology):
+    """
+    Locations on a grid of the given dimensions, optionally with wrap
+    around links. Locations are numbered with the first dimension slowest.
+    """
+
+    def __init__(self, dimensions: Sequence[int], wrap: bool = True):
+        if not dimensions or min(dimensions) < 1:
+            raise ValueError("Torus requires dimensions > 0")
+
+        super().__init__(int(np.prod(dimensions)))
+
+        self._dimensions = list(dimensions)
+        self._wrap = wrap
+
+    def distance(self, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        source = np.asarray(source)
+        target = np.asarray(target)
+
+        hops = np.zeros(np.broadcast(source, target).shape, dtype=np.int64)
+
+        for extent in reversed(self._dimensions):
+            path = np.abs(source % extent - target % extent)
+
+            if self._wrap:
+                path = np.minimum(path, extent - path)
+
+            hops += path
+            source = source // extent
+            target = target // extent
+
+        return hops
+
+
+class FatTree(Topology):
+    """
+    Locations are the leaves of a tree of the given arity and levels,
+    messages travel up to the lowest common switch and down again.
+    """
+
+    def __init__(self, arity: int, levels: int):
+        if arity < 2 or levels < 1:
+            raise ValueError("FatTree requires arity > 1 and levels > 0")
+
+        super().__init__(arity ** levels)
+
+        self._arity = arity
+        self._levels = levels
+
+    def distance(self, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        source = np.asarray(source)
+        target = np.asarray(target)
+
+        hops = np.zeros(np.broadcast(source, target).shape, dtype=np.int64)
+
+        for _ in range(self._levels):
+            hops += 2 * np.not_equal(source, target)
+            source = source // self._arity
+            target = target // self._arity
+
+        return hops
+
+
+class DragonFly(Topology):
+    """
+    Groups of all-to-all connected routers with hosts per router, the
+    groups are all-to-all connected. Hops count minimal routes: host to
+    router, within a group, between groups and router to host.
+    """
+
+    def __init__(self, groups: int, routers: int, hosts: int):
+        if min(groups, routers, hosts) < 1:
+            raise ValueError("DragonFly requires groups, routers, hosts > 0")
+
+        super().__init__(groups * routers * hosts)
+
+        self._routers = routers
+        self._hosts = hosts
+
+    def distance(self, source: np.ndarray, target: np.ndarray) -> np.ndarray:
+        router_source = np.floor_divide(source, self._hosts)
+        router_target = np.floor_divide(target, self._hosts)
+
+        group_source = router_source // self._routers
+        group_target = router_target // self._routers
+
+        hops = np.where(np.equal(group_source, group_target),
+                        np.where(np.equal(router_source, router_target),
+                                 2, 3),
+                        5)
+
+        return np.where(np.equal(source, target), 0, hops)
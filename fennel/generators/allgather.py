@@ -3,12 +3,17 @@
 
 
 import math
-from typing import Any, Optional, Tuple, Iterable, Collection
+from typing import Any, Optional, Tuple, Iterable, Collection, Sequence
 from itertools import tee
 import logging
 
 
+import numpy as np  # type: ignore
+
+
 from fennel.core.program import Program
+from fennel.core.implicit import ImplicitProgram
+from fennel.core.task import Task
 from fennel.tasks.start import StartTask
 from fennel.tasks.proxy import ProxyTask
 from fennel.tasks.put import PutTask
@@ -58,6 +63,81 @@ def ring(processes: int,
     return prog
 
 
+class _ImplicitRing(ImplicitProgram):
+    """
+    The ring AllGather as an implicit program. Ids are the start tasks by
+    process, then the proxies x_n_r by round and process, then the puts
+    p_n_r of rounds 1 to processes-1 by round and process.
+    """
+
+    def __init__(self, processes: int, message_size: int):
+        self._size = message_size
+
+        self._proxies = processes
+        self._puts = processes + processes * processes
+
+        super().__init__(processes + processes * (2 * processes - 1),
+                         processes)
+
+    @property
+    def start_ids(self) -> np.ndarray:
+        return np.arange(self._processes)
+
+    def create_task(self, tid: int) -> Task:
+        processes = self._processes
+
+        if tid < self._proxies:
+            return StartTask(f"s_{tid}", tid)
+
+        if tid < self._puts:
+            ridx, nidx = divmod(tid - self._proxies, processes)
+            return ProxyTask(f"x_{nidx}_{ridx}", nidx)
+
+        ridx, nidx = divmod(tid - self._puts, processes)
+        return PutTask(f"p_{nidx}_{ridx + 1}", nidx, (nidx + 1) % processes,
+                       self._size)
+
+    def successors(self, tid: int) -> Sequence[int]:
+        processes = self._processes
+
+        if tid < self._proxies:
+            return (self._proxies + tid,)
+
+        if tid < self._puts:
+            ridx, nidx = divmod(tid - self._proxies, processes)
+
+            if ridx + 1 < processes:
+                return (self._puts + ridx * processes + nidx,)
+
+            return ()
+
+        ridx, nidx = divmod(tid - self._puts, processes)
+        proxy = self._proxies + (ridx + 1) * processes
+
+        return (proxy + nidx, proxy + (nidx + 1) % processes)
+
+    def in_degree(self, tid: int) -> int:
+        if tid < self._proxies:
+            return 0
+
+        if tid < self._proxies + self._processes or tid >= self._puts:
+            return 1
+
+        return 2
+
+
+def ring_implicit(processes: int, message_size: int) -> ImplicitProgram:
+    """
+    Generate AllGather using ring virtual topology as an implicit program,
+    the tasks equal the tasks of ring.
+    """
+
+    assert processes >= 1
+    assert message_size >= 0
+
+    return _ImplicitRing(processes, message_size)
+
+
 def _target_rd(ridx: int, process: int) -> int:
     """
     """
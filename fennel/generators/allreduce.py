@@ -3,12 +3,17 @@
 
 
 import math
-from typing import Any, Optional, Tuple, Iterable, Collection
+from typing import Any, Optional, Tuple, Iterable, Collection, Sequence
 from itertools import tee
 import logging
 
 
+import numpy as np  # type: ignore
+
+
 from fennel.core.program import Program
+from fennel.core.implicit import ImplicitProgram
+from fennel.core.task import Task
 from fennel.tasks.start import StartTask
 from fennel.tasks.proxy import ProxyTask
 from fennel.tasks.put import PutTask
@@ -82,6 +87,93 @@ def generate_recursive_doubling(processes: int, message_size: int) -> Program:
     return program
 
 
+class _ImplicitRecursiveDoubling(ImplicitProgram):
+    """
+    The recursive doubling schedule as an implicit program. Ids are the
+    start tasks by process, then the proxies x_n_r of rounds 0 to rounds,
+    the computes c_n_r and the puts p_n_r of rounds 1 to rounds, each by
+    round and process.
+    """
+
+    def __init__(self, processes: int, message_size: int):
+        self._size = message_size
+        self._rounds = int(math.log2(processes))
+
+        self._proxies = processes
+        self._computes = self._proxies + (self._rounds + 1) * processes
+        self._puts = self._computes + self._rounds * processes
+
+        super().__init__(self._puts + self._rounds * processes, processes)
+
+    @property
+    def start_ids(self) -> np.ndarray:
+        return np.arange(self._processes)
+
+    def create_task(self, tid: int) -> Task:
+        if tid < self._proxies:
+            return StartTask(f's{tid}', tid)
+
+        if tid < self._computes:
+            ridx, process = divmod(tid - self._proxies, self._processes)
+            return ProxyTask(f'x_{process}_{ridx}', process)
+
+        if tid < self._puts:
+            ridx, process = divmod(tid - self._computes, self._processes)
+            return ComputeTask(f'c_{process}_{ridx + 1}', process,
+                               self._size)
+
+        ridx, process = divmod(tid - self._puts, self._processes)
+        return PutTask(f'p_{process}_{ridx + 1}', process,
+                       _target_rd(ridx, process), self._size)
+
+    def successors(self, tid: int) -> Sequence[int]:
+        processes = self._processes
+
+        if tid < self._proxies:
+            return (self._proxies + tid,)
+
+        if tid < self._computes:
+            ridx, process = divmod(tid - self._proxies, processes)
+
+            if ridx < self._rounds:
+                return (self._computes + ridx * processes + process,
+                        self._puts + ridx * processes + process)
+
+            return ()
+
+        if tid < self._puts:
+            # the compute of round r completes the proxy of round r
+            return (tid - self._computes + self._proxies + processes,)
+
+        ridx, process = divmod(tid - self._puts, processes)
+        return (self._computes + ridx * processes +
+                _target_rd(ridx, process),)
+
+    def in_degree(self, tid: int) -> int:
+        if tid < self._proxies:
+            return 0
+
+        if self._computes <= tid < self._puts:
+            return 2
+
+        return 1
+
+
+def generate_recursive_doubling_implicit(processes: int,
+                                         message_size: int
+                                         ) -> ImplicitProgram:
+    """
+    Generate a recursive doubling schedule as an implicit program, the
+    tasks equal the tasks of generate_recursive_doubling.
+    """
+
+    # power of two requirement
+    assert math.log2(processes).is_integer()
+    assert message_size >= 0
+
+    return _ImplicitRecursiveDoubling(processes, message_size)
+
+
 def _pairwise(iterable: Iterable[Any]) -> Iterable[Tuple[Any, Any]]:
     "s -> (s0,s1), (s1,s2), (s2, s3), ..."
     primary, secondary = tee(iterable)
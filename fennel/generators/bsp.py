@@ -4,11 +4,14 @@ Generators for a BSP style model.
 
 
 from fennel.core.program import Program
+from fennel.core.streaming import Item, StreamingProgram
 from fennel.tasks.compute import ComputeTask
 from fennel.tasks.proxy import ProxyTask
 from fennel.tasks.start import StartTask
 
 
+from functools import partial
+from typing import Iterator
 import random
 
 
@@ -56,3 +59,56 @@ def single_superstep(
         prog.add_edge(f"b_{rounds}", f"x_{nidx}")
 
     return prog
+
+
+def superstep_stream(
+        nodes: int,
+        msgsize: int,
+        rounds: int = 1
+        ) -> Iterator[Item]:
+    """
+    Streams the tasks and edges of single_superstep round by round, the
+    compute tasks of a round precede its barrier.
+    """
+
+    rng = random.Random(12345)
+
+    for nidx in range(nodes):
+        yield StartTask(f"s_{nidx}", nidx, skew=rng.randint(0, 100))
+
+    yield ProxyTask("b_0", 0)
+
+    for nidx in range(nodes):
+        yield (f"s_{nidx}", "b_0")
+
+    for ridx in range(1, rounds + 1):
+        for nidx in range(nodes):
+            yield ComputeTask(f"c_{nidx}_{ridx}",
+                              nidx,
+                              rng.randint(10, msgsize))
+
+            yield (f"b_{ridx-1}", f"c_{nidx}_{ridx}")
+
+        yield ProxyTask(f"b_{ridx}", 0)
+
+        for nidx in range(nodes):
+            yield (f"c_{nidx}_{ridx}", f"b_{ridx}")
+
+    # finishing proxies
+    for nidx in range(nodes):
+        yield ProxyTask(f"x_{nidx}", nidx)
+        yield (f"b_{rounds}", f"x_{nidx}")
+
+
+def single_superstep_streaming(
+        nodes: int,
+        msgsize: int,
+        rounds: int = 1
+        ) -> StreamingProgram:
+    """
+    Generates the program of single_superstep as a stream, only about two
+    rounds are held at any time of a run.
+    """
+
+    return StreamingProgram(partial(superstep_stream, nodes, msgsize, rounds),
+                            window=nodes + 1)
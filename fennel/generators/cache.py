@@ -0,0 +1,265 @@
+"""
+Defines the GeneratorCache class, memoized programs of generators.
+"""
+
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from functools import wraps
+from itertools import chain
+from types import CodeType
+from typing import Any, Callable, MutableMapping, Optional, Tuple
+
+
+from fennel.core.program import Program
+from fennel.core.compiled import CompiledProgram
+from fennel.io import binary
+
+
+Generator = Callable[..., Program]
+
+
+def _code_digest(code: CodeType) -> str:
+    """
+    Get a digest of the byte code, constants and names of a code object
+    and its nested code objects.
+    """
+
+    digest = hashlib.sha256(code.co_code)
+    digest.update(repr(code.co_names).encode('utf-8'))
+
+    for constant in code.co_consts:
+        digest.update(_constant_repr(constant).encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def _constant_repr(constant: Any) -> str:
+    """
+    Get a repr of a code constant which is equal across processes, i.e.
+    independent of string hashing.
+    """
+
+    if isinstance(constant, CodeType):
+        return _code_digest(constant)
+
+    if isinstance(constant, tuple):
+        return f'({",".join(map(_constant_repr, constant))})'
+
+    if isinstance(constant, frozenset):
+        return f'{{{",".join(sorted(map(_constant_repr, constant)))}}}'
+
+    return repr(constant)
+
+
+def _check_repr(value: Any) -> None:
+    """
+    Check whether the repr of a value identifies it, containers are
+    checked element-wise.
+    """
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        for element in value:
+            _check_repr(element)
+
+    elif isinstance(value, dict):
+        for element in chain(value.keys(), value.values()):
+            _check_repr(element)
+
+    elif type(value).__repr__ is object.__repr__:
+        raise ValueError(f'{type(value).__name__} argument has no repr '
+                         'identifying its value.')
+
+
+class GeneratorCache:
+    """
+    A bounded least recently used cache of generated programs, optionally
+    backed by a directory of programs in the binary format.
+
+    Programs are keyed by the qualified name and a digest of the code of
+    the generator and the repr of its arguments. Generators must be
+    module level functions, lambdas and nested functions are rejected as
+    their names are not unique, and arguments must have a repr which
+    identifies their value, i.e. not the default repr holding the address.
+    Editing a generator changes its key, edits of the functions it calls
+    do not. The cached programs are compiled, i.e. frozen, and shared by
+    all requests with equal keys.
+    """
+
+    def __init__(self, maxsize: int = 64, directory: Optional[str] = None):
+        if maxsize < 1:
+            raise ValueError("GeneratorCache requires maxsize > 0")
+
+        self._maxsize = maxsize
+        self._directory = directory
+        self._entries: MutableMapping[str, CompiledProgram] = OrderedDict()
+
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def maxsize(self) -> int:
+        """
+        Get the maximum number of programs held in memory.
+        """
+
+        return self._maxsize
+
+    @property
+    def directory(self) -> Optional[str]:
+        """
+        Get the directory of the cached programs, None if memory only.
+        """
+
+        return self._directory
+
+    @property
+    def hits(self) -> int:
+        """
+        Get the number of requests served from memory.
+        """
+
+        return self._hits
+
+    @property
+    def disk_hits(self) -> int:
+        """
+        Get the number of requests served from the directory.
+        """
+
+        return self._disk_hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Get the number of requests which ran the generator.
+        """
+
+        return self._misses
+
+    @staticmethod
+    def key(generator: Generator,
+            args: Tuple[Any, ...],
+            kwargs: MutableMapping[str, Any]
+            ) -> str:
+        """
+        Get the key of a generator call, keyword order is irrelevant.
+        """
+
+        qualname = getattr(generator, '__qualname__', None)
+        code = getattr(generator, '__code__', None)
+
+        if qualname is None or code is None:
+            raise ValueError(f'{generator!r} is not a function.')
+
+        if '<lambda>' in qualname or '<locals>' in qualname:
+            raise ValueError(f'{qualname} is not a module level function.')
+
+        for value in chain(args, kwargs.values()):
+            _check_repr(value)
+
+        return repr((generator.__module__, qualname, _code_digest(code),
+                     args, sorted(kwargs.items())))
+
+    def _path(self, key: str) -> Optional[str]:
+        """
+        Get the file of a key in the directory.
+        """
+
+        if self._directory is None:
+            return None
+
+        digest = hashlib.sha256(
+            f'{binary.VERSION}:{key}'.encode('utf-8')).hexdigest()
+
+        return os.path.join(self._directory, f'{digest}.fpg')
+
+    def generate(self,
+                 generator: Generator,
+                 *args: Any,
+                 **kwargs: Any
+                 ) -> CompiledProgram:
+        """
+        Get the compiled program of the generator called with the given
+        arguments, generated only if neither in memory nor in the
+        directory.
+        """
+
+        key = self.key(generator, args, kwargs)
+
+        program = self._entries.get(key)
+
+        if program is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)  # type: ignore
+
+            return program
+
+        path = self._path(key)
+
+        if path is not None and os.path.exists(path):
+            self._disk_hits += 1
+            program = binary.load(path)
+
+        else:
+            self._misses += 1
+            program = generator(*args, **kwargs).compile()
+
+            if path is not None:
+                self._store(program, path)
+
+        self._entries[key] = program
+
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)  # type: ignore
+
+        return program
+
+    def _store(self, program: CompiledProgram, path: str) -> None:
+        """
+        Write the program, concurrent writers of the same key replace the
+        file atomically.
+        """
+
+        descriptor, temporary = tempfile.mkstemp(suffix='.tmp',
+                                                 dir=self._directory)
+        os.close(descriptor)
+
+        try:
+            binary.save(program, temporary)
+            os.replace(temporary, path)
+
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+    def cached(self, generator: Generator) -> Callable[..., CompiledProgram]:
+        """
+        Wrap a generator such that every call goes through this cache.
+        """
+
+        @wraps(generator)
+        def cached_generator(*args: Any, **kwargs: Any) -> CompiledProgram:
+            return self.generate(generator, *args, **kwargs)
+
+        return cached_generator
+
+    def clear(self) -> None:
+        """
+        Drop all programs held in memory and the statistics, the directory
+        is kept.
+        """
+
+        self._entries.clear()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
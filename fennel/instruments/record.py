@@ -32,6 +32,13 @@ class RecorderInstrument(Instrument):
 
         self._record[task.name] = time
 
+    def clear(self) -> None:
+        """
+        Forget all recorded completions.
+        """
+
+        self._record.clear()
+
     @property
     def record(self) -> Mapping[str, Time]:
         """
@@ -0,0 +1,278 @@
+"""
+Defines the binary program format with a memory mapped reader.
+
+A file holds a header followed by the arrays of a CompiledProgram, every
+array starts at a multiple of 8 bytes:
+
+    header      magic, version, reserved (0), task count, edge count,
+                name bytes
+    offsets     int64[tasks + 1]  successor offsets (compressed sparse row)
+    targets     int64[edges]      concatenated successors
+    in_degree   int64[tasks]
+    kinds       int32[tasks]      task kind codes
+    nodes       int64[tasks]
+    anys        int64[tasks]      any count, 0 if all dependencies required
+    flags       uint8[tasks]      concurrent and blocking bits
+    first       int64[tasks]      skew, size, delay or retrieval size
+    second      int64[tasks]      target, compute time or sleep until
+    third       int64[tasks]      command size of gets
+    name_ends   int64[tasks]      end of every name in the name table
+    names       uint8[bytes]      utf-8 names, concatenated
+
+Absent optional values are stored as -1. The reader maps the file and
+creates tasks and names only when accessed, the durations of
+deterministic models which vectorize are precomputed from the mapped
+columns without creating any task. A mapped program is pickled as its
+path such that worker processes map the same file.
+"""
+
+
+import struct
+from typing import Dict, List, Optional, Sequence, Union
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.program import Program
+from fennel.core.compiled import (CompiledProgram, TaskColumns, BUILTIN_KINDS,
+                                  CONCURRENT, BLOCKING)
+from fennel.core.task import (Task, KIND_START, KIND_PROXY, KIND_SLEEP,
+                              KIND_COMPUTE, KIND_PUT, KIND_GET)
+from fennel.tasks.start import StartTask
+from fennel.tasks.proxy import ProxyTask
+from fennel.tasks.sleep import SleepTask
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.put import PutTask
+from fennel.tasks.get import GetTask
+
+
+MAGIC = b'FENNELPG'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sIIQQQ')
+
+# task columns in file order after the edge arrays
+_COLUMNS = (('in_degree', np.int64), ('kinds', np.int32),
+            ('nodes', np.int64), ('anys', np.int64), ('flags', np.uint8),
+            ('first', np.int64), ('second', np.int64), ('third', np.int64),
+            ('name_ends', np.int64))
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % 8)
+
+
+def save(program: Union[Program, CompiledProgram], path: str) -> None:
+    """
+    Write the program in the binary format, only built-in task types can
+    be written.
+    """
+
+    compiled = program.compile()
+    count = len(compiled)
+
+    for tid in np.flatnonzero(~np.isin(compiled.kinds,
+                                       BUILTIN_KINDS)).tolist():
+        task = compiled.task(tid)
+        raise ValueError(f'{task.name} of type {type(task).__name__} '
+                         'cannot be written.')
+
+    values = compiled.columns()
+
+    encoded = [name.encode('utf-8') for name in compiled.get_task_names()]
+    names = b''.join(encoded)
+    name_ends = np.cumsum([len(name) for name in encoded], dtype=np.int64)
+
+    columns = {'in_degree': compiled.in_degree, 'kinds': compiled.kinds,
+               'nodes': compiled.nodes, 'anys': compiled.anys,
+               'flags': values.flags, 'first': values.first,
+               'second': values.second, 'third': values.third,
+               'name_ends': name_ends}
+
+    with open(path, 'wb') as stream:
+        stream.write(_HEADER.pack(MAGIC, VERSION, 0, count,
+                                  len(compiled.targets), len(names)))
+
+        arrays = [np.ascontiguousarray(compiled.offsets, dtype=np.int64),
+                  np.ascontiguousarray(compiled.targets, dtype=np.int64)]
+        arrays += [np.ascontiguousarray(columns[name], dtype=dtype)
+                   for name, dtype in _COLUMNS]
+
+        for array in arrays:
+            data = array.tobytes()
+            stream.write(data)
+            stream.write(_padding(len(data)))
+
+        stream.write(names)
+
+
+class MappedNames(Sequence[str]):
+    """
+    The task names of a mapped program, decoded on access.
+    """
+
+    def __init__(self, table: np.ndarray, ends: np.ndarray):
+        self._table = table
+        self._ends = ends
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, tid):  # type: ignore
+        if isinstance(tid, slice):
+            return [self[index] for index in range(*tid.indices(len(self)))]
+
+        begin = int(self._ends[tid - 1]) if tid > 0 else 0
+
+        return self._table[begin:int(self._ends[tid])].tobytes().decode(
+            'utf-8')
+
+
+class MappedTasks(Sequence[Task]):
+    """
+    The tasks of a mapped program, every task is created on its first
+    access and kept afterwards.
+    """
+
+    def __init__(self, names: MappedNames, columns: Dict[str, np.ndarray]):
+        self._names = names
+        self._columns = columns
+        self._tasks: Optional[List[Optional[Task]]] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, tid):  # type: ignore
+        if isinstance(tid, slice):
+            return [self[index] for index in range(*tid.indices(len(self)))]
+
+        if self._tasks is None:
+            self._tasks = [None] * len(self)
+
+        task = self._tasks[tid]
+        if task is None:
+            task = self._create(tid)
+            self._tasks[tid] = task
+
+        return task
+
+    def _create(self, tid: int) -> Task:
+        """
+        Create the task from its columns.
+        """
+
+        columns = self._columns
+
+        kind = int(columns['kinds'][tid])
+        name = self._names[tid]
+        node = int(columns['nodes'][tid])
+        flags = int(columns['flags'][tid])
+
+        first = int(columns['first'][tid])
+        second = int(columns['second'][tid])
+
+        task: Task
+        if kind == KIND_PUT:
+            task = PutTask(name, node, second, first,
+                           block=bool(flags & BLOCKING))
+        elif kind == KIND_GET:
+            task = GetTask(name, node, second, first,
+                           int(columns['third'][tid]),
+                           block=bool(flags & BLOCKING))
+        elif kind == KIND_COMPUTE:
+            task = ComputeTask(name, node,
+                               size=first if first >= 0 else None,
+                               time=second if second >= 0 else None)
+        elif kind == KIND_START:
+            task = StartTask(name, node, first)
+        elif kind == KIND_SLEEP:
+            task = SleepTask(name, node,
+                             delay=first if first >= 0 else None,
+                             until=second if second >= 0 else None)
+        elif kind == KIND_PROXY:
+            task = ProxyTask(name, node)
+        else:
+            raise ValueError(f'{name} has unknown kind {kind}.')
+
+        task.concurrent = bool(flags & CONCURRENT)
+        task.taskid = tid
+
+        anys = int(columns['anys'][tid])
+        if anys:
+            task.any = anys
+
+        return task
+
+
+class MappedProgram(CompiledProgram):
+    """
+    A CompiledProgram whose arrays are mapped from a file in the binary
+    format, pickled as its path.
+    """
+
+    _path: str
+
+    def __reduce__(self):
+        return load, (self._path,)
+
+
+def load(path: str) -> MappedProgram:
+    """
+    Map a program in the binary format, no task is created until it is
+    accessed.
+    """
+
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+
+    if len(data) < _HEADER.size:
+        raise ValueError(f'{path} is not a program file.')
+
+    magic, version, reserved, count, edges, name_bytes = _HEADER.unpack(
+        data[:_HEADER.size].tobytes())
+
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not a program file.')
+
+    if version != VERSION:
+        raise ValueError(f'{path} has format version {version}, '
+                         f'expected {VERSION}.')
+
+    if reserved != 0:
+        raise ValueError(f'{path} has reserved header field {reserved}, '
+                         'expected 0.')
+
+    position = _HEADER.size
+
+    def take(dtype: type, length: int) -> np.ndarray:
+        nonlocal position
+
+        size = np.dtype(dtype).itemsize * length
+        if position + size > len(data):
+            raise ValueError(f'{path} is truncated.')
+
+        array = np.frombuffer(data, dtype=dtype, count=length,
+                              offset=position)
+        position += size + len(_padding(size))
+
+        return array
+
+    offsets = take(np.int64, count + 1)
+    targets = take(np.int64, edges)
+    columns = {name: take(dtype, count) for name, dtype in _COLUMNS}
+    table = take(np.uint8, name_bytes)
+
+    names = MappedNames(table, columns['name_ends'])
+    tasks = MappedTasks(names, columns)
+
+    program = MappedProgram.from_arrays(names, tasks, offsets, targets,
+                                        columns['in_degree'],
+                                        columns['kinds'], columns['nodes'],
+                                        columns['anys'],
+                                        TaskColumns(columns['first'],
+                                                    columns['second'],
+                                                    columns['third'],
+                                                    columns['flags']))
+    program._path = path
+
+    return program
@@ -0,0 +1,328 @@
+"""
+Defines the loader of GOAL schedules.
+
+A schedule lists the tasks and dependencies of every rank:
+
+    rank 0 {
+        l1: start [skew]ns
+        l2: put 8b to r1 [blocking]
+        l3: compute 100ns | compute 8b
+        l4: sleep 10ns
+
+        # comment
+        l2 > l1
+        l3 > r1:l2
+    }
+
+The file is streamed in blocks and every line is matched once by a single
+combined pattern, dependencies are kept as integer arrays and resolved in
+bulk after the last line. Tasks without successors are completed by a
+proxy task per rank.
+
+Branch statements (l3: branch l4, l5) are not supported, the machine
+requires a fixed dependency graph, and schedules using them are rejected.
+"""
+
+
+import re
+from array import array
+from typing import IO, List, Tuple, Union
+
+
+import numpy as np  # type: ignore
+
+
+from fennel.core.program import Program
+from fennel.core.compiled import CompiledProgram
+from fennel.core.task import Task
+from fennel.tasks.start import StartTask
+from fennel.tasks.put import PutTask
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.sleep import SleepTask
+from fennel.tasks.proxy import ProxyTask
+
+
+Source = Union[str, IO[str]]
+
+_TOKEN = re.compile(r"""
+    ^[ \t]*(?:
+        l(?P<dependent>\d+)[ \t]*>[ \t]*(?:r(?P<rank_of>\d+):)?l(?P<dependency>\d+)
+      | l(?P<label>\d+):[ \t]*(?:
+            put[ \t]+(?P<put>\d+)b[ \t]+to[ \t]+r(?P<target>\d+)(?P<blocking>[ \t]+blocking)?
+          | compute[ \t]+(?P<compute>\d+)(?P<unit>ns|b)
+          | sleep[ \t]+(?P<sleep>\d+)ns
+          | start(?:[ \t]+(?P<skew>\d+)ns)?
+          )
+      | rank[ \t]+(?P<rank>\d+)[ \t]*\{
+      | (?P<close>\})
+      | num_ranks[ \t]+\d+
+      )?
+    [ \t]*(?:(?:\#|//)[^\n]*)?\r?$
+    """, re.VERBOSE | re.MULTILINE)
+
+_BRANCH = re.compile(r'[ \t]*l\d+:[ \t]*branch\b')
+
+# text is tokenized in blocks of whole lines of about this many characters
+_BLOCK = 1 << 22
+
+# labels and ranks are folded into a single integer key
+_LABEL_BITS = 32
+
+
+class _Schedule:
+    """
+    Accumulates the tasks and the unresolved dependencies of a schedule.
+    """
+
+    def __init__(self, origin: str):
+        self.origin = origin
+
+        self.names: List[str] = []
+        self.tasks: List[Task] = []
+
+        # key of every task and the keys of every dependency edge
+        self.keys = array('q')
+        self.sources = array('q')
+        self.targets = array('q')
+
+        # the open rank block and the number of parsed lines
+        self._rank = -1
+        self._lines = 0
+
+    def parse(self, stream: IO[str]) -> None:
+        """
+        Tokenize the stream block by block, a block is cut after its last
+        line break and the rest is carried into the next block.
+        """
+
+        rest = ''
+
+        while True:
+            block = stream.read(_BLOCK)
+
+            if not block:
+                break
+
+            block = rest + block
+            cut = block.rfind('\n')
+
+            if cut < 0:
+                rest = block
+                continue
+
+            rest = block[cut + 1:]
+            self._parse_block(block[:cut])
+
+        if rest:
+            self._parse_block(rest)
+
+        if self._rank >= 0:
+            raise ValueError(f'{self.origin}: rank {self._rank} block is '
+                             'not closed.')
+
+    def _error(self, number: int, message: str) -> ValueError:
+        return ValueError(f'{self.origin}:{self._lines + number}: {message}')
+
+    def _malformed(self, block: str, position: int,
+                   number: int) -> ValueError:
+        end = block.find('\n', position)
+        line = block[position:end if end >= 0 else len(block)]
+
+        if _BRANCH.match(line):
+            return self._error(number, 'branch statements are not '
+                               'supported.')
+
+        return self._error(number, f'cannot parse {line.strip()!r}.')
+
+    def _parse_block(self, block: str) -> None:
+        """
+        Tokenize the lines of a block with a single pattern, every line
+        yields a tuple of all groups which are empty unless matched. A
+        token must start where the previous line ends, otherwise the line
+        in between is malformed.
+        """
+
+        names = self.names
+        tasks = self.tasks
+        keys = self.keys
+        sources = self.sources
+        targets = self.targets
+
+        rank = self._rank
+        rank_key = rank << _LABEL_BITS
+
+        position = 0
+        number = 0
+
+        for number, token in enumerate(_TOKEN.finditer(block), 1):
+            if token.start() != position:
+                raise self._malformed(block, position, number)
+
+            position = token.end() + 1
+
+            (dependent, rank_of, dependency, label, put, target, blocking,
+             compute, unit, sleep, skew, new_rank, close) = token.groups()
+
+            if dependent:
+                if rank < 0:
+                    raise self._error(number, 'dependency outside of a rank '
+                                      'block.')
+
+                if rank_of:
+                    sources.append((int(rank_of) << _LABEL_BITS) |
+                                   int(dependency))
+                else:
+                    sources.append(rank_key | int(dependency))
+
+                targets.append(rank_key | int(dependent))
+
+            elif label:
+                if rank < 0:
+                    raise self._error(number, 'task outside of a rank block.')
+
+                name = f'r{rank}l{label}'
+
+                task: Task
+                if put:
+                    task = PutTask(name, rank, int(target), int(put),
+                                   block=bool(blocking))
+                elif compute:
+                    if unit == 'b':
+                        task = ComputeTask(name, rank, size=int(compute))
+                    else:
+                        task = ComputeTask(name, rank, time=int(compute))
+                elif sleep:
+                    task = SleepTask(name, rank, int(sleep))
+                else:
+                    task = StartTask(name, rank, int(skew) if skew else 0)
+
+                names.append(name)
+                tasks.append(task)
+                keys.append(rank_key | int(label))
+
+            elif new_rank:
+                if rank >= 0:
+                    raise self._error(number, 'nested rank block.')
+
+                rank = int(new_rank)
+                rank_key = rank << _LABEL_BITS
+
+            elif close:
+                if rank < 0:
+                    raise self._error(number, 'unmatched }.')
+
+                rank = -1
+
+        if position <= len(block):
+            raise self._malformed(block, position, number + 1)
+
+        self._rank = rank
+        self._lines += number
+
+    def resolve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resolve the dependency keys to task ids and complete every rank
+        with a proxy task depending on all tasks without successors.
+        """
+
+        keys = np.frombuffer(self.keys, dtype=np.int64)
+        count = len(keys)
+
+        order = np.argsort(keys, kind='stable')
+        ordered = keys[order]
+
+        duplicates = np.flatnonzero(ordered[1:] == ordered[:-1])
+        if len(duplicates):
+            tid = order[duplicates[0] + 1]
+            raise ValueError(f'{self.names[tid]} is defined twice.')
+
+        edges = []
+        for side in (self.sources, self.targets):
+            wanted = np.frombuffer(side, dtype=np.int64)
+
+            found = np.minimum(np.searchsorted(ordered, wanted),
+                               max(0, count - 1))
+            missing = (np.flatnonzero(ordered[found] != wanted) if count
+                       else np.arange(len(wanted)))
+
+            if len(missing):
+                key = int(wanted[missing[0]])
+                raise ValueError(f'r{key >> _LABEL_BITS}l'
+                                 f'{key & ((1 << _LABEL_BITS) - 1)} '
+                                 'is not defined.')
+
+            edges.append(order[found])
+
+        sources, targets = edges
+
+        # tasks without successors complete on a proxy task of their rank
+        sinks = np.flatnonzero(np.bincount(sources, minlength=count) == 0)
+        ranks = keys[sinks] >> _LABEL_BITS
+
+        proxies = {}
+        for rank in np.unique(ranks).tolist():
+            name = f'r{rank}x'
+
+            proxies[rank] = len(self.tasks)
+            self.names.append(name)
+            self.tasks.append(ProxyTask(name, rank))
+
+        proxy_ids = np.array([proxies[rank] for rank in ranks.tolist()],
+                             dtype=np.int64)
+
+        sources = np.concatenate((sources, sinks))
+        targets = np.concatenate((targets, proxy_ids))
+
+        return sources, targets
+
+
+def _parse(source: Source) -> _Schedule:
+    """
+    Parse a schedule from a path or an open text file.
+    """
+
+    if isinstance(source, str):
+        schedule = _Schedule(source)
+
+        with open(source, 'r', encoding='utf-8') as stream:
+            schedule.parse(stream)
+
+    else:
+        schedule = _Schedule(getattr(source, 'name', '<stream>'))
+        schedule.parse(source)
+
+    return schedule
+
+
+def load_compiled(source: Source) -> CompiledProgram:
+    """
+    Load a GOAL schedule directly into a CompiledProgram, task ids are in
+    order of appearance followed by the proxy tasks.
+    """
+
+    schedule = _parse(source)
+    sources, targets = schedule.resolve()
+
+    return CompiledProgram(schedule.names, schedule.tasks,
+                           zip(sources.tolist(), targets.tolist()))
+
+
+def load(source: Source) -> Program:
+    """
+    Load a GOAL schedule into a Program, tasks are named r<rank>l<label>
+    and the proxy tasks r<rank>x.
+    """
+
+    schedule = _parse(source)
+    sources, targets = schedule.resolve()
+
+    program = Program()
+
+    for task in schedule.tasks:
+        program.add_node(task)
+
+    names = schedule.names
+    for source_id, target_id in zip(sources.tolist(), targets.tolist()):
+        program.add_edge(names[source_id], names[target_id])
+
+    return program
@@ -3,15 +3,18 @@ Defines the latency-bandwidth model.
 """
 
 
-import random
-from typing import Sequence, cast, Union
+from typing import Hashable, Optional, Sequence, Tuple, cast, Union
 
 
-from scipy.stats import betaprime  # type: ignore
+import numpy as np  # type: ignore
 
 
 from fennel.core.time import Time
+from fennel.core.noise import (NoiseModel, BetaPrimeNoise, DetourNoise,
+                               SampleNoise)
 from fennel.core.network import NetworkModel, NetworkTime
+from fennel.core.congestion import CongestionModel
+from fennel.core.topology import Topology
 from fennel.tasks.put import PutTask
 from fennel.tasks.get import GetTask
 
@@ -19,36 +22,89 @@ from fennel.tasks.get import GetTask
 class LBModel(NetworkModel):
     """
     Implementation of the latency-bandwidth model.
+
+    Given a topology, every hop between source and target adds hop_latency
+    to the latency.
     """
 
-    def __init__(self, latency: int, bandwidth: float):
+    deterministic = True
+
+    def __init__(self,
+                 latency: int,
+                 bandwidth: float,
+                 topology: Optional[Topology] = None,
+                 hop_latency: int = 0):
         super().__init__()
 
+        self.register_task_evaluator(PutTask, self._evaluate_put)
+        self.register_task_evaluator(GetTask, self._evaluate_get)
+
         self._latency = latency
         self._bandwidth = bandwidth
 
+        self._topology = topology
+        self._hop_latency = hop_latency
+
+    @property
+    def topology(self) -> Optional[Topology]:
+        """Access the topology."""
+
+        return self._topology
+
+    def duration_key(self,
+                     task: Union[PutTask, GetTask]
+                     ) -> Optional[Hashable]:
+        """
+        The duration depends on the sizes and the latency between source
+        and target.
+        """
+
+        latency = self._path_latency(task.node, task.target)
+
+        if isinstance(task, GetTask):
+            return (task.kind, task.command_message_size,
+                    task.retrieval_message_size, latency)
+
+        return (task.kind, task.message_size, latency)
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """
+        The durations depend on the parameters and the topology mapping.
+        """
+
+        version = None if self._topology is None else self._topology.version
+
+        return (self._latency, self._bandwidth, self._hop_latency,
+                version)
+
+    def _path_latency(self, source: int, target: int) -> int:
+        """
+        Get the latency between two nodes.
+        """
+
+        if self._topology is None:
+            return self._latency
+
+        return (self._latency +
+                self._hop_latency * self._topology.hops(source, target))
+
     def evaluate(self,
                  time: Time,
                  task: Union[PutTask, GetTask]
                  ) -> NetworkTime:
         """
-        Evaluate task with appropriate handler.
+        Evaluate task with the evaluator of its kind.
         """
 
-        if isinstance(task, PutTask):
-            return self._evaluate_put(time, task)
-
-        if isinstance(task, GetTask):
-            return self._evaluate_get(time, task)
-
-        raise RuntimeError(f"Task {task} not recognized.")
+        return self._evaluate_task(time, task)
 
     def _evaluate_put(self, time: Time, task: PutTask) -> NetworkTime:
         """
         Evaluate the latency-bandwidth network model with a PutTask.
         """
 
-        time_next = self._latency + int(task.message_size * self._bandwidth)
+        time_next = (self._path_latency(task.node, task.target) +
+                     int(task.message_size * self._bandwidth))
         time_next += time
 
         return NetworkTime(cast(Time, time_next), cast(Time, time_next))
@@ -58,44 +114,226 @@ class LBModel(NetworkModel):
         Evaluate the latency-bandwidth network model with a GetTask.
         """
 
-        time_remote = (time + self._latency +
+        latency = self._path_latency(task.node, task.target)
+
+        time_remote = (time + latency +
                        int(task.command_message_size * self._bandwidth))
-        time_local = (time_remote + self._latency +
+        time_local = (time_remote + latency +
                       int(task.retrieval_message_size * self._bandwidth))
 
         return NetworkTime(cast(Time, time_local), cast(Time, time_remote))
 
+    def vectorized_durations(self,
+                             gets: np.ndarray,
+                             sources: np.ndarray,
+                             targets: np.ndarray,
+                             sizes: np.ndarray,
+                             retrievals: np.ndarray
+                             ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate puts and gets at once, get the local and remote times.
+        The sizes are the message sizes of puts and the command sizes of
+        gets, the retrievals are the retrieval sizes of gets. Equals
+        evaluate at time 0 for every task.
+        """
+
+        if self._topology is None:
+            latency = np.full(len(sources), self._latency, dtype=np.int64)
+
+        else:
+            latency = (self._latency + self._hop_latency *
+                       self._topology.hop_counts(sources, targets))
+
+        remote = latency + (sizes.astype(np.float64) *
+                            self._bandwidth).astype(np.int64)
+
+        retrieval = latency + (retrievals.astype(np.float64) *
+                               self._bandwidth).astype(np.int64)
+        local = np.where(gets, remote + retrieval, remote)
+
+        return local, remote
+
 
 class NoisyLBModel(LBModel):
     """
     Implementation of the latency-bandwidth model with a noisy
     channel. Adds random noise to the latency.
+
+    The noise model defaults to a Betaprime distribution(2,3) shifted by
+    stdev.
     """
 
-    def __init__(self, latency: int, bandwidth: float, stdev: float):
-        super().__init__(latency, bandwidth)
+    deterministic = False
+
+    def __init__(self,
+                 latency: int,
+                 bandwidth: float,
+                 stdev: float,
+                 noise: Optional[NoiseModel] = None,
+                 topology: Optional[Topology] = None,
+                 hop_latency: int = 0):
+        super().__init__(latency, bandwidth, topology, hop_latency)
 
-        self.noise: Sequence = betaprime.rvs(2.0, 3.0, stdev, size=100)
+        self._stdev = stdev
+
+        if noise is None:
+            noise = BetaPrimeNoise(2.0, 3.0, stdev)
+
+        self._noise = noise
 
     @property
-    def noise(self) -> Sequence:
-        """Access the noise set."""
+    def noise(self) -> NoiseModel:
+        """Access the noise model."""
 
         return self._noise
 
     @noise.setter
-    def noise(self, noise: Sequence) -> None:
-        """Set the noise set."""
+    def noise(self, noise: Union[NoiseModel, Sequence[float]]) -> None:
+        """Set the noise model, samples are drawn from uniformly."""
+
+        if not isinstance(noise, NoiseModel):
+            noise = SampleNoise(noise)
 
         self._noise = noise
 
-    def evaluate(self, time: int, task: PutTask) -> NetworkTime:
+    def seed(self, seed: int) -> None:
         """
-        Evaluate the latency-bandwidth model with noise.
+        Reseed the noise.
         """
 
-        time_next = self._latency + int(task.message_size * self._bandwidth)
-        time_next += random.choice(self.noise)
-        time_next += time
+        self._noise.seed(seed)
 
-        return NetworkTime(cast(Time, time_next), cast(Time, time_next))
+    def evaluate(self,
+                 time: Time,
+                 task: Union[PutTask, GetTask]
+                 ) -> NetworkTime:
+        """
+        Evaluate the latency-bandwidth model with noise. The noise delays
+        the message, a non-blocking put does not wait for it.
+        """
+
+        times = super().evaluate(time, task)
+        noise = int(self._noise.sample_node(task.node))
+
+        local = times.local
+        if isinstance(task, GetTask) or task.blocking:
+            local += noise
+
+        return NetworkTime(cast(Time, local),
+                           cast(Time, times.remote + noise))
+
+
+class DetourLBModel(LBModel):
+    """
+    Implementation of the latency-bandwidth model interrupted by OS noise.
+    An operation is stretched by the detours of the issuing node it
+    overlaps, the remote time is shifted by the same delay.
+    """
+
+    deterministic = False
+
+    def __init__(self,
+                 latency: int,
+                 bandwidth: float,
+                 detours: DetourNoise,
+                 topology: Optional[Topology] = None,
+                 hop_latency: int = 0):
+        super().__init__(latency, bandwidth, topology, hop_latency)
+
+        self._detours = detours
+
+    @property
+    def detours(self) -> DetourNoise:
+        """Access the detour schedules."""
+
+        return self._detours
+
+    def seed(self, seed: int) -> None:
+        """
+        Reseed the detour schedules.
+        """
+
+        self._detours.seed(seed)
+
+    def evaluate(self,
+                 time: Time,
+                 task: Union[PutTask, GetTask]
+                 ) -> NetworkTime:
+        """
+        Evaluate the latency-bandwidth model stretched by detours.
+        """
+
+        times = super().evaluate(time, task)
+
+        local = self._detours.stretch(task.node, time, times.local)
+        delay = local - times.local
+
+        return NetworkTime(cast(Time, local), cast(Time, times.remote + delay))
+
+
+class CongestedLBModel(LBModel):
+    """
+    Implementation of the latency-bandwidth model where messages contend
+    for network resources, the bookkeeping is done by a congestion model.
+
+    Blocking puts return once the message arrived, non-blocking puts once
+    the message is injected.
+    """
+
+    deterministic = False
+
+    def __init__(self,
+                 latency: int,
+                 bandwidth: float,
+                 congestion: CongestionModel,
+                 topology: Optional[Topology] = None,
+                 hop_latency: int = 0):
+        super().__init__(latency, bandwidth, topology, hop_latency)
+
+        self._congestion = congestion
+
+    @property
+    def congestion(self) -> CongestionModel:
+        """Access the congestion model."""
+
+        return self._congestion
+
+    def reset(self) -> None:
+        """
+        Release all network resources.
+        """
+
+        self._congestion.reset()
+
+    def _evaluate_put(self, time: Time, task: PutTask) -> NetworkTime:
+        """
+        Evaluate the congested latency-bandwidth model with a PutTask.
+        """
+
+        injected, arrived = self._congestion.transfer(
+            task.node, task.target, time,
+            self._path_latency(task.node, task.target),
+            int(task.message_size * self._bandwidth))
+
+        if task.blocking:
+            return NetworkTime(arrived, arrived)
+
+        return NetworkTime(injected, arrived)
+
+    def _evaluate_get(self, time: Time, task: GetTask) -> NetworkTime:
+        """
+        Evaluate the congested latency-bandwidth model with a GetTask, the
+        command travels to the target and the retrieval back.
+        """
+
+        latency = self._path_latency(task.node, task.target)
+
+        _, time_remote = self._congestion.transfer(
+            task.node, task.target, time, latency,
+            int(task.command_message_size * self._bandwidth))
+
+        _, time_local = self._congestion.transfer(
+            task.target, task.node, time_remote, latency,
+            int(task.retrieval_message_size * self._bandwidth))
+
+        return NetworkTime(time_local, time_remote)
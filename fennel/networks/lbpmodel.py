@@ -3,11 +3,12 @@ Defines the latency-bandwidth-pipeline model.
 """
 
 
-from typing import cast, Union
+from typing import Hashable, cast, Optional, Tuple, Union
 
 
 from fennel.core.time import Time
 from fennel.core.network import NetworkModel, NetworkTime
+from fennel.core.topology import Topology
 from fennel.tasks.put import PutTask
 from fennel.tasks.get import GetTask
 
@@ -15,15 +16,85 @@ from fennel.tasks.get import GetTask
 class LBPModel(NetworkModel):
     """
     Implementation of the latency-bandwidth-pipeline model.
+
+    Given a topology, every hop between source and target adds hop_latency
+    to the latency.
+
+    Given a segment size, messages are split into segments which are
+    posted every pipeline time and streamed one after another, such that
+    posting and streaming overlap. The times of the last segment are
+    computed in closed form, a message remains a single task.
     """
 
-    def __init__(self, latency: int, bandwidth: float, pipeline: int):
+    deterministic = True
+
+    def __init__(self,
+                 latency: int,
+                 bandwidth: float,
+                 pipeline: int,
+                 topology: Optional[Topology] = None,
+                 hop_latency: int = 0,
+                 segment: Optional[int] = None):
         super().__init__()
 
+        if segment is not None and segment < 1:
+            raise ValueError("LBPModel requires segment > 0")
+
+        self.register_task_evaluator(PutTask, self._evaluate_put)
+        self.register_task_evaluator(GetTask, self._evaluate_get)
+
         self._latency = latency
         self._bandwidth = bandwidth
         self._pipeline = pipeline
 
+        self._topology = topology
+        self._hop_latency = hop_latency
+
+        self._segment = segment
+
+    @property
+    def topology(self) -> Optional[Topology]:
+        """Access the topology."""
+
+        return self._topology
+
+    def duration_key(self,
+                     task: Union[PutTask, GetTask]
+                     ) -> Optional[Hashable]:
+        """
+        The duration depends on the sizes and the latency between source
+        and target.
+        """
+
+        latency = self._path_latency(task.node, task.target)
+
+        if isinstance(task, GetTask):
+            return (task.kind, task.command_message_size,
+                    task.retrieval_message_size, latency)
+
+        return (task.kind, task.message_size, latency)
+
+    def fingerprint(self) -> Optional[Hashable]:
+        """
+        The durations depend on the parameters and the topology mapping.
+        """
+
+        version = None if self._topology is None else self._topology.version
+
+        return (self._latency, self._bandwidth, self._pipeline,
+                self._segment, self._hop_latency, version)
+
+    def _path_latency(self, source: int, target: int) -> int:
+        """
+        Get the latency between two nodes.
+        """
+
+        if self._topology is None:
+            return self._latency
+
+        return (self._latency +
+                self._hop_latency * self._topology.hops(source, target))
+
     def evaluate(self,
                  time: Time,
                  task: Union[PutTask, GetTask]
@@ -32,36 +103,55 @@ class LBPModel(NetworkModel):
         Evaluate the latency-bandwidth network model.
         """
 
-        if isinstance(task, PutTask):
-            return self._evaluate_put(time, task)
+        return self._evaluate_task(time, task)
 
-        if isinstance(task, GetTask):
-            return self._evaluate_get(time, task)
+    def _transfer(self, size: int, latency: int) -> Tuple[int, int]:
+        """
+        Get the time after which the last segment of a message is posted
+        and the time after which the message has arrived.
+        """
+
+        if self._segment is None or size <= self._segment:
+            return self._pipeline, int(self._pipeline + latency +
+                                       self._bandwidth * size)
+
+        count = -(-size // self._segment)
+        last = size - (count - 1) * self._segment
+
+        # every segment is posted, then streamed once the previous one is,
+        # the slower stage paces all but the first segment
+        stream = self._bandwidth * self._segment
+        streamed = (self._pipeline + stream +
+                    (count - 2) * max(self._pipeline, stream))
+
+        posted = count * self._pipeline
+        streamed = max(posted, streamed) + self._bandwidth * last
 
-        raise RuntimeError(f"Task {task} not recognized.")
+        return posted, int(streamed + latency)
 
     def _evaluate_put(self, time: Time, task: PutTask) -> NetworkTime:
         """
-
+        Evaluate the latency-bandwidth-pipeline model with a PutTask, the
+        put returns once all segments are posted.
         """
 
-        local = self._pipeline
-        remote = int(local +
-                     self._latency +
-                     self._bandwidth * task.message_size)
+        local, remote = self._transfer(
+            task.message_size, self._path_latency(task.node, task.target))
 
         return NetworkTime(cast(Time, time + local),
                            cast(Time, time + remote))
 
     def _evaluate_get(self, time: Time, task: GetTask) -> NetworkTime:
         """
-
+        Evaluate the latency-bandwidth-pipeline model with a GetTask. The
+        command arrives at the remote time, the target streams the data
+        back which arrives at the local time.
         """
-        
-        raise NotImplementedError
 
-        # local non-blocking, cannot use buffer that is gotten
-        #   but we don't always want it blocking
+        latency = self._path_latency(task.node, task.target)
 
-        # remote, modify the taken buffer
-        # local blocking, use the buffer
+        _, remote = self._transfer(task.command_message_size, latency)
+        _, local = self._transfer(task.retrieval_message_size, latency)
+
+        return NetworkTime(cast(Time, time + remote + local),
+                           cast(Time, time + remote))
@@ -0,0 +1,167 @@
+"""
+Defines the LogGOPS model.
+"""
+
+
+from typing import List, Union, cast
+
+
+from fennel.core.time import Time
+from fennel.core.network import NetworkModel, NetworkTime
+from fennel.tasks.put import PutTask
+from fennel.tasks.get import GetTask
+from fennel.tasks.msg import MsgTask
+from fennel.tasks.nic import NICTask
+
+
+class LogGOPSModel(NetworkModel):
+    """
+    Implementation of the LogGOPS model.
+
+    Sending or receiving a message of s bytes occupies the host for the
+    overhead o + s * O. The NICs of every node inject and receive messages
+    at most every gap g + (s - 1) * G, the last byte of a message arrives
+    the latency L after it has been injected.
+
+    Messages are internal events: a message arrives at the NIC of its
+    target, waits for the NIC and is then processed by a host process,
+    which completes the put. Gets send a command message, the target NIC
+    replies with the data without involving its host.
+    """
+
+    def __init__(self,
+                 nodes: int,
+                 latency: int,
+                 overhead: int,
+                 gap: int,
+                 gap_byte: float = 0.0,
+                 overhead_byte: float = 0.0):
+        super().__init__()
+
+        if nodes < 1:
+            raise ValueError("LogGOPSModel requires nodes > 0")
+
+        self.register_task_evaluator(PutTask, self._evaluate_put)
+        self.register_task_evaluator(GetTask, self._evaluate_get)
+        self.register_task_evaluator(MsgTask, self._evaluate_msg)
+        self.register_task_evaluator(NICTask, self._evaluate_nic)
+
+        self._nodes = nodes
+        self._latency = latency
+        self._overhead = overhead
+        self._gap = gap
+        self._gap_byte = gap_byte
+        self._overhead_byte = overhead_byte
+
+        # time the injection and the receiving NIC of every node is free
+        self._send: List[int] = [0] * nodes
+        self._recv: List[int] = [0] * nodes
+
+    def reset(self) -> None:
+        """
+        Free all NICs.
+        """
+
+        self._send = [0] * self._nodes
+        self._recv = [0] * self._nodes
+
+    def evaluate(self,
+                 time: Time,
+                 task: Union[PutTask, GetTask, MsgTask, NICTask]
+                 ) -> NetworkTime:
+        """
+        Evaluate task with the evaluator of its kind.
+        """
+
+        return self._evaluate_task(time, task)
+
+    def _host(self, size: int) -> int:
+        """
+        Get the host overhead of a message.
+        """
+
+        return self._overhead + int(size * self._overhead_byte)
+
+    def _stream(self, size: int) -> int:
+        """
+        Get the time between the first and the last byte of a message.
+        """
+
+        return int(max(size - 1, 0) * self._gap_byte)
+
+    def _inject(self, node: int, time: int, size: int) -> int:
+        """
+        Inject a message at the NIC of the node once it is free, returns
+        the arrival time of the last byte.
+        """
+
+        start = max(time, self._send[node])
+        stream = self._stream(size)
+
+        self._send[node] = start + self._gap + stream
+
+        return start + stream + self._latency
+
+    def _evaluate_put(self, time: Time, task: PutTask) -> NetworkTime:
+        """
+        Evaluate a put, the host hands the message to the NIC after the
+        overhead.
+        """
+
+        local = time + self._host(task.message_size)
+        arrival = self._inject(task.node, local, task.message_size)
+
+        message = MsgTask(task, task.target, task.message_size, time,
+                          cast(Time, local))
+
+        return NetworkTime(cast(Time, local), None,
+                           [(cast(Time, arrival), message)])
+
+    def _evaluate_get(self, time: Time, task: GetTask) -> NetworkTime:
+        """
+        Evaluate a get, the host sends the command message after the
+        overhead.
+        """
+
+        local = time + self._host(task.command_message_size)
+        arrival = self._inject(task.node, local, task.command_message_size)
+
+        message = MsgTask(task, task.target, task.command_message_size, time,
+                          cast(Time, local))
+
+        return NetworkTime(cast(Time, local), None,
+                           [(cast(Time, arrival), message)])
+
+    def _evaluate_msg(self, time: Time, task: MsgTask) -> NetworkTime:
+        """
+        Evaluate a message arriving at a NIC, the message is received once
+        the NIC is free.
+        """
+
+        received = max(time, self._recv[task.node])
+        self._recv[task.node] = received + self._gap + self._stream(task.size)
+
+        origin = task.origin
+
+        # the target NIC replies to the command of a get
+        if isinstance(origin, GetTask) and not task.reply:
+            size = origin.retrieval_message_size
+            arrival = self._inject(task.node, received, size)
+
+            reply = MsgTask(origin, origin.node, size, task.start,
+                            cast(Time, received), True)
+
+            return NetworkTime(cast(Time, received), None,
+                               [(cast(Time, arrival), reply)])
+
+        return NetworkTime(cast(Time, received), None,
+                           [(cast(Time, received), NICTask(task))])
+
+    def _evaluate_nic(self, time: Time, task: NICTask) -> NetworkTime:
+        """
+        Evaluate the host processing of a received message.
+        """
+
+        done = cast(Time, time + self._host(task.message.size))
+
+        return NetworkTime(done, done)
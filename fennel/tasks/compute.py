@@ -6,7 +6,7 @@ ComputeTask definition.
 from typing import Optional
 
 
-from fennel.core.task import Task
+from fennel.core.task import Task, KIND_COMPUTE
 
 
 class ComputeTask(Task):
@@ -15,6 +15,10 @@ class ComputeTask(Task):
     takes place.
     """
 
+    __slots__ = ('_size', '_time')
+
+    kind = KIND_COMPUTE
+
     def __init__(self,
                  name: str,
                  node: int,
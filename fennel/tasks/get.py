@@ -2,7 +2,7 @@
 GetTask definition. One-sided fetch.
 """
 
-from fennel.core.task import Task
+from fennel.core.task import Task, KIND_GET
 
 
 class GetTask(Task):
@@ -10,6 +10,10 @@ class GetTask(Task):
     Represents an RDMA get.
     """
 
+    __slots__ = ('_target', '_size_retrieve', '_size_command', '_block')
+
+    kind = KIND_GET
+
     def __init__(self,
                  name: str,
                  proc: int,
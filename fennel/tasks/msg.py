@@ -1,19 +1,80 @@
 """
+MsgTask definition. Internal event of a message travelling the network.
 """
 
-from fennel.core.task import Task
+from fennel.core.time import Time
+from fennel.core.task import Task, register_task_kind
 
 
 class MsgTask(Task):
     """
+    A message of a put or get arriving at the NIC of its node. Messages are
+    internal events planned by network models, they are handled by the NIC
+    without occupying a process.
     """
 
-    def __init__(self, puttask, start, arrival):
-        super().__init__('name', puttask.proc)
+    __slots__ = ('_origin', '_size', '_start', '_local', '_reply')
 
-        self.puttask = puttask
-        self.start = start
-        self.arrival = arrival
-        self.target = puttask.target
-        self.size = puttask.size
-        self.block = puttask.block
+    host = False
+
+    def __init__(self,
+                 origin: Task,
+                 node: int,
+                 size: int,
+                 start: Time,
+                 local: Time,
+                 reply: bool = False):
+        super().__init__(f'{origin.name}.msg', node, drawable=False)
+
+        self._origin = origin
+        self._size = size
+        self._start = start
+        self._local = local
+        self._reply = reply
+
+    def __repr__(self) -> str:
+        return f'msg {self._name} to {self._node}'
+
+    @property
+    def origin(self) -> Task:
+        """
+        Get the program task which sent the message.
+        """
+
+        return self._origin
+
+    @property
+    def size(self) -> int:
+        """
+        Get message size.
+        """
+
+        return self._size
+
+    @property
+    def start(self) -> Time:
+        """
+        Get the time the origin task was executed.
+        """
+
+        return self._start
+
+    @property
+    def local(self) -> Time:
+        """
+        Get the time the origin task returned locally, for the reply to a
+        get the time the target served the get.
+        """
+
+        return self._local
+
+    @property
+    def reply(self) -> bool:
+        """
+        Get whether the message is the reply to a get.
+        """
+
+        return self._reply
+
+
+register_task_kind(MsgTask)
@@ -1,14 +1,36 @@
 """
+NICTask definition. Internal event of a host receiving a message.
 """
 
-from fennel.core.task import Task
+from fennel.core.task import Task, register_task_kind
+from fennel.tasks.msg import MsgTask
 
 
 class NICTask(Task):
     """
+    The host processing of a message received by the NIC of its node. NIC
+    tasks are internal events planned by network models, they occupy a
+    process of the node and complete the origin task of the message.
     """
 
-    def __init__(self, puttask):
-        super().__init__('name', puttask.proc)
+    __slots__ = ('_message',)
 
-        self.puttask = puttask
+    def __init__(self, message: MsgTask):
+        super().__init__(f'{message.origin.name}.nic', message.node,
+                         drawable=False)
+
+        self._message = message
+
+    def __repr__(self) -> str:
+        return f'nic {self._name} on {self._node}'
+
+    @property
+    def message(self) -> MsgTask:
+        """
+        Get the received message.
+        """
+
+        return self._message
+
+
+register_task_kind(NICTask)
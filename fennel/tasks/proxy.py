@@ -2,7 +2,7 @@
 ProxyTask definition.
 """
 
-from fennel.core.task import Task
+from fennel.core.task import Task, KIND_PROXY
 
 
 class ProxyTask(Task):
@@ -11,5 +11,9 @@ class ProxyTask(Task):
     another task.
     """
 
+    __slots__ = ()
+
+    kind = KIND_PROXY
+
     def __repr__(self) -> str:
         return f'proxy {self._name}'
@@ -2,7 +2,7 @@
 The PutTask is defined, one-sided send.
 """
 
-from fennel.core.task import Task
+from fennel.core.task import Task, KIND_PUT
 
 
 class PutTask(Task):
@@ -10,6 +10,10 @@ class PutTask(Task):
     Represents an RDMA put.
     """
 
+    __slots__ = ('_target', '_size', '_block')
+
+    kind = KIND_PUT
+
     def __init__(self,
                  name: str,
                  proc: int,
@@ -6,7 +6,7 @@ SleepTask definition.
 from typing import Optional
 
 
-from fennel.core.task import Task
+from fennel.core.task import Task, KIND_SLEEP
 
 
 class SleepTask(Task):
@@ -14,6 +14,10 @@ class SleepTask(Task):
     SleepTask specifies a time delay for this process.
     """
 
+    __slots__ = ('_delay', '_until')
+
+    kind = KIND_SLEEP
+
     def __init__(
             self,
             name: str,
@@ -2,7 +2,7 @@
 StartTask definition.
 """
 
-from fennel.core.task import Task
+from fennel.core.task import Task, KIND_START
 
 
 class StartTask(Task):
@@ -10,6 +10,10 @@ class StartTask(Task):
     The StartTask is the initial hook for a process.
     """
 
+    __slots__ = ('_skew',)
+
+    kind = KIND_START
+
     def __init__(self, name: str, proc: int, skew: int = 0):
         super().__init__(name, proc)
 
@@ -0,0 +1,70 @@
+"""
+Fixtures shared by the tests.
+"""
+
+
+import pytest
+
+
+from fennel.core.machine import Machine
+from fennel.core.task import TaskEvent
+from fennel.computes.gamma import GammaModel
+from fennel.networks.lbmodel import LBModel
+from fennel.instruments.record import RecorderInstrument
+
+
+class FrontierInstrument:
+    """
+    Records the largest values of the sampled quantities during a run.
+    """
+
+    def __init__(self, **samplers):
+        self.samplers = samplers
+        self.largest = dict.fromkeys(samplers, 0)
+
+    def task_completed(self, task, program, time):
+        """
+        Sample all quantities.
+        """
+
+        for name, sample in self.samplers.items():
+            self.largest[name] = max(self.largest[name], sample())
+
+
+def _run_program(program, nodes, processes=1, compute=None, network=None,
+                 cache=0):
+    """
+    Run the program on a fresh machine and get the makespan and the
+    completion time of every task.
+    """
+
+    compute = GammaModel(1) if compute is None else compute
+    network = LBModel(100, 1) if network is None else network
+
+    machine = Machine(nodes, processes, compute, network, cache=cache)
+    recorder = RecorderInstrument()
+    machine.register_instrument(TaskEvent.COMPLETED, recorder)
+    machine.run(program)
+
+    assert machine.is_finished()
+
+    return machine.maximum_time, dict(recorder.record)
+
+
+@pytest.fixture
+def run_program():
+    """
+    Runs programs on fresh machines, by default with GammaModel(1),
+    LBModel(100, 1) and a single process per node.
+    """
+
+    return _run_program
+
+
+@pytest.fixture
+def frontier():
+    """
+    Creates instruments recording the largest sampled values of a run.
+    """
+
+    return FrontierInstrument
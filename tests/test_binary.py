@@ -0,0 +1,187 @@
+"""
+Collection of tests for the binary program format.
+"""
+
+
+import os
+import pickle
+
+
+import numpy as np  # type: ignore
+import pytest
+
+
+from fennel.io.binary import save, load, VERSION
+import fennel.io.goal as goal
+from fennel.core.cache import DurationCache
+from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.core.task import Task, register_task_kind
+from fennel.computes.gamma import GammaModel, NoisyGammaModel
+from fennel.networks.lbmodel import LBModel
+from fennel.tasks.start import StartTask
+import fennel.generators.allreduce as allreduce
+import fennel.generators.compute as compute
+import fennel.generators.p2p as p2p
+
+
+SCHEDULES = os.path.join(os.path.dirname(__file__), '..', 'schedules')
+
+
+def slots(task):
+    """
+    Get the values of all slots of a task.
+    """
+
+    return {slot: getattr(task, slot)
+            for cls in type(task).__mro__
+            for slot in getattr(cls, '__slots__', ())}
+
+
+@pytest.mark.parametrize('program, nodes', [
+    (allreduce.generate_recursive_doubling(16, 64), 16),
+    (p2p.fetch(64, True), 2),
+    (p2p.send_partitioned(64, 4, 2, 2), 2),
+    (compute.simple_compute(100, 3), 1),
+    (goal.load(os.path.join(SCHEDULES, 'a2block.goal')), 2),
+    (goal.load(os.path.join(SCHEDULES, 'nic_congest.goal')), 8),
+    ])
+def test_round_trip(tmp_path, run_program, program, nodes):
+    """
+    Tests whether a mapped program equals the written program.
+    """
+
+    path = str(tmp_path / 'program.fpg')
+    save(program, path)
+
+    mapped = load(path)
+    compiled = program.compile()
+
+    assert mapped.get_task_names() == compiled.get_task_names()
+
+    for name in ('offsets', 'targets', 'in_degree', 'kinds', 'nodes',
+                 'anys', 'start_ids'):
+        assert np.array_equal(getattr(mapped, name),
+                              getattr(compiled, name))
+
+    for tid, task in enumerate(compiled.tasks):
+        loaded = mapped.task(tid)
+
+        assert type(loaded) is type(task)
+        assert slots(loaded) == slots(task)
+
+    assert run_program(mapped, nodes, 2) == run_program(program, nodes, 2)
+
+
+def test_lazy_tasks_and_pickle(tmp_path):
+    """
+    Tests whether tasks are only created on access and a mapped program
+    pickles as its path.
+    """
+
+    path = str(tmp_path / 'program.fpg')
+    save(allreduce.generate_recursive_doubling(64, 64), path)
+
+    mapped = load(path)
+    assert mapped.tasks._tasks is None
+
+    assert mapped.task(3) is mapped.task(3)
+    assert sum(task is not None for task in mapped.tasks._tasks) == 1
+
+    data = pickle.dumps(mapped)
+    assert len(data) < 200
+
+    assert pickle.loads(data).get_task_names() == mapped.get_task_names()
+
+
+def test_sample_mapped(tmp_path):
+    """
+    Tests whether sampling workers run a mapped program like the program.
+    """
+
+    program = p2p.pingpong(8, 4)
+    path = str(tmp_path / 'program.fpg')
+    save(program, path)
+
+    machine = Machine(2, 1, NoisyGammaModel(1, 0.1), LBModel(100, 1))
+
+    mapped = machine.run_samples(load(path), 4, seeds=3, workers=2)
+    expected = machine.run_samples(program, 4, seeds=3, workers=1)
+
+    assert np.array_equal(mapped.makespans, expected.makespans)
+
+
+class CustomTask(Task):
+    """
+    A task type unknown to the format.
+    """
+
+    __slots__ = ()
+
+
+register_task_kind(CustomTask)
+
+
+def test_invalid_files(tmp_path):
+    """
+    Tests whether unknown task types, foreign files and other versions are
+    rejected.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+    program.add_node(CustomTask('c', 0))
+    program.add_edge('s', 'c')
+
+    path = tmp_path / 'program.fpg'
+
+    with pytest.raises(ValueError, match='cannot be written'):
+        save(program, str(path))
+
+    path.write_bytes(b'not a program file at all')
+    with pytest.raises(ValueError, match='not a program file'):
+        load(str(path))
+
+    save(p2p.send(8, True), str(path))
+    data = bytearray(path.read_bytes())
+    data[8:12] = (VERSION + 1).to_bytes(4, 'little')
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='format version'):
+        load(str(path))
+
+
+def test_precompute_creates_no_tasks(tmp_path):
+    """
+    Tests whether a run with precomputed durations creates only the tasks
+    it executes and the durations equal the program's.
+    """
+
+    program = allreduce.generate_recursive_doubling(64, 64)
+    path = str(tmp_path / 'program.fpg')
+    save(program, path)
+
+    mapped = load(path)
+    compute, network = GammaModel(1), LBModel(100, 1)
+
+    durations = mapped.precompute(compute, network, DurationCache(16))
+    assert mapped.tasks._tasks is None
+
+    assert durations == program.compile().precompute(compute, network,
+                                                     DurationCache(16))
+
+
+def test_reserved_header(tmp_path):
+    """
+    Tests whether a file with a set reserved header field is rejected.
+    """
+
+    path = tmp_path / 'program.fpg'
+    save(p2p.send(8, True), str(path))
+
+    data = bytearray(path.read_bytes())
+    data[12:16] = (1).to_bytes(4, 'little')
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='reserved'):
+        load(str(path))
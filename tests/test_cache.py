@@ -0,0 +1,141 @@
+"""
+Collection of tests for the memoized durations of deterministic models.
+"""
+
+
+import numpy as np  # type: ignore
+import pytest
+
+
+from fennel.core.cache import DurationCache
+from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.core.topology import Ring
+from fennel.computes.fixed import FixedTimeModel
+from fennel.computes.gamma import GammaModel, NoisyGammaModel
+from fennel.networks.lbmodel import LBModel, NoisyLBModel
+from fennel.networks.lbpmodel import LBPModel
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.proxy import ProxyTask
+from fennel.tasks.start import StartTask
+import fennel.generators.allreduce as allreduce
+import fennel.generators.p2p as p2p
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    Tests whether the cache is bounded and evicts the least recently used.
+    """
+
+    cache = DurationCache(2)
+
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+
+    cache.put('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+@pytest.mark.parametrize('compute, network', [
+    (GammaModel(2), LBModel(100, 0.5)),
+    (FixedTimeModel(7), LBPModel(100, 0.5, 10)),
+    ])
+def test_cached_run_matches(compute, network):
+    """
+    Tests whether precomputed durations give the same run, and whether
+    equal tasks are evaluated once.
+    """
+
+    program = allreduce.generate_recursive_doubling(16, 64)
+
+    machine = Machine(16, 1, compute, network, cache=16)
+    machine.run(program)
+
+    reference = Machine(16, 1, compute, network)
+    reference.run(program)
+
+    assert machine.maximum_time == reference.maximum_time
+    assert len(machine.cache) <= 3
+
+
+def test_noisy_models_bypass_cache():
+    """
+    Tests whether durations of noisy models are never precomputed.
+    """
+
+    program = p2p.pingpong(8, 4)
+    compiled = program.compile()
+
+    spans, local, remote = compiled.precompute(
+        NoisyGammaModel(1, 0.1), NoisyLBModel(100, 1, 10), DurationCache(8))
+
+    assert spans is None and local is None and remote is None
+
+    spans, local, remote = compiled.precompute(
+        GammaModel(1), NoisyLBModel(100, 1, 10), DurationCache(8))
+
+    assert spans is not None and remote is None
+
+
+def test_precomputed_follow_topology():
+    """
+    Tests whether precomputed durations are dropped once the topology
+    mapping of the network model changes.
+    """
+
+    program = p2p.pingpong(8, 1)
+
+    topology = Ring(16)
+    machine = Machine(2, 1, GammaModel(1), LBModel(100, 1, topology, 10),
+                      cache=16)
+
+    machine.run(program)
+    near = machine.maximum_time
+
+    topology.mapping = [0, 8]
+    machine.reset()
+    machine.run(program)
+
+    reference = Machine(2, 1, GammaModel(1), LBModel(100, 1, topology, 10))
+    reference.run(program)
+
+    assert machine.maximum_time == reference.maximum_time
+    assert machine.maximum_time == near + 2 * 7 * 10
+
+
+def test_cached_run_fractional_sizes():
+    """
+    Tests whether programs with non-integral sizes run with the cache like
+    without it.
+    """
+
+    size = float(np.logspace(0, 7, 30)[10])
+
+    for program in (p2p.send(size, True), p2p.pingpong(size, 2)):
+        compute = GammaModel(0.5)
+        network = LBModel(4000, 0.1)
+
+        machine = Machine(2, 1, compute, network, cache=16)
+        machine.run(program)
+
+        reference = Machine(2, 1, compute, network)
+        reference.run(program)
+
+        assert machine.maximum_time == reference.maximum_time
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+    program.add_node(ComputeTask('c', 0, size=2.5))
+    program.add_node(ProxyTask('x', 0))
+    program.add_edge('s', 'c')
+    program.add_edge('c', 'x')
+
+    machine = Machine(1, 1, GammaModel(3), None, cache=16)
+    machine.run(program)
+
+    assert machine.maximum_time == 7
@@ -0,0 +1,84 @@
+"""
+Collection of tests for the CompiledProgram.
+"""
+
+
+from fennel.core.task import KIND_START, KIND_PUT, KIND_PROXY
+from fennel.core.machine import Machine
+from fennel.computes.gamma import GammaModel
+from fennel.networks.lbmodel import LBModel
+from fennel.tasks.proxy import ProxyTask
+import fennel.generators.p2p as p2p
+
+
+def test_compile_send():
+    """
+    Tests whether the arrays of a compiled send program are correct.
+    """
+
+    program = p2p.send(8, True)
+    compiled = program.compile()
+
+    assert len(compiled) == 5
+    assert compiled.get_process_count() == 2
+
+    put = compiled.index('p')
+    assert compiled.kinds[put] == KIND_PUT
+    assert compiled.get_in_degree(put) == 1
+    assert list(compiled.get_successors(put)) == [compiled.index('x1')]
+
+    assert compiled.get_in_degree(compiled.index('x1')) == 2
+    assert compiled.get_out_degree(compiled.index('x1')) == 0
+
+    assert all(compiled.kinds[compiled.start_ids] == KIND_START)
+    assert compiled.kinds[compiled.index('x0')] == KIND_PROXY
+
+    assert compiled.offsets[-1] == len(compiled.targets) == 3
+
+
+def test_compile_cached_until_modified():
+    """
+    Tests whether compilation is cached and invalidated by modification.
+    """
+
+    program = p2p.send(8, True)
+    compiled = program.compile()
+
+    assert program.compile() is compiled
+
+    program.add_node(ProxyTask('y', 0))
+    assert program.compile() is not compiled
+    assert len(program.compile()) == 6
+
+
+def test_run_compiled_program():
+    """
+    Tests whether a compiled program runs like its program.
+    """
+
+    program = p2p.pingpong(8, 3)
+
+    machine = Machine(2, 1, GammaModel(1), LBModel(100, 1))
+    machine.run(program)
+
+    compiled = Machine(2, 1, GammaModel(1), LBModel(100, 1))
+    compiled.run(program.compile())
+
+    assert compiled.maximum_time == machine.maximum_time
+
+
+def test_task_ids_per_program():
+    """
+    Tests whether task ids are assigned per program and match the compiled
+    ids, and whether tasks are slotted.
+    """
+
+    first = p2p.send(8, True)
+    second = p2p.send(8, True)
+
+    compiled = first.compile()
+
+    for name in first.get_task_names():
+        assert first[name].taskid == second[name].taskid
+        assert first[name].taskid == compiled.index(name)
+        assert not hasattr(first[name], '__dict__')
@@ -0,0 +1,124 @@
+"""
+Collection of tests for the congestion models.
+"""
+
+
+from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.core.congestion import (NoCongestionModel, NICCongestionModel,
+                                    BusyIntervals)
+from fennel.networks.lbmodel import LBModel, CongestedLBModel
+from fennel.computes.gamma import GammaModel
+from fennel.tasks.start import StartTask
+from fennel.tasks.put import PutTask
+from fennel.tasks.proxy import ProxyTask
+import fennel.generators.p2p as p2p
+
+
+def incast(senders: int, size: int) -> Program:
+    """
+    Every sender puts a message to node 0 at time 0.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s0', 0))
+    program.add_node(ProxyTask('x', 0))
+    program.add_edge('s0', 'x')
+
+    for node in range(1, senders + 1):
+        program.add_node(StartTask(f's{node}', node))
+        program.add_node(PutTask(f'p{node}', node, 0, size))
+        program.add_edge(f's{node}', f'p{node}')
+        program.add_edge(f'p{node}', 'x')
+
+    return program
+
+
+def test_no_congestion_matches_lbmodel():
+    """
+    Tests whether without congestion the model matches the LBModel.
+    """
+
+    program = p2p.pingpong(8, 4)
+
+    machine = Machine(2, 1, GammaModel(1),
+                      CongestedLBModel(100, 1, NoCongestionModel()))
+    machine.run(program)
+
+    reference = Machine(2, 1, GammaModel(1), LBModel(100, 1))
+    reference.run(program)
+
+    assert machine.maximum_time == reference.maximum_time
+
+
+def test_incast_serializes():
+    """
+    Tests whether puts to the same target serialize on its ejection NIC,
+    and whether resetting the machine frees the NICs.
+    """
+
+    program = incast(3, 100)
+
+    network = CongestedLBModel(10, 1, NICCongestionModel(4))
+    machine = Machine(4, 1, GammaModel(0), network)
+    machine.run(program)
+
+    assert machine.maximum_time == 310
+
+    machine.reset()
+    machine.run(program)
+
+    assert machine.maximum_time == 310
+
+
+def test_injection_serializes():
+    """
+    Tests whether non-blocking puts of a node serialize on its injection
+    NIC.
+    """
+
+    congestion = NICCongestionModel(3)
+
+    assert congestion.transfer(0, 1, 0, 10, 100) == (100, 110)
+    assert congestion.transfer(0, 2, 0, 10, 100) == (200, 210)
+
+    # the ejection NIC of node 2 is free until the second message arrives
+    assert congestion.transfer(1, 2, 0, 10, 100) == (100, 110)
+    assert congestion.transfer(1, 2, 0, 10, 100) == (200, 310)
+
+
+def test_out_of_order_transfers():
+    """
+    Tests whether a message issued after a later message takes the free
+    gap before it.
+    """
+
+    congestion = NICCongestionModel(3)
+
+    assert congestion.transfer(0, 1, 100, 10, 50) == (150, 160)
+    assert congestion.transfer(0, 2, 0, 10, 50) == (50, 60)
+
+    # the gap before the first message is too short
+    assert congestion.transfer(0, 2, 60, 10, 50) == (200, 210)
+
+    # the ejection NIC is free between both messages
+    assert congestion.transfer(1, 2, 0, 10, 40) == (40, 100)
+
+
+def test_busy_intervals_merge():
+    """
+    Tests whether adjacent busy intervals are merged.
+    """
+
+    intervals = BusyIntervals()
+
+    assert intervals.reserve(0, 10) == 0
+    assert intervals.reserve(20, 10) == 20
+    assert len(intervals) == 2
+
+    assert intervals.reserve(5, 10) == 10
+    assert len(intervals) == 1
+
+    assert intervals.reserve(0, 5) == 30
+    assert intervals.reserve(100, 0) == 100
+    assert len(intervals) == 1
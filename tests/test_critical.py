@@ -0,0 +1,136 @@
+"""
+Collection of tests for the static critical path evaluation.
+"""
+
+
+import numpy as np  # type: ignore
+import pytest
+
+
+from fennel.core.critical import fast_makespan
+from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.core.task import TaskEvent
+from fennel.computes.gamma import GammaModel, NoisyGammaModel
+from fennel.networks.lbmodel import LBModel
+from fennel.networks.lbpmodel import LBPModel
+from fennel.instruments.record import RecorderInstrument
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.start import StartTask
+from fennel.tasks.sleep import SleepTask
+from fennel.tasks.proxy import ProxyTask
+import fennel.generators.allgather as allgather
+import fennel.generators.allreduce as allreduce
+import fennel.generators.bsp as bsp
+import fennel.generators.p2p as p2p
+
+
+@pytest.mark.parametrize('program, nodes', [
+    (allreduce.generate_recursive_doubling(64, 64), 64),
+    (allgather.ring(16, 64), 16),
+    (bsp.single_superstep(100, 100, 3), 100),
+    (p2p.pingpong(8, 5), 2),
+    (p2p.request_response_transfer_ack(64), 2),
+    ])
+@pytest.mark.parametrize('network', [LBModel(100, 1), LBPModel(100, 1, 10)])
+def test_fast_makespan_matches_machine(program, nodes, network):
+    """
+    Tests whether the critical path equals a run on the machine.
+    """
+
+    machine = Machine(nodes, 1, GammaModel(1), network)
+    recorder = RecorderInstrument()
+    machine.register_instrument(TaskEvent.COMPLETED, recorder)
+    machine.run(program)
+
+    result = fast_makespan(program, GammaModel(1), network)
+
+    assert result.makespan == machine.maximum_time
+    assert all(result.finish[tid] == recorder.record.get(name, -1)
+               for tid, name in enumerate(result.names))
+
+
+def test_fast_makespan_any():
+    """
+    Tests whether tasks with the any property begin at the any-th smallest
+    dependency time.
+    """
+
+    for any_count, expected in ((1, 0), (2, 100), (3, 200), (4, 300)):
+        program = Program()
+        program.add_node(StartTask('s', 0))
+
+        proxy = ProxyTask('x', 0)
+        proxy.any = any_count
+        program.add_node(proxy)
+        program.add_edge('s', 'x')
+
+        for idx, delay in enumerate((300, 100, 200)):
+            program.add_node(StartTask(f's{idx}', idx + 1))
+            program.add_node(SleepTask(f'd{idx}', idx + 1, delay))
+
+            program.add_edge(f's{idx}', f'd{idx}')
+            program.add_edge(f'd{idx}', 'x')
+
+        result = fast_makespan(program, None, None)
+
+        assert result.finish[program['x'].taskid] == expected
+        assert result.makespan == 300
+
+
+def test_fast_makespan_requires_deterministic_models():
+    """
+    Tests whether noisy models are rejected.
+    """
+
+    with pytest.raises(ValueError):
+        fast_makespan(bsp.single_superstep(4, 100, 1),
+                      NoisyGammaModel(1, 0.1), LBModel(100, 1))
+
+    assert isinstance(fast_makespan(p2p.pingpong(8, 1), None,
+                                    LBModel(1, 1)).finish, np.ndarray)
+
+
+def test_fast_makespan_contended():
+    """
+    Tests whether a program whose tasks contend a process is run on a
+    machine instead of evaluated as longest path.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+    program.add_node(ProxyTask('x', 0))
+
+    for name in ('c0', 'c1'):
+        program.add_node(ComputeTask(name, 0, 100))
+        program.add_edge('s', name)
+        program.add_edge(name, 'x')
+
+    machine = Machine(1, 1, GammaModel(1), LBModel(100, 1))
+    machine.run(program)
+
+    result = fast_makespan(program, GammaModel(1), LBModel(100, 1))
+
+    assert result.simulated
+    assert result.makespan == machine.maximum_time == 200
+    assert sorted(result.finish.tolist()) == [0, 100, 200, 200]
+
+    uncontended = fast_makespan(p2p.pingpong(8, 2), GammaModel(1),
+                                LBModel(100, 1))
+    assert not uncontended.simulated
+
+
+def test_fast_makespan_fractional_sizes():
+    """
+    Tests whether a program with non-integral sizes is run on a machine.
+    """
+
+    program = p2p.send(1000.5, True)
+
+    machine = Machine(2, 1, None, LBModel(4000, 0.1))
+    machine.run(program)
+
+    result = fast_makespan(program, None, LBModel(4000, 0.1))
+
+    assert result.simulated
+    assert result.makespan == machine.maximum_time
@@ -0,0 +1,205 @@
+"""
+Collection of tests for the cache of generated programs.
+"""
+
+
+import os
+import subprocess
+import sys
+
+
+import pytest
+
+
+from fennel.generators.cache import GeneratorCache
+from fennel.core.sweep import sweep
+from fennel.io.binary import MappedProgram
+from fennel.core.machine import Machine
+from fennel.computes.gamma import GammaModel
+from fennel.networks.lbmodel import LBModel
+import fennel.generators.allgather as allgather
+import fennel.generators.p2p as p2p
+
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def test_cache_shares_programs():
+    """
+    Tests whether equal calls share a compiled program and are counted.
+    """
+
+    cache = GeneratorCache(2)
+
+    first = cache.generate(allgather.recursive_doubling, 8, 64)
+    second = cache.generate(allgather.recursive_doubling, 8, 64)
+
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    other = cache.generate(allgather.recursive_doubling, 8, 128)
+    assert other is not first
+
+    sized = cache.generate(p2p.send, message_size=8, blocking=True)
+    assert cache.generate(p2p.send, blocking=True, message_size=8) is sized
+
+    # the least recently used program is evicted
+    assert len(cache) == 2
+    assert cache.generate(allgather.recursive_doubling, 8, 64) is not first
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == cache.misses == 0
+
+
+def test_cached_generator():
+    """
+    Tests whether a wrapped generator goes through the cache.
+    """
+
+    cache = GeneratorCache()
+    ring = cache.cached(allgather.ring)
+
+    assert ring(4, 64) is ring(4, 64)
+    assert ring.__name__ == 'ring'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_directory(tmp_path):
+    """
+    Tests whether programs are shared through the directory.
+    """
+
+    directory = str(tmp_path / 'programs')
+
+    cache = GeneratorCache(directory=directory)
+    program = cache.generate(p2p.send_partitioned, 64, 4, 2, 2)
+
+    assert cache.misses == 1
+    assert len(os.listdir(directory)) == 1
+
+    other = GeneratorCache(directory=directory)
+    mapped = other.generate(p2p.send_partitioned, 64, 4, 2, 2)
+
+    assert isinstance(mapped, MappedProgram)
+    assert (other.disk_hits, other.misses) == (1, 0)
+    assert mapped.get_task_names() == program.get_task_names()
+
+    times = []
+    for compiled in (program, mapped):
+        machine = Machine(2, 2, GammaModel(1), LBModel(100, 1))
+        machine.run(compiled)
+        times.append(machine.maximum_time)
+
+    assert times[0] == times[1]
+
+
+def test_cache_requires_size():
+    """
+    Tests whether an empty cache is rejected.
+    """
+
+    with pytest.raises(ValueError):
+        GeneratorCache(0)
+
+
+def pingpong_twice(size):
+    """
+    Generates two pingpongs of the given size.
+    """
+
+    return p2p.pingpong(size, 2)
+
+
+def pingpong_thrice(size):
+    """
+    Generates three pingpongs of the given size.
+    """
+
+    return p2p.pingpong(size, 3)
+
+
+def test_cache_rejects_ambiguous_keys():
+    """
+    Tests whether lambdas, nested functions and arguments with the
+    default repr are rejected.
+    """
+
+    cache = GeneratorCache()
+
+    with pytest.raises(ValueError, match='module level'):
+        cache.generate(lambda size: p2p.pingpong(size, 2), 8)
+
+    def nested(size):
+        return p2p.pingpong(size, 2)
+
+    with pytest.raises(ValueError, match='module level'):
+        cache.generate(nested, 8)
+
+    with pytest.raises(ValueError, match='repr'):
+        cache.generate(pingpong_twice, object())
+
+    with pytest.raises(ValueError, match='repr'):
+        cache.generate(pingpong_twice, size=[8, object()])
+
+    assert len(cache) == 0
+
+
+def test_cache_key_covers_code():
+    """
+    Tests whether generators which differ only in their code have
+    distinct keys.
+    """
+
+    key = GeneratorCache.key(pingpong_twice, (8,), {})
+
+    def replaced(size):
+        return p2p.pingpong(size, 3)
+
+    # the same name with other code
+    replaced.__module__ = pingpong_twice.__module__
+    replaced.__qualname__ = pingpong_twice.__qualname__
+
+    assert GeneratorCache.key(replaced, (8,), {}) != key
+    assert GeneratorCache.key(pingpong_thrice, (8,), {}) != key
+    assert GeneratorCache.key(pingpong_twice, (8,), {}) == key
+
+
+def test_cache_key_across_processes():
+    """
+    Tests whether the key of a generator is equal in processes with other
+    string hashing.
+    """
+
+    script = ('from fennel.generators.cache import GeneratorCache\n'
+              'import fennel.generators.allgather as allgather\n'
+              'print(GeneratorCache.key(allgather.ring, (8, 64), {}))\n')
+
+    keys = set()
+    for seed in ('1', '2'):
+        environment = dict(os.environ, PYTHONHASHSEED=seed)
+        keys.add(subprocess.run([sys.executable, '-c', script],
+                                cwd=ROOT, env=environment,
+                                capture_output=True, check=True,
+                                text=True).stdout)
+
+    assert len(keys) == 1
+    assert '0x' not in keys.pop()
+
+
+def test_cached_sweep_family():
+    """
+    Tests whether a cached generator serves as a sweep family.
+    """
+
+    cache = GeneratorCache()
+    family = cache.cached(pingpong_twice)
+
+    first = sweep(family, [8, 64], latency=[10, 100], bandwidth=[1.0],
+                  workers=1)
+    second = sweep(family, [8, 64], latency=[10, 100], bandwidth=[1.0],
+                   workers=1)
+
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert (first.makespans == second.makespans).all()
@@ -0,0 +1,137 @@
+"""
+Collection of tests for the GOAL loader.
+"""
+
+
+import glob
+import io
+import os
+
+
+import pytest
+
+
+import fennel.io.goal as goal
+from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.computes.gamma import GammaModel
+from fennel.networks.lbmodel import LBModel
+from fennel.tasks.start import StartTask
+from fennel.tasks.put import PutTask
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.proxy import ProxyTask
+
+
+SCHEDULES = os.path.join(os.path.dirname(__file__), '..', 'schedules')
+
+
+def run(program, nodes):
+    """
+    Run the program and get the makespan.
+    """
+
+    machine = Machine(nodes, 1, GammaModel(1), LBModel(100, 1))
+    machine.run(program)
+
+    assert machine.is_finished()
+
+    return machine.maximum_time
+
+
+def test_load_matches_program():
+    """
+    Tests whether a loaded schedule runs like the equal hand built program.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s0', 0))
+    program.add_node(StartTask('s1', 1))
+    program.add_node(PutTask('p', 0, 1, 8, block=True))
+    program.add_node(ComputeTask('c0', 0, time=50))
+    program.add_node(ComputeTask('c1', 1, time=50))
+    program.add_node(ProxyTask('x0', 0))
+    program.add_node(ProxyTask('x1', 1))
+
+    program.add_edge('s0', 'p')
+    program.add_edge('p', 'c0')
+    program.add_edge('s0', 'c0')
+    program.add_edge('s1', 'c1')
+    program.add_edge('p', 'c1')
+    program.add_edge('c0', 'x0')
+    program.add_edge('c1', 'x1')
+
+    path = os.path.join(SCHEDULES, 'putblockcompute.goal')
+    loaded = goal.load(path)
+
+    assert isinstance(loaded['r0l2'], PutTask)
+    assert loaded['r0l2'].target == 1
+    assert loaded['r1l2'].time == 50
+    assert set(loaded.get_predecessors('r1x')) == {'r1l2'}
+
+    assert run(loaded, 2) == run(program, 2)
+
+
+@pytest.mark.parametrize('path', sorted(
+    path for path in glob.glob(os.path.join(SCHEDULES, '*.goal'))
+    if not path.endswith('branch.goal')))
+def test_load_compiled_schedules(path):
+    """
+    Tests whether the compiled form of every shipped schedule equals the
+    program form.
+    """
+
+    program = goal.load(path)
+    compiled = goal.load_compiled(path)
+
+    assert compiled.get_task_names() == program.get_task_names()
+
+    nodes = compiled.get_process_count()
+    assert run(compiled, nodes) == run(program, nodes)
+
+
+def test_load_blocks(monkeypatch):
+    """
+    Tests whether lines cut by blocks are carried into the next block.
+    """
+
+    path = os.path.join(SCHEDULES, 'binomial7_broadcast.goal')
+    expected = goal.load_compiled(path)
+
+    monkeypatch.setattr(goal, '_BLOCK', 7)
+    compiled = goal.load_compiled(path)
+
+    assert compiled.get_task_names() == expected.get_task_names()
+    assert list(compiled.targets) == list(expected.targets)
+
+
+@pytest.mark.parametrize('text, message', [
+    ('rank 0 {\n l1: start\n l2: bogus l3\n}\n', ':3: cannot parse'),
+    ('rank 0 {\n l1: start\n}}\n\n', ':3: cannot parse'),
+    ('rank 0 {\n l1: start\n l2: branch l3, l4\n}\n',
+     ':3: branch statements are not supported'),
+    ('l1: start\n', 'outside of a rank'),
+    ('rank 0 {\n l1: start\n l2 > l3\n}\n', 'r0l3 is not defined'),
+    ('rank 0 {\n l1: start\n l1: start\n}\n', 'r0l1 is defined twice'),
+    ('rank 0 {\n l1: start\n', 'not closed'),
+    ])
+def test_load_errors(text, message):
+    """
+    Tests whether malformed schedules are rejected with their position.
+    """
+
+    with pytest.raises(ValueError, match=message):
+        goal.load(io.StringIO(text))
+
+
+def test_load_branch():
+    """
+    Tests whether schedules with branch statements are rejected.
+    """
+
+    path = os.path.join(SCHEDULES, 'branch.goal')
+
+    with pytest.raises(ValueError, match=':6: branch statements'):
+        goal.load(path)
+
+    with pytest.raises(ValueError, match=':6: branch statements'):
+        goal.load_compiled(path)
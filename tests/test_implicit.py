@@ -0,0 +1,101 @@
+"""
+Collection of tests for implicit programs.
+"""
+
+
+import pytest
+
+
+from fennel.core.machine import Machine
+from fennel.core.sweep import sweep
+from fennel.core.task import TaskEvent
+from fennel.computes.gamma import GammaModel, NoisyGammaModel
+from fennel.networks.lbmodel import LBModel
+import fennel.generators.allgather as allgather
+import fennel.generators.allreduce as allreduce
+
+
+@pytest.mark.parametrize('explicit, implicit, nodes', [
+    (allgather.ring(2, 64), allgather.ring_implicit(2, 64), 2),
+    (allgather.ring(7, 64), allgather.ring_implicit(7, 64), 7),
+    (allreduce.generate_recursive_doubling(2, 64),
+     allreduce.generate_recursive_doubling_implicit(2, 64), 2),
+    (allreduce.generate_recursive_doubling(16, 64),
+     allreduce.generate_recursive_doubling_implicit(16, 64), 16),
+    ])
+def test_implicit_matches_program(run_program, explicit, implicit, nodes):
+    """
+    Tests whether an implicit program has the tasks and edges of the
+    generated program and runs alike.
+    """
+
+    compiled = explicit.compile()
+
+    assert len(implicit) == len(compiled)
+    assert implicit.get_process_count() == compiled.get_process_count()
+
+    ids = {name: tid for tid, name in enumerate(implicit.get_task_names())}
+    assert set(ids) == set(compiled.get_task_names())
+
+    for tid, name in enumerate(compiled.get_task_names()):
+        successors = {compiled.name(successor)
+                      for successor in compiled.get_successors(tid)}
+
+        assert successors == {implicit.name(successor) for successor
+                              in implicit.get_successors(ids[name])}
+        assert implicit.get_in_degree(ids[name]) == compiled.get_in_degree(tid)
+
+    assert run_program(implicit, nodes, cache=16) == \
+        run_program(explicit, nodes, cache=16)
+
+
+def test_implicit_bounded_state(frontier):
+    """
+    Tests whether only the frontier of an implicit program is held.
+    """
+
+    processes = 64
+    program = allgather.ring_implicit(processes, 64)
+
+    machine = Machine(processes, 1, GammaModel(1), LBModel(100, 1))
+    # pylint: disable=protected-access
+    held = frontier(tasks=lambda: program.tasks.active,
+                    counters=lambda: len(machine._state.remaining))
+    machine.register_instrument(TaskEvent.COMPLETED, held)
+
+    machine.run(program)
+
+    assert machine.is_finished()
+    assert program.tasks.active == 0
+
+    assert held.largest['tasks'] <= 4 * processes
+    assert held.largest['counters'] <= 2 * processes
+    assert len(program) == 2 * processes * processes
+
+
+def test_implicit_samples():
+    """
+    Tests whether implicit programs can be sampled and reset.
+    """
+
+    program = allreduce.generate_recursive_doubling_implicit(8, 64)
+    machine = Machine(8, 1, NoisyGammaModel(1, 0.1), LBModel(100, 1))
+
+    first = machine.run_samples(program, 4, seeds=2, workers=2)
+    second = machine.run_samples(program, 4, seeds=2, workers=1)
+
+    assert (first.makespans == second.makespans).all()
+
+
+def test_implicit_sweep():
+    """
+    Tests whether implicit programs are swept on machines.
+    """
+
+    result = sweep(allgather.ring_implicit(4, 64), latency=[10, 100],
+                   bandwidth=[1.0], workers=1)
+    expected = sweep(allgather.ring(4, 64), latency=[10, 100],
+                     bandwidth=[1.0], workers=1)
+
+    assert result.simulated == 2
+    assert (result.makespans == expected.makespans).all()
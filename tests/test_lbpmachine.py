@@ -1,7 +1,67 @@
 """
+Verifies the LBP model.
 """
 
 
+import fennel.generators.p2p as p2p
+from fennel.core.machine import Machine
+from fennel.networks.lbpmodel import LBPModel
+from fennel.computes.gamma import GammaModel
+
+
+def test_fetch_lbpmachine():
+    """
+    Test the LBP model with a get, the command and the data each cost the
+    pipeline, the latency and their size.
+    """
+
+    program = p2p.fetch(100, True)
+
+    machine = Machine(2, 1, GammaModel(0), LBPModel(1000, 1, 10))
+    machine.run(program)
+
+    assert machine.maximum_time == (10 + 1000 + 8) + (10 + 1000 + 100)
+
+
+def test_request_response_lbpmachine():
+    """
+    Test the LBP model with a request response program.
+    """
+
+    program = p2p.request_response_transfer_ack(64)
+
+    machine = Machine(2, 1, GammaModel(0), LBPModel(1000, 1, 10))
+    machine.run(program)
+
+    assert machine.is_finished()
+    assert machine.maximum_time == 3 * (10 + 1000 + 8) + (10 + 1000 + 64)
+
+
+def test_segmented_put():
+    """
+    Test the closed form of segmented puts, posting segments overlaps
+    streaming the previous ones.
+    """
+
+    model = LBPModel(100, 1.0, 10, segment=100)
+
+    # streaming paces the segments, the last segment has 50 bytes
+    times = model.evaluate(0, p2p.send(950, True)['p'])
+    assert times.local == 10 * 10
+    assert times.remote == 10 + 9 * 100 + 50 + 100
+
+    # posting paces the segments
+    model = LBPModel(100, 0.05, 10, segment=100)
+
+    times = model.evaluate(0, p2p.send(950, True)['p'])
+    assert times.local == 10 * 10
+    assert times.remote == 10 * 10 + int(50 * 0.05) + 100
+
+    # single segment matches the unsegmented model
+    plain = LBPModel(100, 0.05, 10).evaluate(0, p2p.send(80, True)['p'])
+    assert model.evaluate(0, p2p.send(80, True)['p']) == plain
+
+
 # def test_pingpong_lbpmachine():
 #     """
 #     Test LBPMachine with a PingPong program.
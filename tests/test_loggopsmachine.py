@@ -0,0 +1,145 @@
+"""
+Verifies the LogGOPS model.
+"""
+
+
+import fennel.generators.p2p as p2p
+from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.core.task import TaskEvent
+from fennel.networks.loggopsmodel import LogGOPSModel
+from fennel.computes.gamma import GammaModel
+from fennel.instruments.record import RecorderInstrument
+from fennel.tasks.start import StartTask
+from fennel.tasks.put import PutTask
+from fennel.tasks.proxy import ProxyTask
+
+
+def test_loggops_pingpong():
+    """
+    Tests the round trip of a ping pong, every message costs the latency
+    and the overhead of sender and receiver.
+    """
+
+    rounds = 3
+    latency, overhead = 100, 5
+
+    program = p2p.pingpong(8, rounds)
+
+    machine = Machine(2, 1, GammaModel(0),
+                      LogGOPSModel(2, latency, overhead, 1))
+    machine.run(program)
+
+    assert machine.maximum_time == rounds * 2 * (latency + 2 * overhead)
+    assert machine.is_finished()
+
+
+def test_loggops_gap():
+    """
+    Tests whether consecutive messages of a node are injected at most
+    every gap and the per byte costs.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s0', 0))
+    program.add_node(StartTask('s1', 1))
+    program.add_node(StartTask('s2', 2))
+    program.add_node(ProxyTask('x', 0))
+
+    for target in (1, 2):
+        program.add_node(PutTask(f'p{target}', 0, target, 11))
+        program.add_edge('s0', f'p{target}')
+        program.add_edge(f's{target}', f'p{target}')
+        program.add_edge(f'p{target}', 'x')
+
+    recorder = RecorderInstrument()
+
+    machine = Machine(3, 1, GammaModel(0),
+                      LogGOPSModel(3, 100, 1, 10, 1.0, 0.5))
+    machine.register_instrument(TaskEvent.COMPLETED, recorder)
+    machine.run(program)
+
+    # host 1 + 11 * 0.5 before injection and after arrival, the nic
+    # streams 10 bytes, the second message waits for the gap and stream
+    assert recorder.record['p1'] == 6 + 10 + 100 + 6
+    assert recorder.record['p2'] == 6 + 10 + 10 + 10 + 100 + 6
+
+
+def test_loggops_receive_gap():
+    """
+    Tests whether the receiving NIC is occupied by the gap and the per
+    byte gap of large messages.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s0', 0))
+    program.add_node(StartTask('s1', 1))
+    program.add_node(StartTask('s2', 2))
+    program.add_node(ProxyTask('x', 2))
+
+    for source in (0, 1):
+        program.add_node(PutTask(f'p{source}', source, 2, 1001))
+        program.add_edge(f's{source}', f'p{source}')
+        program.add_edge('s2', f'p{source}')
+        program.add_edge(f'p{source}', 'x')
+
+    recorder = RecorderInstrument()
+
+    machine = Machine(3, 1, GammaModel(0),
+                      LogGOPSModel(3, 100, 0, 10, 1.0))
+    machine.register_instrument(TaskEvent.COMPLETED, recorder)
+    machine.run(program)
+
+    # both arrive after streaming 1000 bytes, the second is received once
+    # the first left the receiving nic
+    assert sorted((recorder.record['p0'], recorder.record['p1'])) == [
+        1000 + 100, 1000 + 100 + 10 + 1000]
+    assert machine.is_finished()
+
+
+def test_loggops_get():
+    """
+    Tests whether a get completes once the reply was processed by the
+    host, the target NIC replies without its host.
+    """
+
+    program = p2p.fetch(8, True)
+
+    machine = Machine(2, 1, GammaModel(0), LogGOPSModel(2, 100, 1, 10))
+    machine.run(program)
+
+    assert machine.maximum_time == 1 + 100 + 100 + 1
+
+
+class EventInstrument:
+    """
+    Records the largest number of pending internal events.
+    """
+
+    def __init__(self, machine):
+        self.machine = machine
+        self.events = 0
+
+    def task_completed(self, task, program, time):
+        """
+        Sample the pending events.
+        """
+
+        self.events = max(self.events, len(self.machine.state.events))
+
+
+def test_loggops_events_released():
+    """
+    Tests whether executed internal events are dropped during the run.
+    """
+
+    program = p2p.pingpong(8, 200)
+
+    machine = Machine(2, 1, GammaModel(0), LogGOPSModel(2, 100, 5, 1))
+    instrument = EventInstrument(machine)
+    machine.register_instrument(TaskEvent.COMPLETED, instrument)
+    machine.run(program)
+
+    assert machine.state.next_event == 2 * 2 * 200
+    assert not machine.state.events and not machine.state.origins
+    assert instrument.events <= 2
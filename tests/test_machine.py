@@ -3,9 +3,21 @@ A collection of tests for the Machine class.
 """
 
 
+import pytest
+
+
 from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.core.instrument import Instrument
+from fennel.core.task import Task, TaskEvent, register_task_kind
+from fennel.tasks.start import StartTask
+from fennel.tasks.sleep import SleepTask
+from fennel.tasks.proxy import ProxyTask
+from fennel.tasks.compute import ComputeTask
+from fennel.instruments.record import RecorderInstrument
 from fennel.computes.gamma import GammaModel
 from fennel.networks.lbmodel import LBModel
+from fennel.networks.lbpmodel import LBPModel
 import fennel.generators.p2p as p2p
 
 
@@ -25,3 +37,246 @@ def test_machine_sequential_programs():
     machine.run(program_2)
 
     assert machine.maximum_time == latency * 4
+
+
+def test_machine_reset_reruns_program():
+    """
+    Tests whether a reset machine runs a program again from time 0.
+    """
+
+    latency = 100
+
+    machine = Machine(2, 1, GammaModel(0), LBModel(latency, 0))
+    program = p2p.pingpong(8, 1)
+
+    machine.run(program)
+    machine.reset()
+    machine.run(program)
+
+    assert machine.maximum_time == latency * 2
+    assert machine.is_finished()
+
+
+def test_machine_state_clone():
+    """
+    Tests whether a cloned state is independent of the machine state.
+    """
+
+    machine = Machine(2, 1, GammaModel(0), LBModel(100, 0))
+    machine.run(p2p.pingpong(8, 1))
+
+    state = machine.state.clone()
+    machine.reset()
+
+    assert machine.maximum_time == 0
+    assert max(max(times) for times in state.node_times) == 200
+
+    machine.state = state
+    assert machine.maximum_time == 200
+
+
+def _any_program(any_count: int) -> Program:
+    """
+    Generate a program where a proxy depends on three sleeps.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+
+    proxy = ProxyTask('x', 0)
+    proxy.any = any_count
+    program.add_node(proxy)
+
+    for idx, delay in enumerate((300, 100, 200)):
+        program.add_node(StartTask(f's{idx}', idx + 1))
+        program.add_node(SleepTask(f'd{idx}', idx + 1, delay))
+
+        program.add_edge(f's{idx}', f'd{idx}')
+        program.add_edge(f'd{idx}', 'x')
+
+    program.add_edge('s', 'x')
+
+    return program
+
+
+def test_machine_any_kth_dependency():
+    """
+    Tests whether any tasks start at the any-th smallest dependency time.
+    """
+
+    for any_count, expected in ((2, 100), (3, 200), (4, 300)):
+        machine = Machine(4, 1, None, None)
+        recorder = RecorderInstrument()
+        machine.register_instrument(TaskEvent.COMPLETED, recorder)
+
+        machine.run(_any_program(any_count))
+
+        assert recorder.record['x'] == expected
+        assert machine.is_finished()
+
+
+def test_machine_loaded_dependency_times():
+    """
+    Tests whether LOADED instruments receive all dependency times.
+    """
+
+    class LoadedInstrument(Instrument):
+        """
+        Records dependency times of loaded tasks.
+        """
+
+        def __init__(self):
+            super().__init__()
+            self.loaded = {}
+
+        def task_loaded(self, task, program, time, dependent_times):
+            self.loaded[task.name] = (time, sorted(dependent_times))
+
+    instrument = LoadedInstrument()
+
+    machine = Machine(4, 1, None, None)
+    machine.register_instrument(TaskEvent.LOADED, instrument)
+    machine.run(_any_program(2))
+
+    assert instrument.loaded['x'] == (100, [0, 100, 200, 300])
+
+
+def test_machine_delayed_once_per_task():
+    """
+    Tests whether tasks waiting on a busy node are delayed exactly once and
+    execute one after another.
+    """
+
+    class DelayedInstrument(Instrument):
+        """
+        Counts delays per task.
+        """
+
+        def __init__(self):
+            super().__init__()
+            self.delayed = {}
+
+        def task_delayed(self, task, program, time, earliest):
+            self.delayed[task.name] = self.delayed.get(task.name, 0) + 1
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+    program.add_node(ProxyTask('x', 0))
+
+    for idx in range(5):
+        program.add_node(SleepTask(f'd{idx}', 0, 100))
+        program.add_edge('s', f'd{idx}')
+        program.add_edge(f'd{idx}', 'x')
+
+    instrument = DelayedInstrument()
+    recorder = RecorderInstrument()
+
+    machine = Machine(1, 1, None, None)
+    machine.register_instrument(TaskEvent.DELAYED, instrument)
+    machine.register_instrument(TaskEvent.COMPLETED, recorder)
+    machine.run(program)
+
+    assert instrument.delayed == {f'd{idx}': 1 for idx in range(1, 5)}
+    completions = sorted(recorder.record[f'd{idx}'] for idx in range(5))
+    assert completions == [100, 200, 300, 400, 500]
+    assert machine.maximum_time == 500
+
+
+def test_machine_user_task_handler():
+    """
+    Tests whether a user defined task type runs with a registered handler.
+    """
+
+    class WaitTask(Task):
+        """
+        Waits a fixed time.
+        """
+
+        __slots__ = ()
+
+    machine = Machine(1, 1, None, None)
+
+    def execute_wait(time, task, process):
+        machine.state.node_times[task.node][process] = time + 7
+        return time + 7
+
+    machine.register_task_handler(WaitTask, execute_wait)
+
+    assert WaitTask.kind >= 0
+    assert register_task_kind(WaitTask) == WaitTask.kind
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+    program.add_node(WaitTask('w', 0))
+    program.add_node(ProxyTask('x', 0))
+    program.add_edge('s', 'w')
+    program.add_edge('w', 'x')
+
+    machine.run(program)
+
+    assert machine.maximum_time == 7
+
+
+def test_machine_parked_kinds():
+    """
+    Tests whether a parked blocking task waiting on all processes does not
+    hold back a parked concurrent task on an available process.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+    program.add_node(ComputeTask('c1', 0, time=100, concurrent=True))
+    program.add_node(ComputeTask('b', 0, time=10))
+    program.add_node(ComputeTask('c2', 0, time=500, concurrent=True))
+    program.add_node(ComputeTask('c3', 0, time=10, concurrent=True))
+    program.add_node(ProxyTask('x', 0))
+
+    for name in ('c1', 'b', 'c2', 'c3'):
+        program.add_edge('s', name)
+        program.add_edge(name, 'x')
+
+    recorder = RecorderInstrument()
+
+    machine = Machine(1, 2, GammaModel(1), None)
+    machine.register_instrument(TaskEvent.COMPLETED, recorder)
+    machine.run(program)
+
+    assert machine.is_finished()
+    assert recorder.record['c1'] == 100
+    assert recorder.record['c2'] == 500
+    assert recorder.record['c3'] == 110
+    assert recorder.record['b'] == 510
+
+
+def test_machine_parked_order(run_program):
+    """
+    Tests whether delayed tasks compete with tasks of the same time by task
+    id, as if all tasks were kept in a single queue.
+    """
+
+    program = p2p.send_partitioned(10000, 8, 4, 3)
+    _, completions = run_program(program, 2, network=LBModel(100, 1.0))
+
+    expected = {'w_1_1_h': 140100, 'r_0_1_h': 260200, 'w_1_2_h': 380300,
+                'r_0_2_h': 500400, 'w_1_3_h': 620500}
+
+    assert {name: completions[name] for name in expected} == expected
+
+
+@pytest.mark.parametrize('program, network, expected', [
+    (p2p.send_partitioned(1000, 4, 2, 2), LBPModel(100, 1.0, 10),
+     {'c_1_1_0': 7120, 'c_1_1_1': 8120, 'c_1_1_3': 9120, 'w_0_2_l': 11240,
+      'c_0_2_0': 12240, 'c_0_2_1': 13240, 'c_0_2_3': 14240,
+      'c_1_2_0': 17360, 'c_1_2_1': 18360, 'c_1_2_3': 19360}),
+    (p2p.send_partitioned(10000, 8, 4, 3), LBModel(100, 1.0),
+     {'w_0_2_h': 260200, 'w_0_3_h': 500400}),
+    ])
+def test_machine_batch_order(run_program, program, network, expected):
+    """
+    Tests whether successors released at the time of a batch run within
+    the batch by task id, as if all tasks were kept in a single queue.
+    """
+
+    _, completions = run_program(program, 2, network=network)
+
+    assert {name: completions[name] for name in expected} == expected
@@ -0,0 +1,210 @@
+"""
+Collection of tests for the noise generation.
+"""
+
+
+import pickle
+
+
+import numpy as np  # type: ignore
+import pytest
+
+
+from fennel.core.machine import Machine
+from fennel.core.noise import (NoNoiseModel, NormalNoise, BetaPrimeNoise,
+                               GammaNoise, InvGaussNoise, HistogramNoise,
+                               SampleNoise, TraceNoise, DetourNoise)
+from fennel.computes.gamma import (GammaModel, NoisyGammaModel,
+                                   DetourGammaModel)
+from fennel.networks.lbmodel import LBModel, NoisyLBModel, DetourLBModel
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.get import GetTask
+from fennel.tasks.put import PutTask
+import fennel.generators.p2p as p2p
+
+
+def test_noise_seeded():
+    """
+    Tests whether equally seeded models hand out equal values across
+    block refills.
+    """
+
+    first = BetaPrimeNoise(2.0, 3.0, block=64, seed=3)
+    second = BetaPrimeNoise(2.0, 3.0, block=64, seed=3)
+
+    values = [first.sample() for _ in range(1000)]
+
+    assert values == [second.sample() for _ in range(1000)]
+    assert len(set(values)) == 1000
+
+    first.seed(3)
+    assert [first.sample() for _ in range(1000)] == values
+
+
+@pytest.mark.parametrize('noise, mean', [
+    (NoNoiseModel(), 0.0),
+    (NormalNoise(3.0, 1.0), 3.0),
+    (BetaPrimeNoise(2.0, 3.0, 5.0), 6.0),
+    (GammaNoise(2.0, 1.0, 0.5), 2.0),
+    (InvGaussNoise(0.5, 1.0, 2.0), 2.0),
+    (HistogramNoise([1.0, 2.0, 2.0, 3.0], 3), 2.0),
+    (SampleNoise([1.0, 3.0]), 2.0),
+    ])
+def test_noise_mean(noise, mean):
+    """
+    Tests whether single and batched samples follow the distribution.
+    """
+
+    noise.seed(1)
+
+    assert abs(noise.sample_many(20000).mean() - mean) < 0.1
+    assert abs(np.mean([noise.sample() for _ in range(20000)]) - mean) < 0.1
+
+
+def test_host_network_streams():
+    """
+    Tests whether the machine seeds host and network noise independently.
+    """
+
+    compute = NoisyGammaModel(1, 0.0, NormalNoise(0.0, 1.0))
+    network = NoisyLBModel(100, 1, 0.0, NormalNoise(0.0, 1.0))
+
+    machine = Machine(2, 1, compute, network)
+    machine.seed(7)
+
+    host = compute.noise.sample_many(8)
+    assert list(host) != list(network.noise.sample_many(8))
+
+    machine.seed(7)
+    assert list(host) == list(compute.noise.sample_many(8))
+
+
+def test_noise_setter():
+    """
+    Tests whether the noise of noisy models is set as a model or as
+    samples.
+    """
+
+    network = NoisyLBModel(100, 1, 0.0)
+    network.noise = [5.0]
+
+    assert isinstance(network.noise, SampleNoise)
+    assert network.evaluate(0, PutTask('p', 0, 1, 10)).remote == 115
+
+    compute = NoisyGammaModel(1, 0.0)
+    compute.noise = NoNoiseModel()
+
+    assert compute.evaluate(0, ComputeTask('c', 0, time=10)) == 10
+
+    with pytest.raises(ValueError):
+        network.noise = []
+
+
+def test_noisy_network_tasks():
+    """
+    Tests whether the noisy network model delays puts and gets like the
+    latency-bandwidth model plus the noise.
+    """
+
+    network = NoisyLBModel(100, 1, 0.0, SampleNoise([5.0]))
+
+    get = network.evaluate(0, GetTask('g', 0, 1, 10, 8))
+    assert (get.local, get.remote) == (223, 113)
+
+    put = network.evaluate(0, PutTask('p', 0, 1, 10, False))
+    assert (put.local, put.remote) == (110, 115)
+
+    for blocking in (True, False):
+        makespans = []
+
+        for model in (LBModel(100, 1),
+                      NoisyLBModel(100, 1, 0.0, NoNoiseModel())):
+            machine = Machine(2, 1, GammaModel(1), model)
+            machine.run(p2p.fetch(100, blocking))
+            makespans.append(machine.maximum_time)
+
+        assert makespans[0] == makespans[1]
+
+
+def test_trace_noise_sequential(tmp_path):
+    """
+    Tests whether a raw trace is replayed in order and wraps around.
+    """
+
+    path = tmp_path / 'trace.bin'
+    np.arange(10, dtype=np.float32).tofile(path)
+
+    noise = TraceNoise(path, np.float32, block=4)
+
+    assert len(noise) == 10
+    assert [noise.sample() for _ in range(12)] == list(range(10)) + [0, 1]
+    assert list(noise.sample_many(3)) == [2, 3, 4]
+
+    noise.seed(0)
+    assert noise.sample() == 0
+
+
+def test_trace_noise_offset(tmp_path):
+    """
+    Tests whether blocks of a .npy trace start at seeded random offsets.
+    """
+
+    path = tmp_path / 'trace.npy'
+    np.save(path, np.arange(1000, dtype=np.float64))
+
+    first = TraceNoise(path, mode=TraceNoise.OFFSET, block=4, seed=5)
+    second = TraceNoise(path, mode=TraceNoise.OFFSET, block=4, seed=5)
+
+    block = [first.sample() for _ in range(4)]
+    assert block == [second.sample() for _ in range(4)]
+    assert all(np.diff(block) % 1000 == 1)
+
+
+def test_trace_noise_per_node(tmp_path):
+    """
+    Tests whether every node reads its own stripe of the trace, also after
+    pickling.
+    """
+
+    path = tmp_path / 'trace.npy'
+    np.save(path, np.arange(9, dtype=np.float64))
+
+    noise = TraceNoise(path, mode=TraceNoise.NODE, nodes=3, scale=2.0)
+    noise = pickle.loads(pickle.dumps(noise))
+
+    assert [noise.sample_node(1) for _ in range(4)] == [6, 8, 10, 6]
+    assert [noise.sample_node(2) for _ in range(2)] == [12, 14]
+    assert noise.sample_node(0) == 0
+
+
+def test_detour_stretch():
+    """
+    Tests whether operations are stretched by the periodic detours they
+    overlap, also beyond the first generated window.
+    """
+
+    detours = DetourNoise(1, period=100, detour=10, horizon=250)
+    phase = detours.intervals(0, 0, 100)[0][0]
+
+    assert detours.stretch(0, phase - 5, phase) == phase
+    assert detours.stretch(0, phase - 5, phase + 5) == phase + 15
+    assert detours.stretch(0, phase + 5, phase + 6) == phase + 11
+    assert detours.stretch(0, phase, phase + 1000) == phase + 1120
+
+
+def test_detour_models():
+    """
+    Tests whether the detour models are stretched by the detours.
+    """
+
+    detours = DetourNoise(2, period=100, detour=10, seed=1)
+
+    compute = DetourGammaModel(1, detours)
+    network = DetourLBModel(100, 0, detours)
+
+    task = ComputeTask('c', 1, 500)
+    assert compute.evaluate(0, task) == detours.stretch(1, 0, 500)
+    assert compute.evaluate(0, task) in (550, 560)
+
+    times = network.evaluate(0, PutTask('p', 0, 1, 8))
+    assert times.local == times.remote == detours.stretch(0, 0, 100)
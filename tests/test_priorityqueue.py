@@ -0,0 +1,115 @@
+"""
+Collection of tests for the priority queue implementations.
+"""
+
+
+import random
+
+
+import pytest
+
+
+from fennel.core.priorityqueue import PriorityQueue, BucketQueue, RadixHeap
+from fennel.core.machine import Machine
+from fennel.computes.gamma import GammaModel
+from fennel.networks.lbmodel import LBModel
+import fennel.generators.allgather as allgather
+import fennel.generators.p2p as p2p
+
+
+QUEUES = [PriorityQueue, BucketQueue, RadixHeap]
+
+
+def _drain(queue_type, operations):
+    """
+    Apply pushes relative to the last popped time, then drain the queue.
+    Negative offsets mimic tasks with the any property.
+    """
+
+    queue = queue_type()
+    popped = []
+    last = 0
+
+    for batch in operations:
+        for offset, task in batch:
+            queue.push(max(0, last + offset), task)
+
+        if queue.is_not_empty():
+            last, task = queue.pop()
+            popped.append((last, task))
+
+    while queue.is_not_empty():
+        popped.append(queue.pop())
+
+    return popped
+
+
+@pytest.mark.parametrize('queue_type', QUEUES)
+def test_queue_order(queue_type):
+    """
+    Tests whether all queues pop in time then task id order.
+    """
+
+    rng = random.Random(1234)
+    operations = [[(rng.choice((-3, 0, 0, 1, 5, 1000, 2**40)), rng.randrange(100))
+                   for _ in range(rng.randrange(4))]
+                  for _ in range(500)]
+
+    assert _drain(queue_type, operations) == _drain(PriorityQueue, operations)
+
+
+def test_radix_heap_late_push():
+    """
+    Tests whether the radix heap pops times earlier than the last pop first.
+    """
+
+    queue = RadixHeap()
+    queue.push(10, 0)
+    queue.push(20, 1)
+    queue.pop()
+
+    queue.push(5, 3)
+    queue.push(5, 2)
+
+    assert queue.pop() == (5, 2)
+    assert queue.pop() == (5, 3)
+    assert queue.pop() == (20, 1)
+    assert not queue.is_not_empty()
+
+
+@pytest.mark.parametrize('queue_type', QUEUES)
+def test_machine_queue(queue_type):
+    """
+    Tests whether a machine produces identical times with every queue.
+    """
+
+    for program, nodes in ((allgather.ring(8, 64), 8),
+                           (p2p.send_partitioned(10, 8, 4, 3), 2)):
+        reference = Machine(nodes, 2, GammaModel(1), LBModel(100, 1))
+        reference.run(program)
+
+        machine = Machine(nodes, 2, GammaModel(1), LBModel(100, 1),
+                          queue_type)
+        machine.run(program)
+
+        assert machine.maximum_time == reference.maximum_time
+
+
+@pytest.mark.parametrize('queue_type', QUEUES)
+def test_queue_batches(queue_type):
+    """
+    Tests whether batches hold all task ids of the earliest time in order.
+    """
+
+    queue = queue_type()
+    queue.push_batch([(10, 4), (5, 3), (10, 1), (5, 7), (20, 0)])
+    queue.push_batch([(10, 2)])
+
+    assert queue.pop_batch() == (5, [3, 7])
+
+    queue.push_batch([(10, 0), (15, 5)])
+
+    assert queue.pop_batch() == (10, [0, 1, 2, 4])
+    assert queue.pop_batch() == (15, [5])
+    assert queue.pop_batch() == (20, [0])
+    assert not queue.is_not_empty()
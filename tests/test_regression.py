@@ -20,11 +20,11 @@ def test_set_process_time_sets_all_nodes():
 
     machine = Machine(2, 1, None, None)
 
-    logging.info(machine._node_times)
-    assert all(time == 0 for node in machine._node_times for time in node)
+    logging.info(machine.state.node_times)
+    assert all(time == 0 for node in machine.state.node_times for time in node)
 
     machine._set_process_time(0, 0, 100)
-    logging.info(machine._node_times)
+    logging.info(machine.state.node_times)
 
-    assert machine._node_times[0][0] == 100
-    assert machine._node_times[1][0] == 0
+    assert machine.state.node_times[0][0] == 100
+    assert machine.state.node_times[1][0] == 0
@@ -0,0 +1,75 @@
+"""
+Collection of tests for the Monte Carlo sampling of programs.
+"""
+
+
+import pytest
+
+
+from fennel.core.machine import Machine
+from fennel.computes.gamma import GammaModel, NoisyGammaModel
+from fennel.networks.lbmodel import LBModel, NoisyLBModel
+import fennel.generators.p2p as p2p
+
+
+def test_deterministic_samples():
+    """
+    Tests whether samples of a noise free machine all match a single run.
+    """
+
+    program = p2p.pingpong(8, 4)
+
+    machine = Machine(2, 1, GammaModel(1), LBModel(100, 1))
+    result = machine.run_samples(program, 8, seeds=1, workers=1)
+
+    reference = Machine(2, 1, GammaModel(1), LBModel(100, 1))
+    reference.run(program)
+
+    assert result.makespans.shape == (8,)
+    assert all(result.makespans == reference.maximum_time)
+
+
+def test_seeded_samples_reproducible():
+    """
+    Tests whether seeded samples are reproducible independent of the
+    number of workers.
+    """
+
+    program = p2p.pingpong(8, 4)
+    machine = Machine(2, 1, NoisyGammaModel(1, 0.1), NoisyLBModel(100, 1, 10))
+
+    serial = machine.run_samples(program, 16, seeds=42, workers=1)
+    parallel = machine.run_samples(program, 16, seeds=42, workers=2)
+
+    assert list(serial.makespans) == list(parallel.makespans)
+    assert len(set(serial.makespans)) > 1
+
+
+def test_sample_completions():
+    """
+    Tests whether per task completion times are recorded.
+    """
+
+    program = p2p.pingpong(0, 1)
+
+    machine = Machine(2, 1, GammaModel(1), LBModel(100, 0))
+    result = machine.run_samples(program, 3, seeds=[1, 2, 3],
+                                 workers=1, record=True)
+
+    assert result.names == program.get_task_names()
+    assert result.completions is not None
+    assert result.completions.shape == (3, len(result.names))
+
+    column = result.names.index('p1_0')
+    assert all(result.completions[:, column] == 200)
+
+
+def test_sample_seed_count_mismatch():
+    """
+    Tests whether a wrong number of seeds is rejected.
+    """
+
+    machine = Machine(2, 1, GammaModel(1), LBModel(100, 0))
+
+    with pytest.raises(ValueError):
+        machine.run_samples(p2p.pingpong(0, 1), 3, seeds=[1, 2])
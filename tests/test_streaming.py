@@ -0,0 +1,140 @@
+"""
+Collection of tests for streaming programs.
+"""
+
+
+from functools import partial
+
+
+import pytest
+
+
+from fennel.core.machine import Machine
+from fennel.core.streaming import StreamingProgram
+from fennel.core.sweep import sweep
+from fennel.core.task import TaskEvent
+from fennel.computes.gamma import GammaModel, NoisyGammaModel
+from fennel.networks.lbmodel import LBModel
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.proxy import ProxyTask
+from fennel.tasks.start import StartTask
+import fennel.generators.bsp as bsp
+
+
+@pytest.mark.parametrize('nodes, rounds', [(1, 1), (4, 3), (16, 10)])
+def test_stream_matches_program(run_program, nodes, rounds):
+    """
+    Tests whether a streamed program runs like the generated program.
+    """
+
+    explicit = bsp.single_superstep(nodes, 1000, rounds)
+    streaming = bsp.single_superstep_streaming(nodes, 1000, rounds)
+
+    assert streaming.get_process_count() == nodes
+    assert sorted(streaming.get_task_names()) == \
+        sorted(explicit.compile().get_task_names())
+
+    assert run_program(streaming, nodes) == run_program(explicit, nodes)
+
+
+def test_stream_bounded_memory(frontier):
+    """
+    Tests whether only the frontier and the window of a long stream are
+    held.
+    """
+
+    nodes = 8
+    stream = bsp.single_superstep_streaming(nodes, 100, 200).compile()
+
+    held = frontier(held=lambda: stream.held)
+    machine = Machine(nodes, 1, GammaModel(1), LBModel(100, 1))
+    machine.register_instrument(TaskEvent.COMPLETED, held)
+
+    machine.run(stream)
+
+    assert machine.is_finished()
+    assert len(stream) == 2 * nodes + 200 * (nodes + 1) + 1
+    assert stream.held == 0
+
+    assert held.largest['held'] <= 4 * (nodes + 1)
+
+
+def test_stream_samples_and_sweep():
+    """
+    Tests whether streaming programs are sampled and swept with a fresh
+    stream per run.
+    """
+
+    program = bsp.single_superstep_streaming(4, 100, 5)
+    explicit = bsp.single_superstep(4, 100, 5)
+
+    machine = Machine(4, 1, NoisyGammaModel(1, 0.1), LBModel(100, 1))
+
+    first = machine.run_samples(program, 4, seeds=2, workers=2)
+    second = machine.run_samples(explicit, 4, seeds=2, workers=1)
+
+    assert (first.makespans == second.makespans).all()
+
+    result = sweep(program, latency=[10, 100], bandwidth=[1.0], workers=1)
+    expected = sweep(explicit, latency=[10, 100], bandwidth=[1.0],
+                     workers=1)
+
+    assert result.simulated == 2
+    assert (result.makespans == expected.makespans).all()
+
+
+def late_edge_stream(gap):
+    """
+    Streams a chain whose last edge follows its source by gap tasks.
+    """
+
+    yield StartTask('s', 0)
+    yield ComputeTask('c', 0, 10)
+    yield ('s', 'c')
+
+    for index in range(gap):
+        yield ProxyTask(f'p_{index}', 0)
+        yield ('c', f'p_{index}')
+
+    yield ProxyTask('x', 0)
+    yield ('c', 'x')
+
+
+def test_stream_window():
+    """
+    Tests whether edges outside the window are rejected.
+    """
+
+    valid = StreamingProgram(partial(late_edge_stream, 4), window=6)
+    machine = Machine(1, 1, GammaModel(1), LBModel(100, 1))
+    machine.run(valid)
+
+    assert machine.is_finished()
+
+    invalid = StreamingProgram(partial(late_edge_stream, 4), window=5)
+    machine = Machine(1, 1, GammaModel(1), LBModel(100, 1))
+
+    with pytest.raises(ValueError, match='window of 5 tasks'):
+        machine.run(invalid)
+
+    with pytest.raises(ValueError):
+        StreamingProgram(partial(late_edge_stream, 4), window=0)
+
+
+def late_start_stream():
+    """
+    Streams a start task after a compute task.
+    """
+
+    yield StartTask('s_0', 0)
+    yield ComputeTask('c', 0, 10)
+    yield StartTask('s_1', 1)
+
+
+def test_stream_start_tasks_lead():
+    """
+    Tests whether start tasks must lead the stream.
+    """
+
+    with pytest.raises(ValueError, match='follows'):
+        StreamingProgram(late_start_stream).get_process_count()
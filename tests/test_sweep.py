@@ -0,0 +1,180 @@
+"""
+Collection of tests for the parameter sweep.
+"""
+
+
+from functools import partial
+
+
+import numpy as np  # type: ignore
+import pytest
+
+
+from fennel.core.sweep import sweep, grid_durations
+from fennel.core.machine import Machine
+from fennel.core.program import Program
+from fennel.core.topology import Ring
+from fennel.computes.gamma import GammaModel, NoisyGammaModel
+from fennel.networks.lbmodel import LBModel
+from fennel.tasks.compute import ComputeTask
+from fennel.tasks.get import GetTask
+from fennel.tasks.proxy import ProxyTask
+from fennel.tasks.put import PutTask
+from fennel.tasks.start import StartTask
+import fennel.generators.allreduce as allreduce
+import fennel.generators.bsp as bsp
+import fennel.generators.p2p as p2p
+
+
+@pytest.mark.parametrize('family, parameters, nodes, simulated', [
+    (lambda size: p2p.pingpong(size, 3), [8, 1024], 2, 0),
+    (lambda size: allreduce.generate_recursive_doubling(16, size),
+     [8, 64], 16, 0),
+    (lambda size: bsp.single_superstep(10, size, 3), [10, 1000], 10, 0),
+    (lambda size: p2p.fetch(size, True), [8, 512], 2, 16),
+    ])
+def test_sweep_matches_machine(run_program, family, parameters, nodes,
+                               simulated):
+    """
+    Tests whether every grid point equals a run on the machine, contended
+    points of the fetch program are run on machines.
+    """
+
+    latency = [10, 1000]
+    bandwidth = [0.1, 2.0]
+    gamma = [0.5, 3.0]
+
+    result = sweep(family, parameters, latency, bandwidth, gamma,
+                   nodes=nodes, workers=1)
+
+    assert result.makespans.shape == (2, 2, 2, 2)
+    assert result.simulated == simulated
+
+    for index, parameter in enumerate(parameters):
+        program = family(parameter)
+
+        for point in np.ndindex(2, 2, 2):
+            expected, _ = run_program(
+                program, nodes, compute=GammaModel(gamma[point[2]]),
+                network=LBModel(latency[point[0]], bandwidth[point[1]]))
+
+            assert result.makespans[(index,) + point] == expected
+
+
+def test_sweep_noisy_pool():
+    """
+    Tests whether noisy models run every point in the process pool and are
+    reproducible by seed.
+    """
+
+    program = p2p.pingpong(64, 3)
+    compute = partial(NoisyGammaModel, stdev=50.0)
+
+    first = sweep(program, latency=[10, 100], bandwidth=[1.0],
+                  gamma=[1.0, 2.0], compute=compute, seeds=5, workers=2)
+    second = sweep(program, latency=[10, 100], bandwidth=[1.0],
+                   gamma=[1.0, 2.0], compute=compute, seeds=5, workers=1)
+
+    assert first.simulated == 4
+    assert np.array_equal(first.makespans, second.makespans)
+
+    noise_free = sweep(program, latency=[10, 100], bandwidth=[1.0],
+                       gamma=[1.0, 2.0], workers=1)
+
+    assert noise_free.simulated == 0
+    assert np.all(first.makespans >= noise_free.makespans)
+
+
+def test_sweep_empty_grid():
+    """
+    Tests whether an empty axis is rejected.
+    """
+
+    with pytest.raises(ValueError):
+        sweep(p2p.pingpong(8, 1), latency=[])
+
+
+class DerivedGammaModel(GammaModel):
+    """
+    A GammaModel subclass without any changes.
+    """
+
+
+def test_sweep_fractional_sizes(run_program):
+    """
+    Tests whether programs with non-integral sizes are run on machines.
+    """
+
+    sizes = np.logspace(0, 7, num=6)
+
+    result = sweep(lambda size: p2p.send(size, True), sizes, [4000], [0.1],
+                   workers=1)
+
+    assert result.simulated == 4
+
+    for index, size in enumerate(sizes):
+        expected, _ = run_program(p2p.send(size, True), 2,
+                                  network=LBModel(4000, 0.1))
+        assert result.makespans[index, 0, 0, 0] == expected
+
+
+def test_sweep_vectorizes_factories():
+    """
+    Tests whether subclasses and partials of vectorizing models, also with
+    a topology, are swept without machine runs.
+    """
+
+    program = allreduce.generate_recursive_doubling(16, 64)
+    topology = Ring(16)
+
+    network = partial(LBModel, topology=topology, hop_latency=7)
+    result = sweep(program, latency=[10, 100], bandwidth=[0.5],
+                   gamma=[1.0, 2.0], compute=DerivedGammaModel,
+                   network=network, workers=1)
+
+    assert result.simulated == 0
+
+    for point in np.ndindex(2, 1, 2):
+        latency = [10, 100][point[0]]
+        gamma = [1.0, 2.0][point[2]]
+
+        machine = Machine(16, 1, GammaModel(gamma),
+                          LBModel(latency, 0.5, topology, 7))
+        machine.run(program)
+
+        assert result.makespans[(0,) + point] == machine.maximum_time
+
+
+def test_vectorized_durations_match_evaluate():
+    """
+    Tests whether the vectorized durations equal evaluate task by task.
+    """
+
+    program = Program()
+    program.add_node(StartTask('s', 0))
+    program.add_node(ComputeTask('c', 0, size=333))
+    program.add_node(ComputeTask('t', 0, time=50))
+    program.add_node(PutTask('p', 0, 1, 1001))
+    program.add_node(GetTask('g', 1, 0, 17, 901))
+    program.add_node(ProxyTask('x', 0))
+
+    for source, target in (('s', 'c'), ('c', 't'), ('t', 'p'), ('p', 'g'),
+                           ('g', 'x')):
+        program.add_edge(source, target)
+
+    compiled = program.compile()
+    tasks = [compiled.task(tid) for tid in range(len(compiled))]
+
+    network = LBModel(100, 0.3, Ring(2), 5)
+    compute = GammaModel(0.7)
+
+    done, busy = grid_durations(compiled, [compute], [network])
+
+    for tid, task in enumerate(tasks):
+        if isinstance(task, (PutTask, GetTask)):
+            times = network.evaluate(0, task)
+            assert (busy[tid, 0], done[tid, 0]) == (times.local,
+                                                    times.remote)
+
+        elif isinstance(task, ComputeTask):
+            assert done[tid, 0] == compute.evaluate(0, task)
@@ -0,0 +1,97 @@
+"""
+Collection of tests for the topologies.
+"""
+
+
+import numpy as np  # type: ignore
+import pytest
+
+
+from fennel.core.machine import Machine
+from fennel.core.topology import (AllToAll, Star, Ring, Torus, FatTree,
+                                  DragonFly)
+from fennel.core.noise import NoNoiseModel, DetourNoise
+from fennel.networks.lbmodel import LBModel, NoisyLBModel, DetourLBModel
+from fennel.computes.gamma import GammaModel
+import fennel.generators.p2p as p2p
+
+
+def test_topology_distances():
+    """
+    Tests the hop counts of the topologies.
+    """
+
+    assert AllToAll(4).hops(1, 2) == 1
+    assert AllToAll(4).hops(2, 2) == 0
+
+    assert Star(4, 1).hops(1, 3) == 1
+    assert Star(4, 1).hops(0, 3) == 2
+
+    assert Ring(8).hops(1, 7) == 2
+    assert Ring(8).hops(0, 4) == 4
+
+    assert Torus([4, 4]).hops(0, 15) == 2
+    assert Torus([4, 4], wrap=False).hops(0, 15) == 6
+
+    assert FatTree(2, 3).hops(0, 1) == 2
+    assert FatTree(2, 3).hops(0, 7) == 6
+
+    assert DragonFly(2, 2, 2).hops(0, 1) == 2
+    assert DragonFly(2, 2, 2).hops(0, 2) == 3
+    assert DragonFly(2, 2, 2).hops(0, 4) == 5
+
+
+@pytest.mark.parametrize('topology', [
+    Ring(64), Torus([4, 4, 4]), FatTree(4, 3), DragonFly(4, 4, 4)])
+def test_table_matches_closed_form(topology):
+    """
+    Tests whether the precomputed table matches the closed form distance
+    used for large jobs.
+    """
+
+    mapping = np.random.default_rng(0).permutation(topology.size)
+    topology.mapping = mapping
+    table = topology.table()
+
+    for source, target in [(0, 1), (3, 40), (63, 7), (12, 12)]:
+        closed = topology.distance(mapping[source], mapping[target])
+        assert closed == table[source, target] == topology.hops(source, target)
+
+
+def test_lbmodel_topology():
+    """
+    Tests whether the latency depends on the placement of the ranks.
+    """
+
+    program = p2p.pingpong(0, 1)
+
+    ring = Ring(8)
+    machine = Machine(2, 1, GammaModel(0), LBModel(100, 0, ring, 10))
+    machine.run(program)
+
+    assert machine.maximum_time == 2 * 110
+
+    ring.mapping = [0, 4]
+    machine = Machine(2, 1, GammaModel(0), LBModel(100, 0, ring, 10))
+    machine.run(program)
+
+    assert machine.maximum_time == 2 * 140
+
+
+def test_noisy_models_topology():
+    """
+    Tests whether the noisy and detour models add the hop latency of the
+    topology.
+    """
+
+    program = p2p.pingpong(0, 1)
+
+    ring = Ring(8)
+    ring.mapping = [0, 4]
+
+    for network in (NoisyLBModel(100, 0, 0.0, NoNoiseModel(), ring, 10),
+                    DetourLBModel(100, 0, DetourNoise(2), ring, 10)):
+        machine = Machine(2, 1, GammaModel(0), network)
+        machine.run(program)
+
+        assert machine.maximum_time == 2 * 140